@@ -0,0 +1,790 @@
+"""
+Differential testing of optimized engines against their reference implementations.
+
+Random processors, transactions and FLP scenarios are generated from a seed, every optimized
+engine is run next to the straightforward implementation it replaces, and each comparison
+records whether the results match exactly and how fast both sides ran. Run it with
+
+    PYTHONPATH=src python scripts/equivalence.py --rows 20000
+
+from the repository root.
+"""
+
+import argparse
+import logging
+import re
+import string
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from engine import money
+from engine.calculator import Calculator
+from engine.conditions import Conditions
+from engine.normalizer import DescriptionNormalizer
+from engine.processor import Processor
+from engine.type import Type
+from flp.flp_calculator import FLPCalculator
+
+# At most this many mismatching cases are kept as examples per comparison
+MAX_EXAMPLES = 5
+# Conflicting rows are checked one at a time, so only this many are checked per comparison
+MAX_CONFLICT_CHECKS = 20
+
+_TYPES = [Type.INCOME, Type.EXPENSE, Type.GIVING]
+
+
+class EquivalenceResult:
+    """
+    The outcome of comparing one optimized engine with its reference implementation.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        cases: int,
+        reference_seconds: float,
+        candidate_seconds: float,
+        mismatches: int,
+        examples: list[str],
+    ) -> None:
+        self.name = name
+        self.cases = cases
+        self.reference_seconds = reference_seconds
+        self.candidate_seconds = candidate_seconds
+        self.mismatches = mismatches
+        self.examples = examples
+
+    def passed(self) -> bool:
+        return self.mismatches == 0
+
+    def reference_throughput(self) -> float:
+        """Cases per second of the reference implementation."""
+        return self.cases / max(self.reference_seconds, 1e-9)
+
+    def candidate_throughput(self) -> float:
+        """Cases per second of the optimized engine."""
+        return self.cases / max(self.candidate_seconds, 1e-9)
+
+    def speedup(self) -> float:
+        return self.candidate_throughput() / self.reference_throughput()
+
+    def __repr__(self) -> str:
+        status = "ok" if self.passed() else f"{self.mismatches} mismatches"
+        return (
+            f"{self.name}: {status}, {self.cases} cases, "
+            f"{self.reference_throughput():,.0f} vs {self.candidate_throughput():,.0f} "
+            f"cases/s ({self.speedup():.1f}x)"
+        )
+
+
+def random_processor(
+    rng: np.random.Generator,
+    num_identifiers: int = 50,
+    num_categories: int = 8,
+    name: str = "Random Processor",
+) -> Processor:
+    """
+    Generates a processor with random identifiers, as ConfigLoader would load them. About a
+    fifth of the identifiers extend another identifier (e.g. "netflix" and "netflix dvd"),
+    half of them in a different category, so overlapping matches and conflicts occur.
+    """
+    type_by_category = {
+        f"category {i}": _TYPES[rng.integers(len(_TYPES))]
+        for i in range(num_categories)
+    }
+    categories = list(type_by_category)
+
+    identifiers = []
+    while len(identifiers) < num_identifiers:
+        if identifiers and rng.random() < 0.2:
+            identifier = (
+                f"{identifiers[rng.integers(len(identifiers))]} {_random_word(rng)}"
+            )
+        else:
+            identifier = _random_word(rng)
+        if identifier not in identifiers:
+            identifiers.append(identifier)
+
+    type_category_by_identifier = {}
+    for identifier in identifiers:
+        category = categories[rng.integers(len(categories))]
+        extended = identifier.rsplit(" ", 1)[0]
+        if extended in type_category_by_identifier and rng.random() < 0.5:
+            category = type_category_by_identifier[extended][1]
+        type_category_by_identifier[identifier] = (type_by_category[category], category)
+
+    return Processor(
+        name=name,
+        file_prefix=name.lower().replace(" ", "_"),
+        parser=None,
+        skip_transactions=[],
+        type_category_by_identifier=type_category_by_identifier,
+    )
+
+
+def random_amounts(rng: np.random.Generator, num_rows: int) -> pd.Series:
+    """
+    Generates amount strings in the formats found in bank exports. Most are plain, e.g.
+    "-1,234.56", and the others have signs or parentheses, "$" prefixes, thousands
+    separators, surrounding whitespace, 0 to 4 decimal places, or are empty.
+    """
+    amounts = []
+    for _ in range(num_rows):
+        if rng.random() < 0.8:
+            units = int(rng.integers(-(10**7), 10**7))
+            whole, fraction = divmod(abs(units), 100)
+            text = f"{whole:,}" if rng.random() < 0.3 else str(whole)
+            amounts.append(f"{'-' if units < 0 else ''}{text}.{fraction:02d}")
+            continue
+        if rng.random() < 0.1:
+            amounts.append("")
+            continue
+        places = int(rng.integers(0, 5))
+        units = int(rng.integers(0, 10 ** (5 + places)))
+        whole, fraction = divmod(units, 10**places)
+        text = f"{whole:,}" if rng.random() < 0.3 else str(whole)
+        if places:
+            # Amounts below 1 are sometimes written without the leading zero, e.g. ".5"
+            if whole == 0 and rng.random() < 0.3:
+                text = ""
+            text = f"{text}.{fraction:0{places}d}"
+        if rng.random() < 0.2:
+            text = "$" + text
+        sign = rng.integers(4)
+        if sign == 1:
+            text = "-" + text
+        elif sign == 2:
+            text = "+" + text
+        elif sign == 3:
+            text = f"({text})"
+        amounts.append(" " + text if rng.random() < 0.1 else text)
+    return pd.Series(amounts, dtype="string")
+
+
+def random_transactions(
+    rng: np.random.Generator,
+    processor: Processor,
+    num_rows: int,
+    num_files: int = 6,
+) -> pd.DataFrame:
+    """
+    Generates categorizable transactions for the processor, with the columns produced by
+    Parser.parse_and_normalize_column_names plus "filename" and "account_name". Most
+    descriptions contain one identifier in random case, some none or two, between noise
+    words and store numbers.
+    """
+    identifiers = list(processor._type_category_by_identifier)
+    descriptions = []
+    for _ in range(num_rows):
+        words = [_random_word(rng) for _ in range(rng.integers(0, 3))]
+        for _ in range(rng.choice(3, p=[0.2, 0.65, 0.15])):
+            identifier = identifiers[rng.integers(len(identifiers))]
+            words.insert(
+                int(rng.integers(len(words) + 1)), _random_case(rng, identifier)
+            )
+        words.append(f"#{rng.integers(100000)}")
+        descriptions.append(" ".join(words))
+
+    amount_cents = money.parse_cents(random_amounts(rng, num_rows))
+    return pd.DataFrame(
+        {
+            "date": pd.Timestamp("2024-01-01")
+            + pd.to_timedelta(rng.integers(0, 366, num_rows), unit="D"),
+            "description": descriptions,
+            "amount": money.to_dollars(amount_cents),
+            "amount_cents": amount_cents,
+            "filename": [
+                f"file{i}.csv" for i in rng.integers(num_files, size=num_rows)
+            ],
+            "account_name": processor._name,
+        }
+    )
+
+
+def random_rules(
+    rng: np.random.Generator, processor: Processor, df: pd.DataFrame
+) -> Processor:
+    """
+    Returns a copy of the processor with random skip_transactions, conditional skips and
+    categories, and description rewrites. Skips and rules use the processor's own
+    identifiers, so they occur in the descriptions of random_transactions. The rewrites
+    remove store numbers and turn some identifiers into others.
+
+    :param df: Transactions of the processor, whose amounts and dates the conditions are
+        drawn from.
+    """
+    identifiers = list(processor._type_category_by_identifier)
+    type_categories = sorted(
+        set(processor._type_category_by_identifier.values()),
+        key=lambda type_category: type_category[1],
+    )
+
+    def pick_identifier() -> str:
+        return identifiers[rng.integers(len(identifiers))]
+
+    def random_conditions() -> Conditions:
+        cents = np.abs(df["amount_cents"].dropna().to_numpy(dtype="int64"))
+        low, high = sorted(rng.choice(cents, 2)) if len(cents) else (None, None)
+        start, end = sorted(rng.choice(df["date"].to_numpy(), 2))
+        return Conditions(
+            min_amount_cents=int(low) if rng.random() < 0.5 else None,
+            max_amount_cents=int(high) if rng.random() < 0.5 else None,
+            start=pd.Timestamp(start) if rng.random() < 0.5 else None,
+            end=pd.Timestamp(end) if rng.random() < 0.5 else None,
+            account_names=(
+                [processor._name, "Other"][: rng.integers(1, 3)]
+                if rng.random() < 0.3
+                else None
+            ),
+        )
+
+    rewrites = [(r"#\d+", " ")] + [
+        (re.escape(pick_identifier()), pick_identifier()) for _ in range(3)
+    ]
+    return Processor(
+        name=processor._name,
+        file_prefix=processor._file_prefix,
+        parser=None,
+        skip_transactions=[pick_identifier() for _ in range(2)],
+        type_category_by_identifier=processor._type_category_by_identifier,
+        normalizer=DescriptionNormalizer(rewrites),
+        conditional_skips=[(pick_identifier(), random_conditions()) for _ in range(2)],
+        conditional_categories=[
+            (
+                pick_identifier(),
+                random_conditions(),
+                type_categories[rng.integers(len(type_categories))],
+            )
+            for _ in range(4)
+        ],
+    )
+
+
+def check_parse_cents(
+    amounts: pd.Series,
+    parse_cents: Callable[[pd.Series], pd.Series] = money.parse_cents,
+) -> EquivalenceResult:
+    """
+    Compares a vectorized amount parser with parsing each amount with Decimal.
+    """
+    expected, reference_seconds = _timed(
+        lambda: [_reference_cents(amount) for amount in amounts]
+    )
+    actual, candidate_seconds = _timed(lambda: parse_cents(amounts))
+    actual = [None if pd.isna(cents) else int(cents) for cents in actual]
+    mismatches = [
+        f"{amount!r}: expected {want}, got {got}"
+        for amount, want, got in zip(amounts, expected, actual)
+        if want != got
+    ]
+    return _result(
+        "parse_cents", len(amounts), reference_seconds, candidate_seconds, mismatches
+    )
+
+
+def check_normalizer(
+    normalizer: DescriptionNormalizer,
+    descriptions: pd.Series,
+    normalize: (
+        Callable[[np.ndarray, pd.Index], tuple[np.ndarray, pd.Index]] | None
+    ) = None,
+) -> EquivalenceResult:
+    """
+    Compares normalizing factorized descriptions with rewriting every row's description
+    with re.sub.
+
+    :param descriptions: Lowercase descriptions, as the processors pass them.
+    :param normalize: Defaults to normalizer.normalize.
+    """
+    normalize = normalize or normalizer.normalize
+    expected, reference_seconds = _timed(
+        lambda: [
+            (
+                None
+                if pd.isna(description)
+                else _reference_rewrite(normalizer, description)
+            )
+            for description in descriptions
+        ]
+    )
+
+    def candidate():
+        codes, uniques = pd.factorize(descriptions)
+        codes, uniques = normalize(codes, pd.Index(uniques))
+        return [uniques[code] if code >= 0 else None for code in codes]
+
+    actual, candidate_seconds = _timed(candidate)
+    mismatches = [
+        f"{description!r}: expected {want!r}, got {got!r}"
+        for description, want, got in zip(descriptions, expected, actual)
+        if want != got
+    ]
+    return _result(
+        "normalizer",
+        len(descriptions),
+        reference_seconds,
+        candidate_seconds,
+        mismatches,
+    )
+
+
+def check_skip(
+    processor: Processor,
+    df: pd.DataFrame,
+    remove_skipped: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+) -> EquivalenceResult:
+    """
+    Compares a skip filter with checking every row's rewritten description against each
+    skip_transactions entry, and each conditional skip's identifier and conditions.
+
+    :param remove_skipped: Defaults to processor.remove_skipped_transactions.
+    """
+    remove_skipped = remove_skipped or processor.remove_skipped_transactions
+
+    def reference():
+        return [
+            not _reference_skipped(processor, row)
+            for row in df.to_dict(orient="records")
+        ]
+
+    expected, reference_seconds = _timed(reference)
+    kept, candidate_seconds = _timed(lambda: remove_skipped(df))
+    actual = df.index.isin(kept.index)
+    mismatches = [
+        f"{description!r}: expected {'kept' if want else 'skipped'}, got "
+        f"{'kept' if got else 'skipped'}"
+        for description, want, got in zip(df["description"], expected, actual)
+        if want != got
+    ]
+    return _result("skip", len(df), reference_seconds, candidate_seconds, mismatches)
+
+
+def check_categorize(
+    processor: Processor,
+    df: pd.DataFrame,
+    categorize: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+    name: str = "categorize",
+) -> EquivalenceResult:
+    """
+    Compares a categorization engine with categorizing every row on its own: the row's
+    description, rewritten by the processor's normalizer if it has one, is checked like
+    Processor._categorize_row does, then against each conditional category.
+
+    Rows on which the reference raises (identifiers across multiple categories) are left out
+    of the frame that is compared, and the engine must instead raise a ValueError on each of
+    them alone.
+
+    :param categorize: Takes a DataFrame and returns it with "type" and "category" columns.
+        Defaults to processor.categorize.
+    """
+    categorize = categorize or processor.categorize
+
+    def reference():
+        outcomes = []
+        for row in df.to_dict(orient="records"):
+            try:
+                outcomes.append(_reference_categorize(processor, row))
+            except ValueError:
+                outcomes.append(None)
+        return outcomes
+
+    expected, reference_seconds = _timed(reference)
+    conflicting = np.array([outcome is None for outcome in expected], dtype=bool)
+    clean = df[~conflicting]
+    actual, candidate_seconds = _timed(lambda: categorize(clean))
+
+    mismatches = [
+        f"{description!r}: expected {want}, got {(type, category)}"
+        for description, want, type, category in zip(
+            clean["description"],
+            [outcome for outcome in expected if outcome is not None],
+            actual["type"],
+            actual["category"],
+        )
+        if want != (type, category)
+    ]
+    for position in np.flatnonzero(conflicting)[:MAX_CONFLICT_CHECKS]:
+        row = df.iloc[[position]]
+        try:
+            categorize(row)
+        except ValueError:
+            continue
+        mismatches.append(
+            f"{row['description'].iloc[0]!r}: expected a ValueError for conflicting "
+            "identifiers"
+        )
+    return _result(name, len(df), reference_seconds, candidate_seconds, mismatches)
+
+
+def check_calculator(
+    flp_calculator: FLPCalculator,
+    df: pd.DataFrame,
+    rng: np.random.Generator,
+) -> EquivalenceResult:
+    """
+    Compares a Calculator built incrementally, one file at a time and with one file removed
+    and added again, with totals and per-category sums accumulated row by row in Python
+    integers.
+
+    :param df: Categorized transactions with a "filename" column.
+    """
+    expected, reference_seconds = _timed(lambda: _reference_aggregates(df))
+
+    def incremental():
+        frames = [frame for _, frame in df.groupby("filename", sort=False)]
+        calculator = Calculator(flp_calculator, 1, 50, frames[0])
+        for frame in frames[1:]:
+            calculator.add_transactions(frame)
+        churned = frames[rng.integers(len(frames))]
+        calculator.remove_transactions(churned)
+        calculator.add_transactions(churned)
+        return calculator
+
+    calculator, candidate_seconds = _timed(incremental)
+    actual = {
+        Type.INCOME: (calculator.income_total(), calculator.income_by_category()),
+        Type.EXPENSE: (calculator.expense_total(), calculator.expense_by_category()),
+        Type.GIVING: (calculator.giving_total(), calculator.giving_by_category()),
+    }
+    mismatches = []
+    for type, (total_cents, cents_by_category) in expected.items():
+        total, by_category = actual[type]
+        if total != total_cents / 100:
+            mismatches.append(
+                f"{type.value} total: expected {total_cents / 100}, got {total}"
+            )
+        expected_by_category = {
+            category: cents / 100 for category, cents in cents_by_category.items()
+        }
+        if by_category.to_dict() != expected_by_category:
+            mismatches.append(
+                f"{type.value} by category: expected {expected_by_category}, "
+                f"got {by_category.to_dict()}"
+            )
+
+    expected_no_type = sorted(
+        df.loc[df["type"] == Type.NO_TYPE, ["filename", "description"]].itertuples(
+            index=False, name=None
+        )
+    )
+    actual_no_type = sorted(
+        calculator.no_type_rows()[["filename", "description"]].itertuples(
+            index=False, name=None
+        )
+    )
+    if actual_no_type != expected_no_type:
+        mismatches.append(
+            f"no type rows: expected {len(expected_no_type)}, got {len(actual_no_type)}"
+        )
+    return _result(
+        "calculator", len(df), reference_seconds, candidate_seconds, mismatches
+    )
+
+
+def check_annual_lines(
+    flp_calculator: FLPCalculator,
+    household_sizes: list[int],
+    percentiles: list[int],
+) -> EquivalenceResult:
+    """
+    Compares FLPCalculator.compute_annual_lines with compute_annual_line called on every
+    scenario. The lines must be exactly equal, not just close.
+    """
+    expected, reference_seconds = _timed(
+        lambda: [
+            flp_calculator.compute_annual_line(household_size, percentile)
+            for household_size, percentile in zip(household_sizes, percentiles)
+        ]
+    )
+    actual, candidate_seconds = _timed(
+        lambda: flp_calculator.compute_annual_lines(household_sizes, percentiles)
+    )
+    mismatches = [
+        f"household size {household_size}, percentile {percentile}: "
+        f"expected {want}, got {got}"
+        for household_size, percentile, want, got in zip(
+            household_sizes, percentiles, expected, actual
+        )
+        if want != got
+    ]
+    return _result(
+        "annual_lines",
+        len(household_sizes),
+        reference_seconds,
+        candidate_seconds,
+        mismatches,
+    )
+
+
+def run_equivalence(
+    flp_calculator: FLPCalculator,
+    seed: int = 0,
+    num_rows: int = 2000,
+    num_identifiers: int = 50,
+    num_scenarios: int = 500,
+    num_shards: int = 2,
+    num_amounts: int = 100_000,
+) -> list[EquivalenceResult]:
+    """
+    Generates random inputs from the seed and runs every comparison on them.
+
+    :param num_shards: The number of worker processes of the sharded categorization check.
+    :param num_amounts: The number of amounts parse_cents is checked on. Amounts are parsed
+        a whole file at a time, so this is larger than num_rows, which would mostly time
+        the fixed cost of a call.
+
+    :return: One EquivalenceResult per optimized engine.
+    """
+    rng = np.random.default_rng(seed)
+    processor = random_processor(rng, num_identifiers)
+    df = random_transactions(rng, processor, num_rows)
+
+    results = [check_parse_cents(random_amounts(rng, num_amounts))]
+    results.append(check_categorize(processor, df))
+    sharded = Processor(
+        name=processor._name,
+        file_prefix=processor._file_prefix,
+        parser=None,
+        skip_transactions=[],
+        type_category_by_identifier=processor._type_category_by_identifier,
+        num_shards=num_shards,
+        min_shard_identifiers=0,
+    )
+    try:
+        results.append(
+            check_categorize(
+                processor, df, sharded.categorize, name="categorize_sharded"
+            )
+        )
+    finally:
+        sharded.close()
+
+    ruled = random_rules(rng, processor, df)
+    results.append(check_normalizer(ruled._normalizer, df["description"].str.lower()))
+    results.append(check_skip(ruled, df))
+    results.append(check_categorize(ruled, df, name="categorize_rules"))
+
+    # The Calculator comparison needs categorized rows, so conflicting rows are dropped
+    conflicting = df["description"].map(
+        lambda description: _raises(processor, description)
+    )
+    categorized = processor.categorize(df[~conflicting.to_numpy(dtype=bool)])
+    results.append(check_calculator(flp_calculator, categorized, rng))
+
+    results.append(
+        check_annual_lines(
+            flp_calculator,
+            rng.integers(1, 13, num_scenarios).tolist(),
+            rng.integers(1, 100, num_scenarios).tolist(),
+        )
+    )
+    return results
+
+
+def _reference_cents(amount) -> int | None:
+    """
+    Parses one amount string into cents with Decimal, rounding half away from zero.
+    """
+    if pd.isna(amount):
+        return None
+    cleaned = re.sub(r"[\s$,]", "", amount)
+    if cleaned == "":
+        return None
+    negative = cleaned.startswith("(") and cleaned.endswith(")")
+    cents = (Decimal(cleaned.strip("()")) * 100).quantize(
+        Decimal(1), rounding=ROUND_HALF_UP
+    )
+    return int(-cents if negative else cents)
+
+
+def _reference_rewrite(normalizer: DescriptionNormalizer, description: str) -> str:
+    """
+    Applies every rewrite of the normalizer to one description with re.sub, then collapses
+    and strips whitespace.
+    """
+    for pattern, replacement in normalizer.rewrites():
+        description = re.sub(pattern, replacement, description, flags=re.IGNORECASE)
+    return " ".join(description.split())
+
+
+def _reference_description(processor: Processor, description) -> str | None:
+    """
+    Returns the text the processor matches a description against: lowercased, and
+    rewritten if the processor has a normalizer. None if the description is missing.
+    """
+    if pd.isna(description):
+        return None
+    description = description.lower()
+    if processor._normalizer is not None:
+        description = _reference_rewrite(processor._normalizer, description)
+    return description
+
+
+def _reference_meets(conditions: Conditions, row: dict) -> bool:
+    """
+    Checks every condition against one row. Missing values never meet a condition.
+    """
+    if (
+        conditions._min_amount_cents is not None
+        or conditions._max_amount_cents is not None
+    ):
+        if pd.isna(row["amount_cents"]):
+            return False
+        cents = abs(int(row["amount_cents"]))
+        if (
+            conditions._min_amount_cents is not None
+            and cents < conditions._min_amount_cents
+        ):
+            return False
+        if (
+            conditions._max_amount_cents is not None
+            and cents > conditions._max_amount_cents
+        ):
+            return False
+    if conditions._start is not None and not row["date"] >= conditions._start:
+        return False
+    if conditions._end is not None and not row["date"] <= conditions._end:
+        return False
+    if (
+        conditions._account_names is not None
+        and row["account_name"] not in conditions._account_names
+    ):
+        return False
+    return True
+
+
+def _reference_rule_matches(identifier: str, description: str | None) -> bool:
+    # A missing description only contains the empty identifier
+    return identifier == "" if description is None else identifier in description
+
+
+def _reference_skipped(processor: Processor, row: dict) -> bool:
+    description = _reference_description(processor, row["description"])
+    if description is not None and any(
+        skip in description for skip in processor._skip_transactions
+    ):
+        return True
+    return any(
+        _reference_rule_matches(identifier, description)
+        and _reference_meets(conditions, row)
+        for identifier, conditions in processor._conditional_skips
+    )
+
+
+def _reference_categorize(processor: Processor, row: dict) -> tuple[Type, str]:
+    """
+    :raises ValueError: If the row's description contains identifiers of different
+        categories, or meets conditional categories of different categories.
+    """
+    description = _reference_description(processor, row["description"])
+    type_category = (Type.NO_TYPE, Processor.NO_CATEGORY)
+    if description is not None:
+        categorized = processor._categorize_row({"description": description})
+        type_category = (categorized["type"], categorized["category"])
+    conditional = {
+        rule_type_category
+        for identifier, conditions, rule_type_category in (
+            processor._conditional_categories
+        )
+        if _reference_rule_matches(identifier, description)
+        and _reference_meets(conditions, row)
+    }
+    if len(conditional) > 1:
+        raise ValueError(f"Transaction met conditional categories {conditional}")
+    return conditional.pop() if conditional else type_category
+
+
+def _reference_aggregates(df: pd.DataFrame) -> dict[Type, tuple[int, dict[str, int]]]:
+    """
+    Sums the cents of every row into per-type totals and per-category sums, with expenses
+    and giving made positive. Missing amounts count as 0 but still create their category.
+    """
+    direction_by_type = {Type.INCOME: 1, Type.EXPENSE: -1, Type.GIVING: -1}
+    aggregates = {type: [0, {}] for type in direction_by_type}
+    for type, category, cents in zip(df["type"], df["category"], df["amount_cents"]):
+        if type not in direction_by_type:
+            continue
+        cents = 0 if pd.isna(cents) else int(cents) * direction_by_type[type]
+        aggregates[type][0] += cents
+        aggregates[type][1][category] = aggregates[type][1].get(category, 0) + cents
+    return {
+        type: (total, dict(sorted(by_category.items())))
+        for type, (total, by_category) in aggregates.items()
+    }
+
+
+def _raises(processor: Processor, description: str) -> bool:
+    try:
+        processor._categorize_row({"description": description})
+    except ValueError:
+        return True
+    return False
+
+
+def _result(
+    name: str,
+    cases: int,
+    reference_seconds: float,
+    candidate_seconds: float,
+    mismatches: list[str],
+) -> EquivalenceResult:
+    return EquivalenceResult(
+        name,
+        cases,
+        reference_seconds,
+        candidate_seconds,
+        len(mismatches),
+        mismatches[:MAX_EXAMPLES],
+    )
+
+
+def _timed(function: Callable):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def _random_word(rng: np.random.Generator) -> str:
+    length = int(rng.integers(3, 8))
+    return "".join(rng.choice(list(string.ascii_lowercase), length))
+
+
+def _random_case(rng: np.random.Generator, text: str) -> str:
+    return [text, text.upper(), text.title()][rng.integers(3)]
+
+
+if __name__ == "__main__":
+    from flp.flp_dataset import Dataset
+
+    parser = argparse.ArgumentParser(
+        description="Checks optimized engines against their reference implementations."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--identifiers", type=int, default=50)
+    parser.add_argument("--scenarios", type=int, default=500)
+    parser.add_argument("--shards", type=int, default=2)
+    parser.add_argument("--amounts", type=int, default=100_000)
+    args = parser.parse_args()
+    # Conflicting identifiers are generated on purpose, so their error logs are expected
+    logging.disable(logging.ERROR)
+
+    results = run_equivalence(
+        FLPCalculator(Dataset()),
+        args.seed,
+        args.rows,
+        args.identifiers,
+        args.scenarios,
+        args.shards,
+        args.amounts,
+    )
+    for result in results:
+        print(result)
+        for example in result.examples:
+            print(f"\t{example}")
+    if not all(result.passed() for result in results):
+        raise SystemExit(1)
@@ -1,8 +1,272 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+
+from engine import money
+from engine.calculator import Calculator
+from engine.type import Type
+
+# Budgeted types, and the sign that turns a transaction amount into a positive actual
+DIRECTION_BY_TYPE = {Type.INCOME: 1, Type.EXPENSE: -1, Type.GIVING: -1}
+
+
 class Budget:
-    pass
-    # read from csv budget_{month that budget starts for | version number}.csv
-        # bucket: category: amount
-        # example-     income: ts: 10
-        #              income: tut: 10
-        #              expense: X: 10
-    # bucket & category source of truth is found here
+    """
+    A single budget version, read from budget_{YYYY-MM}.csv. It applies from its start
+    month until the month before the next version starts.
+
+    The file has a "bucket" column (income, expense or giving), a "category" column and an
+    "amount" column holding the positive monthly budget for that category, e.g.:
+
+        bucket,category,amount
+        income,salary,5000
+        expense,groceries,600
+        giving,church,500
+    """
+
+    def __init__(self, start_month: pd.Period, amounts: pd.DataFrame) -> None:
+        """
+        :param start_month: The first month this version applies to.
+        :param amounts: A DataFrame with "type", "category" and "budget_cents" columns.
+        """
+        self._start_month = start_month
+        self._amounts = amounts
+
+    def start_month(self) -> pd.Period:
+        return self._start_month
+
+    def amounts(self) -> pd.DataFrame:
+        return self._amounts
+
+    @staticmethod
+    def from_csv(file_path: str, start_month: pd.Period) -> "Budget":
+        """
+        Reads a budget version from its CSV file.
+
+        :raises ValueError: If a bucket isn't a budgeted type or a category is listed twice.
+        """
+        df = pd.read_csv(
+            file_path, dtype={"bucket": str, "category": str, "amount": str}
+        )
+        df["bucket"] = df["bucket"].str.strip().str.lower()
+
+        budget_types = [type.value for type in DIRECTION_BY_TYPE]
+        unknown_buckets = df.loc[~df["bucket"].isin(budget_types), "bucket"].unique()
+        if len(unknown_buckets):
+            raise ValueError(
+                f"{file_path} - Unrecognized buckets {list(unknown_buckets)}, expected one of {budget_types}"
+            )
+
+        duplicates = df[df.duplicated(subset=["bucket", "category"])]
+        if not duplicates.empty:
+            raise ValueError(
+                f"{file_path} - Categories must appear once per bucket. Duplicates: "
+                f"{list(duplicates[['bucket', 'category']].itertuples(index=False, name=None))}"
+            )
+
+        return Budget(
+            start_month,
+            pd.DataFrame(
+                {
+                    "type": df["bucket"],
+                    "category": df["category"],
+                    "budget_cents": money.parse_cents(df["amount"]).fillna(0),
+                }
+            ),
+        )
+
+
+class BudgetStore:
+    """
+    Reads every budget version in a directory into one table indexed by
+    (start_month, type, category).
+
+    The table is cached and only re-read when a budget file is added, removed or modified.
+    """
+
+    FILENAME_PATTERN = re.compile(r"^budget_(\d{4}-\d{2})\.csv$")
+
+    def __init__(self, budget_dir: str) -> None:
+        self._budget_dir = budget_dir
+        self._signature = None
+        self._table = None
+        self._start_months = None
+
+    def versions(self) -> list[Budget]:
+        """
+        Returns every budget version in the directory, ordered by start month.
+        """
+        versions = []
+        for filename, start_month in self._budget_files():
+            versions.append(
+                Budget.from_csv(os.path.join(self._budget_dir, filename), start_month)
+            )
+        return versions
+
+    def table(self) -> pd.DataFrame:
+        """
+        Returns the "budget_cents" of every version, indexed by (start_month, type, category).
+        """
+        signature = [
+            (filename, os.stat(os.path.join(self._budget_dir, filename)).st_mtime_ns)
+            for filename, _ in self._budget_files()
+        ]
+        if signature != self._signature:
+            versions = self.versions()
+            if not versions:
+                raise ValueError(
+                    f"No budget_YYYY-MM.csv files found in {self._budget_dir}"
+                )
+            self._table = (
+                pd.concat(
+                    [
+                        version.amounts().assign(start_month=version.start_month())
+                        for version in versions
+                    ]
+                )
+                .set_index(["start_month", "type", "category"])
+                .sort_index()
+            )
+            self._start_months = pd.PeriodIndex(
+                [version.start_month() for version in versions]
+            )
+            self._signature = signature
+        return self._table
+
+    def lookup(self, month: pd.Period, type: Type, category: str) -> float:
+        """
+        Returns the budget in dollars for a category in a month, or 0 if the category
+        isn't budgeted in the version that applies to that month.
+
+        :raises KeyError: If no budget version starts on or before the month.
+        """
+        table = self.table()
+        start_month = self._effective_start_months(pd.PeriodIndex([month]))[0]
+        if pd.isna(start_month):
+            raise KeyError(f"No budget version applies to {month}")
+        key = (start_month, type.value, category)
+        return table.loc[key, "budget_cents"] / 100 if key in table.index else 0.0
+
+    def budgets_for_months(self, months: pd.PeriodIndex) -> pd.DataFrame:
+        """
+        Returns the budget of every category for each month, using the latest version that
+        starts on or before that month. Months before the first version are left out.
+
+        :return: A DataFrame with "month", "type", "category" and "budget_cents" columns.
+        """
+        table = self.table().reset_index()
+        months = pd.PeriodIndex(months).unique()
+        month_versions = pd.DataFrame(
+            {"month": months, "start_month": self._effective_start_months(months)}
+        ).dropna()
+        return month_versions.merge(table, on="start_month").drop(columns="start_month")
+
+    def _effective_start_months(self, months: pd.PeriodIndex) -> pd.PeriodIndex:
+        """
+        Returns the start month of the version that applies to each month (NaT if none).
+        """
+        self.table()
+        positions = (
+            np.searchsorted(self._start_months.asi8, months.asi8, side="right") - 1
+        )
+        return pd.PeriodIndex(
+            [self._start_months[p] if p >= 0 else pd.NaT for p in positions],
+            freq="M",
+        )
+
+    def _budget_files(self) -> list[tuple[str, pd.Period]]:
+        """
+        Returns (filename, start_month) of every budget file in the directory, ordered by month.
+        """
+        budget_files = []
+        for filename in os.listdir(self._budget_dir):
+            match = self.FILENAME_PATTERN.match(filename)
+            if match:
+                budget_files.append((filename, pd.Period(match.group(1), freq="M")))
+        return sorted(budget_files, key=lambda budget_file: budget_file[1])
+
+
+def actuals_by_month(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sums categorized transactions per (month, type, category) in a single groupby, with
+    expenses and giving made positive to match the budget's sign convention.
+
+    :param df: A categorized DataFrame with "date", "type", "category" and "amount_cents" columns.
+    :return: A DataFrame with "month", "type", "category" and "actual_cents" columns.
+    """
+    budgeted = df[df["type"].isin(list(DIRECTION_BY_TYPE))]
+    direction = budgeted["type"].map(DIRECTION_BY_TYPE).astype("int64")
+    return (
+        pd.DataFrame(
+            {
+                "month": pd.to_datetime(budgeted["date"]).dt.to_period("M"),
+                "type": budgeted["type"].map(
+                    {type: type.value for type in DIRECTION_BY_TYPE}
+                ),
+                "category": budgeted["category"],
+                "actual_cents": budgeted["amount_cents"] * direction,
+            }
+        )
+        .groupby(["month", "type", "category"], as_index=False)["actual_cents"]
+        .sum()
+    )
+
+
+def actuals_from_calculator(calculator: Calculator, month: pd.Period) -> pd.DataFrame:
+    """
+    Flattens the Calculator's per-category Series into the same shape as actuals_by_month,
+    attributing everything to a single month.
+    """
+    by_category_by_type = {
+        Type.INCOME: calculator.income_by_category(),
+        Type.EXPENSE: calculator.expense_by_category(),
+        Type.GIVING: calculator.giving_by_category(),
+    }
+    actuals = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "type": type.value,
+                    "category": by_category.index,
+                    "actual_cents": money.to_cents(by_category).to_numpy(),
+                }
+            )
+            for type, by_category in by_category_by_type.items()
+        ]
+    )
+    actuals.insert(0, "month", pd.Period(month, freq="M"))
+    return actuals
+
+
+def compute_variance(store: BudgetStore, actuals: pd.DataFrame) -> pd.DataFrame:
+    """
+    Joins actuals against the budgets in effect for each of their months in one merge.
+
+    Categories that are budgeted but have no transactions, and categories with transactions
+    but no budget, are both kept, with the missing side set to 0.
+
+    :param actuals: A DataFrame as returned by actuals_by_month or actuals_from_calculator.
+    :return: A DataFrame with "month", "type", "category", "budget", "actual" and "variance"
+        columns, in dollars. A positive variance means the category is under budget for
+        expenses and giving, and over budget (more income than planned) for income.
+    """
+    budgets = store.budgets_for_months(pd.PeriodIndex(actuals["month"]))
+    merged = budgets.merge(
+        actuals, on=["month", "type", "category"], how="outer"
+    ).fillna({"budget_cents": 0, "actual_cents": 0})
+
+    is_income = merged["type"] == Type.INCOME.value
+    variance_cents = (merged["budget_cents"] - merged["actual_cents"]).where(
+        ~is_income, merged["actual_cents"] - merged["budget_cents"]
+    )
+    return pd.DataFrame(
+        {
+            "month": merged["month"],
+            "type": merged["type"],
+            "category": merged["category"],
+            "budget": money.to_dollars(merged["budget_cents"]),
+            "actual": money.to_dollars(merged["actual_cents"]),
+            "variance": money.to_dollars(variance_cents),
+        }
+    ).sort_values(["month", "type", "category"], ignore_index=True)
@@ -1,18 +1,58 @@
 import argparse
 
+import pandas as pd
+
+
+def int_list(value: str) -> list[int]:
+    """
+    Parses a comma-separated list of integers and inclusive ranges, e.g. "1-3,5" -> [1, 2, 3, 5].
+    Duplicates are dropped and the original order is kept.
+    """
+    values = []
+    for part in value.split(","):
+        start, separator, end = part.strip().partition("-")
+        try:
+            if separator:
+                values.extend(range(int(start), int(end) + 1))
+            else:
+                values.append(int(start))
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"{value} is not a list of integers or ranges like 1-3,5"
+            )
+    if not values:
+        raise argparse.ArgumentTypeError(f"{value} does not contain any integers")
+    return list(dict.fromkeys(values))
+
+
+def period(value: str) -> pd.Period:
+    """
+    Parses a day, month or year, e.g. "2024-01-15", "2024-01" or "2024".
+    """
+    try:
+        return pd.Period(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"{value} is not a date like 2024-01-15, a month like 2024-01 or a year"
+        )
+
 
 def get_args() -> argparse.Namespace:
     """Parses command line arguments and returns the parsed namespace"""
     parser = argparse.ArgumentParser(description="Treasures")
     parser.add_argument(
-        "-n", "--household_size", help="Household size", required=True, type=int
+        "-n",
+        "--household_size",
+        help="Household size, or a list of sizes and ranges to compare, e.g. 2-4,6",
+        required=True,
+        type=int_list,
     )
     parser.add_argument(
         "-p",
         "--percentile",
-        help="Target percentile of income",
+        help="Target percentile of income, or a list of percentiles and ranges to compare, e.g. 25,50-52",
         required=True,
-        type=int,
+        type=int_list,
     )
     parser.add_argument(
         "-f",
@@ -27,4 +67,161 @@ def get_args() -> argparse.Namespace:
         required=True,
         default="data/config.json",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "-b",
+        "--budget_dir",
+        help="Location of budget_YYYY-MM.csv files to compare actuals against",
+    )
+    parser.add_argument(
+        "--from",
+        dest="from_period",
+        help="Only count transactions from the start of this day, month or year, e.g. 2024-01",
+        type=period,
+    )
+    parser.add_argument(
+        "--to",
+        dest="to_period",
+        help="Only count transactions up to the end of this day, month or year, e.g. 2024-03",
+        type=period,
+    )
+    parser.add_argument(
+        "--manifest_file",
+        help="Where the index of statement files is kept, which lets --from and --to skip files outside the range without reading them",
+        default="data/manifest.json",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        help="Reuse the stats from this folder when the statements, config, FLP dataset and options are unchanged. "
+        "Only used for text reports without --transfers tag, --budget_dir, --diagnostics, --recurring or --watch",
+    )
+    parser.add_argument(
+        "--cache_size",
+        help="Number of reports kept in cache_dir. The least recently used ones are removed",
+        type=int,
+        default=16,
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Save each categorized file to checkpoint_dir as soon as it is done, so that a failed run can "
+        "be resumed. Requires pyarrow",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--resume",
+        help="Reuse the files that earlier runs saved to checkpoint_dir whose contents, processor and date "
+        "range are unchanged, and checkpoint the rest. Requires pyarrow",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--checkpoint_dir",
+        help="Where --checkpoint and --resume save each categorized file",
+        default="data/checkpoints",
+    )
+    parser.add_argument(
+        "--dedup",
+        help="How to drop transactions repeated across overlapping statements: keep every row (off), "
+        "one row per identical transaction (exact), or as many identical rows as any single file has (occurrence)",
+        choices=["off", "exact", "occurrence"],
+        default="off",
+    )
+    parser.add_argument(
+        "--transfers",
+        help="How to handle opposite, equal-amount transactions between two accounts (e.g. a card payment): "
+        "count both sides (off), list the pairs (tag), or leave both sides out of the stats (remove)",
+        choices=["off", "tag", "remove"],
+        default="off",
+    )
+    parser.add_argument(
+        "--transfer_window",
+        help="Maximum number of days between the two sides of a transfer",
+        type=int,
+        default=3,
+    )
+    parser.add_argument(
+        "-s",
+        "--suggest",
+        help="Group unmatched transactions by similar description and suggest identifiers for them",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--recurring",
+        help="Show recurring transactions, such as subscriptions, rent and payroll, grouped by account, merchant and amount",
+        action="store_true",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Print the stats as text, or write them as JSON Lines, CSV or Parquet files to output_dir",
+        choices=["text", "json", "csv", "parquet"],
+        default="text",
+    )
+    parser.add_argument(
+        "--output_dir",
+        help="Where --output json, csv and parquet files are written",
+        default="output",
+    )
+    parser.add_argument(
+        "--progress",
+        help="Show one progress bar instead of a message per file, and print the report in one write",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--engine",
+        help="pandas CSV engine used to read transaction files",
+        choices=["c", "pyarrow"],
+        default="c",
+    )
+    parser.add_argument(
+        "--prefetch",
+        help="Read up to this many upcoming files in background threads while the current one is categorized (0 reads them one at a time)",
+        type=int,
+        default=2,
+    )
+    parser.add_argument(
+        "--diagnostics",
+        help="Show how many transactions were skipped, unmatched or conflicting, per processor and identifier",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--match_shards",
+        help="Split each processor's identifiers across this many worker processes when categorizing. "
+        "Processors with fewer than 50,000 identifiers are matched in-process",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        help="Keep running and fold new or modified files in file_dir into the stats",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--poll_interval",
+        help="Seconds between polls of file_dir in watch mode",
+        type=float,
+        default=1.0,
+    )
+    parser.add_argument(
+        "--debounce",
+        help="Seconds a file must stay unchanged before it is read in watch mode",
+        type=float,
+        default=2.0,
+    )
+    args = parser.parse_args()
+    if args.watch and args.output != "text":
+        parser.error("--watch only supports --output text")
+
+    # The inclusive range of timestamps to read, or None to read everything
+    args.date_range = None
+    if args.from_period is not None or args.to_period is not None:
+        args.date_range = (
+            (
+                args.from_period.start_time
+                if args.from_period is not None
+                else pd.Timestamp.min
+            ),
+            args.to_period.end_time if args.to_period is not None else pd.Timestamp.max,
+        )
+        if args.date_range[0] > args.date_range[1]:
+            parser.error("--from must not be after --to")
+    return args
@@ -1,38 +1,143 @@
 import time
 import sys
+from typing import TextIO
 
 from colorama import Fore, Style
 from colorama.ansi import AnsiCodes
 
 
 class Printer:
+    """
+    Prints status messages and the report.
+
+    By default, each status message is animated with a short delay. In buffered mode there
+    are no delays: per-file messages are replaced by a single progress bar that is redrawn at
+    most every min_interval seconds, and report lines are collected and written at once by
+    flush(). When the stream isn't a terminal (e.g. output is piped to a file), colors,
+    animations and progress redraws are skipped.
+    """
+
+    def __init__(
+        self,
+        buffered: bool = False,
+        stream: TextIO | None = None,
+        min_interval: float = 0.2,
+    ) -> None:
+        self._buffered = buffered
+        self._stream = stream if stream is not None else sys.stdout
+        self._is_tty = self._stream.isatty()
+        self._min_interval = min_interval
+        self._buffer = []
+
+        self._total_files = 0
+        self._files_done = 0
+        self._rows_done = 0
+        self._progress_start = None
+        self._last_render = None
+
     def color_string(self, color: AnsiCodes, string: str) -> str:
         """Formats a string with the given color and resets to default afterwards."""
+        if not self._is_tty:
+            return string
         return f"{color}{string}{Style.RESET_ALL}"
 
     def format_delta(self, delta: str) -> str:
         """Returns a red or green color string based on the sign of the given float value."""
         color = Fore.RED if float(delta) < 0 else Fore.GREEN
-        return f"{color}{delta}{Style.RESET_ALL}"
+        return self.color_string(color, delta)
+
+    def print(self, *values: object, sep: str = " ") -> None:
+        """
+        Prints a line of the report. In buffered mode, the line is kept until flush().
+        """
+        line = sep.join(str(value) for value in values) + "\n"
+        if self._buffered:
+            self._buffer.append(line)
+        else:
+            self._stream.write(line)
+
+    def flush(self) -> None:
+        """Writes every buffered report line in a single write."""
+        if self._buffer:
+            self._stream.write("".join(self._buffer))
+            self._buffer = []
+        self._stream.flush()
 
     def print_line(self) -> None:
         """Prints a green line with 50 hyphens."""
-        print(self.color_string(Fore.GREEN, "-" * 50))
+        self.print(self.color_string(Fore.GREEN, "-" * 50))
 
     def print_message_with_checkmark(self, message: str, delay: float = 0.1) -> None:
         """
         Prints a message with a yellow color and a timer emoji, waits for the specified delay,
         and then overwrites the message with the same text but with a green checkmark emoji.
 
+        In buffered mode, or when the stream isn't a terminal, the message is printed once
+        with its checkmark and without waiting.
+
         :param message: The message to display
         :param delay: The delay in seconds (default: 0.5)
         :return: None
         """
-        print(f"{self.color_string(Fore.YELLOW, message)} ⏳", end="", flush=True)
+        if self._buffered or not self._is_tty:
+            self._stream.write(message + self.color_string(Fore.GREEN, " ✔") + "\n")
+            return
+
+        print(
+            f"{self.color_string(Fore.YELLOW, message)} ⏳",
+            end="",
+            flush=True,
+            file=self._stream,
+        )
 
         # Wait for the specified delay
         time.sleep(delay)
 
         # Move the cursor back to the beginning of the line and overwrite the message
-        sys.stdout.write("\r" + message + self.color_string(Fore.GREEN, " ✔") + "\n")
-        sys.stdout.flush()
+        self._stream.write("\r" + message + self.color_string(Fore.GREEN, " ✔") + "\n")
+        self._stream.flush()
+
+    def start_progress(self, total_files: int) -> None:
+        """Starts counting files and rows towards a progress bar."""
+        self._total_files = total_files
+        self._files_done = 0
+        self._rows_done = 0
+        self._progress_start = time.monotonic()
+        self._last_render = None
+
+    def print_file_progress(self, filename: str, rows: int) -> None:
+        """
+        Reports that a file with the given number of rows has been read. Outside of buffered
+        mode, this prints a message for the file. In buffered mode, only the counters are
+        updated, and the progress bar is redrawn if min_interval has passed since the last
+        redraw, so it is cheap to call once per file.
+        """
+        if not self._buffered:
+            self.print_message_with_checkmark(f"\tReading {filename}")
+            return
+
+        self._files_done += 1
+        self._rows_done += rows
+        now = time.monotonic()
+        if self._is_tty and (
+            self._last_render is None or now - self._last_render >= self._min_interval
+        ):
+            # Clear the rest of the line, in case the previous text was longer
+            self._stream.write("\r" + self._progress_text(now) + "\x1b[K")
+            self._stream.flush()
+            self._last_render = now
+
+    def finish_progress(self) -> None:
+        """Prints the final state of the progress bar on its own line."""
+        if not self._buffered or self._progress_start is None:
+            return
+        text = self._progress_text(time.monotonic())
+        self._stream.write(("\r" + text + "\x1b[K" if self._is_tty else text) + "\n")
+        self._progress_start = None
+
+    def _progress_text(self, now: float) -> str:
+        elapsed = max(now - self._progress_start, 1e-9)
+        return (
+            f"Read {self._files_done}/{self._total_files} files | "
+            f"{self._rows_done:,} rows | {self._rows_done / elapsed:,.0f} rows/s"
+        )
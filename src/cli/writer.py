@@ -0,0 +1,154 @@
+import os
+from enum import Enum
+
+import pandas as pd
+
+OUTPUT_FORMATS = ["text", "json", "csv", "parquet"]
+
+# Rows serialized per chunk, so large tables are never rendered in one piece
+CHUNK_ROWS = 50_000
+
+
+class RecordWriter:
+    """
+    Writes named tables of records (e.g. "summary", "transactions") to one file per table in
+    an output directory, a chunk of rows at a time.
+    """
+
+    EXTENSION = None
+
+    def __init__(self, output_dir: str, chunk_rows: int = CHUNK_ROWS) -> None:
+        os.makedirs(output_dir, exist_ok=True)
+        self._output_dir = output_dir
+        self._chunk_rows = chunk_rows
+
+    def path(self, name: str) -> str:
+        return os.path.join(self._output_dir, f"{name}.{self.EXTENSION}")
+
+    def write(self, name: str, df: pd.DataFrame) -> None:
+        """
+        Writes df as the table called name, replacing any previous file for it. Enum values,
+        such as transaction types, and months are written as strings.
+        """
+        path = self.path(name)
+        self._begin(path, _serializable(df.iloc[:0]))
+        for start in range(0, len(df), self._chunk_rows):
+            self._write_chunk(
+                path, _serializable(df.iloc[start : start + self._chunk_rows])
+            )
+        self._end(path)
+
+    def _begin(self, path: str, empty: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def _write_chunk(self, path: str, chunk: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def _end(self, path: str) -> None:
+        pass
+
+
+class JsonLinesWriter(RecordWriter):
+    """
+    Writes one JSON object per row, with dates in ISO format and missing values as null.
+    """
+
+    EXTENSION = "jsonl"
+
+    def _begin(self, path: str, empty: pd.DataFrame) -> None:
+        open(path, "w").close()
+
+    def _write_chunk(self, path: str, chunk: pd.DataFrame) -> None:
+        lines = chunk.to_json(orient="records", lines=True, date_format="iso")
+        with open(path, "a") as f:
+            f.write(lines if lines.endswith("\n") else lines + "\n")
+
+
+class CsvWriter(RecordWriter):
+    EXTENSION = "csv"
+
+    def _begin(self, path: str, empty: pd.DataFrame) -> None:
+        empty.to_csv(path, index=False)
+
+    def _write_chunk(self, path: str, chunk: pd.DataFrame) -> None:
+        chunk.to_csv(path, mode="a", header=False, index=False)
+
+
+class ParquetWriter(RecordWriter):
+    """
+    Writes each chunk as a row group of a single Parquet file. Requires pyarrow.
+    """
+
+    EXTENSION = "parquet"
+
+    def __init__(self, output_dir: str, chunk_rows: int = CHUNK_ROWS) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("--output parquet requires pyarrow to be installed")
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+        self._file_writer = None
+        super().__init__(output_dir, chunk_rows)
+
+    def _begin(self, path: str, empty: pd.DataFrame) -> None:
+        self._schema = None
+        self._empty = empty
+
+    def _write_chunk(self, path: str, chunk: pd.DataFrame) -> None:
+        # The schema comes from the first chunk, and later chunks are cast to it
+        table = self._pyarrow.Table.from_pandas(
+            chunk, schema=self._schema, preserve_index=False
+        )
+        if self._file_writer is None:
+            self._schema = table.schema
+            self._file_writer = self._parquet.ParquetWriter(path, self._schema)
+        self._file_writer.write_table(table)
+
+    def _end(self, path: str) -> None:
+        if self._file_writer is None:
+            self._parquet.write_table(
+                self._pyarrow.Table.from_pandas(self._empty, preserve_index=False),
+                path,
+            )
+        else:
+            self._file_writer.close()
+            self._file_writer = None
+
+
+def create_writer(output_format: str, output_dir: str) -> RecordWriter:
+    """
+    Returns the writer for a machine-readable output format.
+
+    :raises ValueError: If the format is "text" or unrecognized.
+    """
+    writer_by_format = {
+        "json": JsonLinesWriter,
+        "csv": CsvWriter,
+        "parquet": ParquetWriter,
+    }
+    if output_format not in writer_by_format:
+        raise ValueError(f"No record writer for output format {output_format}")
+    return writer_by_format[output_format](output_dir)
+
+
+def _serializable(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replaces Enum values in object columns with their values, and periods (e.g. budget
+    months) with their string form, e.g. "2024-01".
+    """
+    converted = {}
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.PeriodDtype):
+            converted[column] = df[column].astype("string")
+        elif df[column].dtype == object and isinstance(_first_value(df[column]), Enum):
+            converted[column] = df[column].map(
+                lambda value: value.value, na_action="ignore"
+            )
+    return df.assign(**converted) if converted else df
+
+
+def _first_value(series: pd.Series):
+    values = series.dropna()
+    return values.iloc[0] if len(values) else None
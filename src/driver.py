@@ -1,130 +1,747 @@
+import argparse
+import asyncio
+import hashlib
+import itertools
 import os
+from typing import Callable
 import pandas as pd
 
+from budget.budget import BudgetStore, actuals_by_month, compute_variance
 from colorama import Fore, Back, init
 from cli.argparse import get_args
 from cli.printer import Printer
+from cli.writer import RecordWriter, create_writer
 from engine.calculator import Calculator
+from engine.checkpoint import CheckpointStore
 from engine.config_loader import ConfigLoader
-from engine.parser import BOADebitParser, ChaseCreditParser, CitiCreditParser
+from engine.deduplicator import remove_duplicate_transactions
+from engine.diagnostics import UNMATCHED, Diagnostics
+from engine.money import format_cents
+from engine.manifest import FILTER, INDEX, SKIP, Manifest
+from engine.parser import (
+    BOADebitParser,
+    ChaseCreditParser,
+    ChaseDebitParser,
+    CitiCreditParser,
+)
+from engine.parser_registry import ParserRegistry
+from engine.prefetcher import prefetch
+from engine.preflight import preflight
+from engine.processor import Processor
+from engine.recurring import detect_recurring
+from engine.report_cache import ReportCache, fingerprint
 from flp.flp_calculator import FLPCalculator
 from flp.flp_dataset import Dataset
 import logging
 
-from engine.processor import Processor
+from engine.router import ProcessorRouter
+from engine.suggester import SuggestionEngine
+from engine.transfer_matcher import apply_transfers
+from engine.type import Type
+from engine.watcher import DirectoryWatcher
 
 logger = logging.getLogger(__name__)
 
-PARSER_BY_FORMAT = {
-    "boa_debit": BOADebitParser(),
-    "chase_credit": ChaseCreditParser(),
-    "citi_credit": CitiCreditParser(),
-    "chase_debit": None,
-}
+
+def build_parser_registry(engine: str) -> ParserRegistry:
+    """
+    Returns the registry of every supported file format, with parsers reading through
+    the given pandas CSV engine.
+    """
+    return ParserRegistry(
+        [
+            BOADebitParser(engine),
+            ChaseCreditParser(engine),
+            CitiCreditParser(engine),
+            ChaseDebitParser(engine),
+        ]
+    )
+
+
+COLUMNS = [
+    "date",
+    "description",
+    "amount",
+    "amount_cents",
+    "filename",
+    "account_name",
+    "type",
+    "category",
+]
 
 
 def main():
     # initialize colorama
     init()
-    printer = Printer()
     args = get_args()
+    printer = Printer(buffered=args.progress)
     file_dir = args.file_dir
 
     printer.print_message_with_checkmark("Starting up")
-    config_loader = ConfigLoader(args.config_file, PARSER_BY_FORMAT)
+    config_loader = ConfigLoader(
+        args.config_file,
+        build_parser_registry(args.engine).parser_by_format(),
+    )
     nickname_by_filename = config_loader.load_nickname_by_filename()
-    processors = config_loader.load_processors()
-    dataframes = []
+    # Only collected when they are shown, so that categorizing doesn't pay for them
+    diagnostics = Diagnostics() if args.diagnostics else None
+    category_tree = config_loader.load_category_tree()
+    normalizer = config_loader.load_normalizer()
+    processors = config_loader.load_processors(
+        args.match_shards, diagnostics, normalizer
+    )
+    try:
+        router = ProcessorRouter(processors)
+        # Every combination of the household sizes and percentiles. The stats use the first one.
+        scenarios = list(itertools.product(args.household_size, args.percentile))
+        household_size, percentile = scenarios[0]
+        dataset = Dataset()
+
+        watcher = None
+        if args.watch:
+            # Primed before the first read, so that statements added while it runs are
+            # picked up by the first poll
+            watcher = DirectoryWatcher(file_dir, args.poll_interval, args.debounce)
+            watcher.prime()
+
+        cache = None
+        snapshot = None
+        if args.cache_dir is not None and report_is_cacheable(args):
+            cache = ReportCache(args.cache_dir, args.cache_size)
+            cache_key = report_fingerprint(args, dataset, household_size, percentile)
+            snapshot = cache.get(cache_key)
+        if snapshot is not None:
+            printer.print_message_with_checkmark("Using the cached report")
+            calculator = Calculator.from_snapshot(
+                FLPCalculator(dataset), snapshot, category_tree
+            )
+            read_by_filename, dataframe_by_filename, combined_df = {}, {}, None
+        else:
+            try:
+                read_by_filename, dataframe_by_filename, combined_df = (
+                    read_transactions(args, printer, router, nickname_by_filename)
+                )
+            except ValueError:
+                # E.g. a category conflict, whose conflicting rows were just recorded
+                if diagnostics is not None:
+                    display_diagnostics(printer, diagnostics)
+                    printer.flush()
+                raise
+            if args.diagnostics:
+                count_unmatched(diagnostics, router, dataframe_by_filename)
+            if normalizer is not None:
+                num_descriptions, num_rewritten = normalizer.distinct_counts()
+                printer.print_message_with_checkmark(
+                    f"Rewrote {num_descriptions} distinct descriptions into {num_rewritten}"
+                )
+            calculator = Calculator(
+                FLPCalculator(dataset),
+                household_size,
+                percentile,
+                combined_df,
+                category_tree,
+            )
+            if cache is not None:
+                cache.put(cache_key, calculator.snapshot())
+        scenario_lines = None
+        if len(scenarios) > 1:
+            household_sizes, percentiles = zip(*scenarios)
+            scenario_lines = calculator.scenario_lines(
+                list(household_sizes), list(percentiles)
+            )
+        suggestions = (
+            SuggestionEngine(processors).suggest(calculator.no_type_rows())
+            if args.suggest
+            else None
+        )
+        recurring = detect_recurring(combined_df) if args.recurring else None
+        variance = (
+            compute_variance(
+                BudgetStore(args.budget_dir), actuals_by_month(combined_df)
+            )
+            if args.budget_dir
+            else None
+        )
+
+        if args.output != "text":
+            write_report(
+                create_writer(args.output, args.output_dir),
+                calculator,
+                household_size,
+                percentile,
+                combined_df,
+                {
+                    "scenarios": scenario_lines,
+                    "suggestions": suggestions,
+                    "recurring": recurring,
+                    "budget_variance": variance,
+                    "diagnostics": (diagnostics.counts() if args.diagnostics else None),
+                },
+            )
+            printer.print_message_with_checkmark(
+                f"Wrote {args.output} output to {args.output_dir}"
+            )
+            return
+
+        display_stats(printer, calculator)
+        if recurring is not None:
+            display_recurring(printer, recurring)
+        if scenario_lines is not None:
+            display_scenarios(printer, scenario_lines)
+        if suggestions is not None:
+            display_suggestions(printer, suggestions)
+        if args.transfers == "tag":
+            display_transfers(printer, combined_df)
+        if variance is not None:
+            display_budget_variance(printer, variance)
+        if args.diagnostics:
+            display_diagnostics(printer, diagnostics)
+        printer.flush()
+
+        if args.watch:
+            asyncio.run(
+                watch_directory(
+                    printer,
+                    watcher,
+                    router,
+                    nickname_by_filename,
+                    calculator,
+                    read_by_filename,
+                    dataframe_by_filename,
+                    args.dedup,
+                    args.transfers,
+                    args.transfer_window,
+                    args.date_range,
+                )
+            )
+
+    finally:
+        # Stops the worker processes of sharded matching
+        for processor in processors:
+            processor.close()
+
+
+def report_is_cacheable(args: argparse.Namespace) -> bool:
+    """
+    Returns whether the report only needs the Calculator's aggregates, and not the
+    transactions themselves, so that it can be served from the report cache.
+    """
+    return (
+        args.output == "text"
+        and args.transfers != "tag"
+        and args.budget_dir is None
+        and not args.diagnostics
+        and not args.recurring
+        and not args.watch
+    )
+
+
+def report_fingerprint(
+    args: argparse.Namespace, dataset: Dataset, household_size: int, percentile: int
+) -> str:
+    """
+    Fingerprints every input the Calculator's aggregates depend on: the statement files,
+    the config, the FLP dataset, and the options that change which rows are counted.
+    """
+    return fingerprint(
+        [f"{args.file_dir}/{filename}" for filename in os.listdir(args.file_dir)],
+        args.config_file,
+        dataset.source_files(),
+        {
+            "household_size": household_size,
+            "percentile": percentile,
+            "dedup": args.dedup,
+            "transfers": args.transfers,
+            "transfer_window": args.transfer_window,
+            "date_range": args.date_range,
+        },
+    )
+
+
+def read_transactions(
+    args: argparse.Namespace,
+    printer: Printer,
+    router: ProcessorRouter,
+    nickname_by_filename: dict[str, str],
+) -> tuple[dict[str, pd.DataFrame], dict[str, pd.DataFrame], pd.DataFrame]:
+    """
+    Reads, categorizes and combines every statement file in file_dir, then removes
+    duplicates and transfers as configured. With --checkpoint or --resume, each file is
+    checkpointed once it is categorized, hashed from the bytes read while parsing it.
+
+    :return: The categorized DataFrame of each file, the rows of each file that are
+        counted, and the combined DataFrame, see combine_files.
+    """
+    dataframe_by_filename = {}
     printer.print_message_with_checkmark("Opening folder")
 
-    for filename in os.listdir(file_dir):
-        printer.print_message_with_checkmark(f"\tReading {filename}")
-        processor = get_matching_processor(filename, processors)
-
-        df = processor.parse(f"{file_dir}/{os.fsdecode(filename)}")
-        if filename not in nickname_by_filename:
-            raise ValueError(f"{filename} does not have a nickname in the config file")
-        df["filename"] = filename
-        df["account_name"] = nickname_by_filename[filename]
-        df = processor.remove_skipped_transactions(df)
-        df = processor.categorize(df)
-        df = df[
-            [
-                "date",
-                "description",
-                "amount",
-                "filename",
-                "account_name",
-                "type",
-                "category",
-            ]
+    filenames = os.listdir(args.file_dir)
+    manifest = None
+    plan_by_filename = {}
+    if args.date_range is not None:
+        # Files entirely outside the date range are skipped without being read
+        manifest = Manifest(args.manifest_file)
+        plan_by_filename = {
+            filename: manifest.plan(f"{args.file_dir}/{filename}", args.date_range)
+            for filename in filenames
+        }
+        filenames = [
+            filename for filename in filenames if plan_by_filename[filename] != SKIP
         ]
-        dataframes.append(df)
+    # Every file is checked before any is parsed, so that all problems are reported at once
+    preflight(args.file_dir, filenames, router, nickname_by_filename)
 
-    combined_df = pd.concat(dataframes)
-    calculator = Calculator(
-        FLPCalculator(Dataset()), args.household_size, args.percentile, combined_df
+    checkpoints = None
+    if args.checkpoint or args.resume:
+        checkpoints = CheckpointStore(args.checkpoint_dir, args.date_range)
+    if args.resume:
+        # Files categorized by a previous run are reused instead of being read again
+        for filename in filenames:
+            df = checkpoints.get(
+                f"{args.file_dir}/{filename}",
+                router.route(filename),
+                nickname_by_filename[filename],
+            )
+            if df is not None:
+                dataframe_by_filename[filename] = df
+        if dataframe_by_filename:
+            printer.print_message_with_checkmark(
+                f"Resumed {len(dataframe_by_filename)} files from checkpoints"
+            )
+    filenames_to_read = [
+        filename for filename in filenames if filename not in dataframe_by_filename
+    ]
+    # Files are hashed for their checkpoints as they are parsed, instead of read again
+    digest_by_filename = (
+        {filename: hashlib.sha256() for filename in filenames_to_read}
+        if checkpoints is not None
+        else {}
     )
-    display_stats(printer, calculator)
 
+    printer.start_progress(len(filenames_to_read))
+    try:
+        # The next files are read in background threads while the current one is categorized
+        for filename, (processor, df) in prefetch(
+            lambda filename: read_file(
+                args.file_dir,
+                filename,
+                router,
+                nickname_by_filename,
+                args.date_range,
+                plan_by_filename.get(filename, FILTER),
+                manifest,
+                (
+                    digest_by_filename[filename].update
+                    if filename in digest_by_filename
+                    else None
+                ),
+            ),
+            filenames_to_read,
+            args.prefetch,
+        ):
+            dataframe_by_filename[filename] = categorize_file(processor, df)
+            if checkpoints is not None:
+                checkpoints.put(
+                    f"{args.file_dir}/{filename}",
+                    processor,
+                    nickname_by_filename[filename],
+                    dataframe_by_filename[filename],
+                    digest_by_filename[filename].hexdigest(),
+                )
+            printer.print_file_progress(filename, len(dataframe_by_filename[filename]))
+    finally:
+        # Files indexed before a failure don't need to be indexed again
+        if manifest is not None:
+            manifest.save()
+    printer.finish_progress()
+    # Only once every file is checkpointed, so that a failed run keeps the checkpoints of
+    # the files it didn't get to
+    if checkpoints is not None:
+        checkpoints.prune()
+    # In the order of the folder, whether files were resumed or read
+    dataframe_by_filename = {
+        filename: dataframe_by_filename[filename] for filename in filenames
+    }
 
-def get_matching_processor(filename: str, processors: list[Processor]) -> Processor:
+    counted_by_filename, combined_df = combine_files(
+        dataframe_by_filename, args.dedup, args.transfers, args.transfer_window
+    )
+    return dataframe_by_filename, counted_by_filename, combined_df
+
+
+def combine_files(
+    dataframe_by_filename: dict[str, pd.DataFrame],
+    dedup: str,
+    transfers: str,
+    transfer_window: int,
+) -> tuple[dict[str, pd.DataFrame], pd.DataFrame]:
     """
-    Given a list of Processors and a filename, return the processor whose prefix matches the filename.
-    If no processor matches, raise an exception.
-    If multiple processors match, raise an exception.
+    Combines the categorized files, then removes duplicates and transfers as configured.
+
+    :param dataframe_by_filename: The categorized DataFrame of each file, before
+        duplicates and transfers are removed. Earlier files win duplicates.
+    :return: The rows of each file that are counted, which is what the Calculator
+        aggregates for it, and the combined DataFrame.
     """
-    matching_processors = [
-        processor
-        for processor in processors
-        if filename.startswith(processor._file_prefix)
-    ]
-    if len(matching_processors) == 0:
-        raise ValueError(f"No processor prefix matches file: {filename}")
-    if len(matching_processors) > 1:
-        raise ValueError(
-            f"Multiple processors: {[processor._name for processor in matching_processors]} have prefixes matching file: {filename}"
+    combined_df = (
+        pd.concat(dataframe_by_filename.values())
+        if dataframe_by_filename
+        else pd.DataFrame(columns=COLUMNS)
+    )
+    if dedup == "off" and transfers != "remove":
+        if transfers == "tag":
+            combined_df = apply_transfers(combined_df, "tag", transfer_window)
+        return dict(dataframe_by_filename), combined_df
+
+    combined_df = remove_duplicate_transactions(combined_df, dedup)
+    combined_df = apply_transfers(combined_df, transfers, transfer_window)
+    frame_by_filename = dict(tuple(combined_df.groupby("filename", sort=False)))
+    return {
+        filename: frame_by_filename.get(filename, combined_df[:0])
+        for filename in dataframe_by_filename
+    }, combined_df
+
+
+def count_unmatched(
+    diagnostics: Diagnostics,
+    router: ProcessorRouter,
+    counted_by_filename: dict[str, pd.DataFrame],
+) -> None:
+    """
+    Records the unmatched rows that are counted, in place of those the processors recorded
+    while categorizing. Those include duplicates and transfers that were removed since, and
+    miss the files that were resumed from checkpoints.
+    """
+    diagnostics.clear(UNMATCHED)
+    for filename, df in counted_by_filename.items():
+        diagnostics.record(
+            UNMATCHED,
+            router.route(filename)._name,
+            df["description"][df["type"] == Type.NO_TYPE],
+        )
+
+
+def process_file(
+    file_dir: str,
+    filename: str,
+    router: ProcessorRouter,
+    nickname_by_filename: dict[str, str],
+    date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+) -> pd.DataFrame:
+    """
+    Parses, filters and categorizes a single statement file with its matching processor.
+
+    :param date_range: If given, only rows dated within this inclusive range are kept.
+    :return: The categorized DataFrame, projected to COLUMNS.
+    """
+    return categorize_file(
+        *read_file(file_dir, filename, router, nickname_by_filename, date_range)
+    )
+
+
+def read_file(
+    file_dir: str,
+    filename: str,
+    router: ProcessorRouter,
+    nickname_by_filename: dict[str, str],
+    date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+    plan: str = FILTER,
+    manifest: Manifest | None = None,
+    on_read: Callable[[bytes], None] | None = None,
+) -> tuple[Processor, pd.DataFrame]:
+    """
+    Parses a single statement file with its matching processor and labels its rows with
+    the file and account names. Safe to run in a background thread.
+
+    :param date_range: If given, only rows dated within this inclusive range are kept.
+    :param plan: How the file is read, as planned by Manifest.plan. With INDEX, the whole
+        file is read and recorded in manifest before its rows are filtered.
+    :param on_read: Called with the file's bytes as they are parsed, see Processor.parse.
+    :return: The matching processor and the parsed DataFrame.
+    """
+    processor = router.route(filename)
+    if filename not in nickname_by_filename:
+        raise ValueError(f"{filename} does not have a nickname in the config file")
+
+    file_path = f"{file_dir}/{os.fsdecode(filename)}"
+    # Files that are being indexed are read whole, and filtered once they are recorded
+    df = processor.parse(file_path, date_range if plan == FILTER else None, on_read)
+    if plan == INDEX:
+        manifest.record(
+            file_path,
+            df,
+            nickname_by_filename[filename],
+            processor.file_format(file_path),
         )
-    return matching_processors[0]
+        df = df[df["date"].between(*date_range)].reset_index(drop=True)
+    df["filename"] = filename
+    df["account_name"] = nickname_by_filename[filename]
+    return processor, df
+
+
+def categorize_file(processor: Processor, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Filters and categorizes a parsed statement file.
+
+    :return: The categorized DataFrame, projected to COLUMNS.
+    """
+    df = processor.remove_skipped_transactions(df)
+    df = processor.categorize(df)
+    return df[COLUMNS]
+
+
+async def watch_directory(
+    printer: Printer,
+    watcher: DirectoryWatcher,
+    router: ProcessorRouter,
+    nickname_by_filename: dict[str, str],
+    calculator: Calculator,
+    read_by_filename: dict[str, pd.DataFrame],
+    dataframe_by_filename: dict[str, pd.DataFrame],
+    dedup: str,
+    transfers: str = "off",
+    transfer_window: int = 0,
+    date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+) -> None:
+    """
+    Watches the statement folder and folds new, modified and removed files into the
+    running Calculator, then redisplays the stats. Runs until interrupted.
+
+    Only the files that changed are parsed and categorized. Duplicates and, with
+    --transfers remove, transfer pairs are then removed again across every file, since a
+    changed file can also change which rows of other files are duplicates or the other
+    side of a transfer. Only the files whose counted rows changed are subtracted from and
+    added to the Calculator again.
+
+    :param watcher: Primed before read_by_filename was read, so that files added or
+        modified during that read are reported. Files that were read and then reported
+        again are re-ingested, which doesn't change the stats.
+    :param read_by_filename: The categorized DataFrame of each file before duplicates are
+        removed. Kept up to date with the folder.
+    :param dataframe_by_filename: The rows of each file that the Calculator counts. Kept up
+        to date with the folder.
+    """
+    printer.print_message_with_checkmark("Watching folder for new statements")
+    async for changed, removed in watcher.changes():
+        for filename in removed:
+            printer.print_message_with_checkmark(f"\tRemoving {filename}")
+            read_by_filename.pop(filename, None)
+
+        printer.start_progress(len(changed))
+        for filename in changed:
+            try:
+                df = await asyncio.to_thread(
+                    process_file,
+                    watcher.directory(),
+                    filename,
+                    router,
+                    nickname_by_filename,
+                    date_range,
+                )
+            except ValueError as e:
+                logger.error(f"Skipping {filename}: {e}")
+                continue
+            read_by_filename[filename] = df
+            printer.print_file_progress(filename, len(df))
+        printer.finish_progress()
+
+        # Tagged transfers don't change the stats, so they aren't paired again
+        counted_by_filename, _ = combine_files(
+            read_by_filename,
+            dedup,
+            "remove" if transfers == "remove" else "off",
+            transfer_window,
+        )
+        for filename in dataframe_by_filename.keys() | counted_by_filename.keys():
+            previous = dataframe_by_filename.get(filename)
+            counted = counted_by_filename.get(filename)
+            if previous is not None and counted is not None:
+                if previous is counted or previous.equals(counted):
+                    continue
+            if previous is not None:
+                calculator.remove_transactions(previous)
+            if counted is not None:
+                calculator.add_transactions(counted)
+        dataframe_by_filename.clear()
+        dataframe_by_filename.update(counted_by_filename)
+
+        display_stats(printer, calculator)
+        printer.flush()
+
+
+def write_report(
+    writer: RecordWriter,
+    calculator: Calculator,
+    household_size: int,
+    percentile: int,
+    combined_df: pd.DataFrame,
+    optional_tables: dict[str, pd.DataFrame | None],
+) -> None:
+    """
+    Writes the stats as machine-readable tables: a one-record "summary", the per-category
+    totals, their "category_rollups" if any category is hierarchical, the categorized
+    "transactions" and the "unmatched" transactions, plus every optional table that was
+    computed.
+    """
+    writer.write(
+        "summary",
+        pd.DataFrame(
+            [
+                {
+                    "household_size": household_size,
+                    "percentile": percentile,
+                    "income": calculator.income_total(),
+                    "expenses": calculator.expense_total(),
+                    "giving": calculator.giving_total(),
+                    "in_minus_out": calculator.in_minus_out(),
+                    "line": calculator.line(),
+                    "line_minus_expenses": calculator.line_minus_expenses(),
+                }
+            ]
+        ),
+    )
+    writer.write(
+        "categories",
+        pd.concat(
+            [
+                by_category.reset_index().assign(type=type.value)[
+                    ["type", "category", "amount"]
+                ]
+                for type, by_category in (
+                    (Type.INCOME, calculator.income_by_category()),
+                    (Type.EXPENSE, calculator.expense_by_category()),
+                    (Type.GIVING, calculator.giving_by_category()),
+                )
+            ],
+            ignore_index=True,
+        ),
+    )
+    if calculator.has_category_hierarchy():
+        writer.write(
+            "category_rollups",
+            pd.concat(
+                [
+                    rollup.reset_index().assign(type=type.value)[
+                        ["type", "category", "amount"]
+                    ]
+                    for type, rollup in (
+                        (Type.INCOME, calculator.income_rollup()),
+                        (Type.EXPENSE, calculator.expense_rollup()),
+                        (Type.GIVING, calculator.giving_rollup()),
+                    )
+                ],
+                ignore_index=True,
+            ),
+        )
+    writer.write("transactions", combined_df[combined_df["type"] != Type.NO_TYPE])
+    writer.write("unmatched", calculator.no_type_rows())
+    for name, table in optional_tables.items():
+        if table is not None:
+            writer.write(name, table)
 
 
 def display_stats(printer: Printer, calculator: Calculator) -> None:
+    # Amounts summed from the statements are formatted from their exact cents
     printer.print_line()
-    print(
-        f"You have stored { printer.color_string(Fore.YELLOW, f"{calculator._giving_total:.2f}") } as treasure this month"
+    printer.print(
+        f"You have stored { printer.color_string(Fore.YELLOW, format_cents(calculator.total_cents(Type.GIVING))) } as treasure this month"
     )
     printer.print_line()
-    print(f"In: {calculator.income_total():.2f}")
-    print(f"Expenses: {calculator.expense_total():.2f}")
-    print(f"Giving: {calculator.giving_total():.2f}")
-    print(f"In - Out: {printer.format_delta(f"{calculator.in_minus_out():.2f}")}")
+    printer.print(f"In: {format_cents(calculator.total_cents(Type.INCOME))}")
+    printer.print(f"Expenses: {format_cents(calculator.total_cents(Type.EXPENSE))}")
+    printer.print(f"Giving: {format_cents(calculator.total_cents(Type.GIVING))}")
+    printer.print(
+        f"In - Out: {printer.format_delta(format_cents(calculator.in_minus_out_cents()))}"
+    )
     printer.print_line()
-    print(
+    printer.print(
         f"Your line is { printer.color_string(Back.BLUE, f"{calculator.line():.2f}") } "
     )
-    print(
+    printer.print(
         f"Line - Expenses: {printer.format_delta(f"{calculator.line_minus_expenses():.2f}")}"
     )
 
+    for type, title in (
+        (Type.INCOME, "Income by category:"),
+        (Type.EXPENSE, "Expenses by category:"),
+        (Type.GIVING, "Giving by category:"),
+    ):
+        printer.print_line()
+        printer.print(title)
+        printer.print(format_amounts(calculator.rollup_cents(type)))
+
     printer.print_line()
-    print("Income by category:")
-    print(calculator.income_by_category())
+    printer.print(
+        "Transactions that did not match any identifiers. Please update the config or the row to make them match an identifier:"
+    )
+    printer.print(calculator.no_type_rows().to_string(index=False))
+
+    # 'commit' the change here to the file database
+
 
+def display_scenarios(printer: Printer, scenario_lines: pd.DataFrame) -> None:
     printer.print_line()
-    print("Expenses by category:")
-    print(calculator.expense_by_category())
+    printer.print("Line by household size and percentile:")
+    printer.print(scenario_lines.to_string(index=False, float_format="{:.2f}".format))
 
+
+def format_amounts(cents: pd.Series) -> str:
+    """
+    Formats a Series of integer cents as a table of dollar amounts with 2 decimal places.
+    """
+    if cents.empty:
+        return "(none)"
+    return cents.map(format_cents).to_string()
+
+
+def display_recurring(printer: Printer, recurring: pd.DataFrame) -> None:
     printer.print_line()
-    print("Giving by category:")
-    print(calculator.giving_by_category())
+    printer.print(
+        "Recurring transactions, such as subscriptions, rent and payroll, with when the next one is expected:"
+    )
+    printer.print(
+        recurring.drop(columns="merchant").to_string(
+            index=False, float_format="{:.2f}".format
+        )
+    )
+
 
+def display_suggestions(printer: Printer, suggestions: pd.DataFrame) -> None:
     printer.print_line()
-    print(
-        "Transactions that did not match any identifiers. Please update the config or the row to make them match an identifier:"
+    printer.print(
+        "Unmatched transactions grouped by similar description, with the closest existing identifier. "
+        "Add an identifier for each group to the config to categorize it:"
     )
-    print(calculator.no_type_rows().to_string(index=False))
+    printer.print(suggestions.to_string(index=False, float_format="{:.2f}".format))
 
-    # 'commit' the change here to the file database
+
+def display_transfers(printer: Printer, df: pd.DataFrame) -> None:
+    printer.print_line()
+    printer.print(
+        "Transactions paired as transfers between accounts. Rerun with --transfers remove to leave them out of the stats:"
+    )
+    pairs = df[df["transfer_id"].notna()].sort_values(["transfer_id", "amount"])
+    printer.print(
+        pairs[
+            ["transfer_id", "account_name", "date", "description", "amount"]
+        ].to_string(index=False)
+    )
+
+
+def display_budget_variance(printer: Printer, variance: pd.DataFrame) -> None:
+    printer.print_line()
+    printer.print(
+        "Budget vs actual (variance is budget left over for expenses and giving, and extra earned for income):"
+    )
+    printer.print(variance.to_string(index=False, float_format="{:.2f}".format))
+
+
+def display_diagnostics(printer: Printer, diagnostics: Diagnostics) -> None:
+    printer.print_line()
+    printer.print(
+        "Skipped, unmatched and conflicting transactions, with sample descriptions:"
+    )
+    printer.print(diagnostics.counts().to_string(index=False))
 
 
 if __name__ == "__main__":
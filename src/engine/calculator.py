@@ -1,3 +1,5 @@
+from engine import money
+from engine.category_tree import CategoryTree
 from engine.type import Type
 from flp.flp_calculator import FLPCalculator
 import pandas as pd
@@ -6,6 +8,11 @@ import pandas as pd
 class Calculator:
     """
     Performs the calculation on the given dataframe.
+
+    Amounts are aggregated as exact integer cents (the "amount_cents" column, or "amount"
+    rounded to the nearest cent if it is missing) and only converted to dollars when read.
+    Sums are kept per category only; the rollups of hierarchical categories are computed
+    from them when read, see CategoryTree.
     """
 
     def __init__(
@@ -14,63 +21,243 @@ class Calculator:
         household_size: int,
         percentile: int,
         df: pd.DataFrame,
+        category_tree: CategoryTree | None = None,
     ) -> None:
+        """
+        :param category_tree: The hierarchy the rollups use, e.g. from
+            ConfigLoader.load_category_tree. Without one, it is built from the categories
+            that are seen.
+        """
         self._flp_calculator = flp_calculator
+        self._category_tree = (
+            category_tree if category_tree is not None else CategoryTree([])
+        )
 
-        # Income
-        income_rows = df[df["type"] == Type.INCOME]
-        self._income_total = income_rows["amount"].sum()
-        self._income_by_category = income_rows.groupby(by="category")["amount"].sum()
-
-        # Expenses
-        expense_rows = df.loc[df["type"] == Type.EXPENSE].copy()
-        expense_rows["amount"] *= -1
-        self._expense_total = expense_rows["amount"].sum()
-        self._expense_by_category = expense_rows.groupby(by="category")["amount"].sum()
-
-        # Giving
-        giving_rows = df.loc[df["type"] == Type.GIVING].copy()
-        giving_rows["amount"] *= -1
-        self._giving_total = giving_rows["amount"].sum()
-        self._giving_by_category = giving_rows.groupby(by="category")["amount"].sum()
+        # Totals and per-category sums in cents, with expenses and giving made positive
+        self._total_cents = {Type.INCOME: 0, Type.EXPENSE: 0, Type.GIVING: 0}
+        self._cents_by_category = {
+            type: pd.Series(dtype="Int64", index=pd.Index([], name="category"))
+            for type in self._total_cents
+        }
+        # Row counts per category, so incremental updates know when a category empties
+        self._row_count_by_category = {
+            type: pd.Series(dtype="int64") for type in self._total_cents
+        }
 
         # No Type
-        no_type_rows = df[df["type"] == Type.NO_TYPE]
-        self._no_type_rows = no_type_rows[["filename", "date", "description", "amount"]]
+        self._no_type_rows = df.loc[
+            df["type"] == Type.NO_TYPE, ["filename", "date", "description", "amount"]
+        ]
+
+        self._apply_delta(df, 1)
 
         # Line
         self._line = self._compute_monthly_line(household_size, percentile)
 
     def income_total(self) -> float:
-        return self._income_total
+        return self._total_cents[Type.INCOME] / 100
 
     def income_by_category(self) -> pd.Series:
-        return self._income_by_category
+        return self._dollars_by_category(Type.INCOME)
 
     def expense_total(self) -> float:
-        return self._expense_total
+        return self._total_cents[Type.EXPENSE] / 100
 
     def expense_by_category(self) -> pd.Series:
-        return self._expense_by_category
+        return self._dollars_by_category(Type.EXPENSE)
 
     def giving_total(self) -> float:
-        return self._giving_total
+        return self._total_cents[Type.GIVING] / 100
 
     def giving_by_category(self) -> pd.Series:
-        return self._giving_by_category
+        return self._dollars_by_category(Type.GIVING)
+
+    def income_rollup(self) -> pd.Series:
+        return self._dollars_rollup(Type.INCOME)
+
+    def expense_rollup(self) -> pd.Series:
+        return self._dollars_rollup(Type.EXPENSE)
+
+    def giving_rollup(self) -> pd.Series:
+        return self._dollars_rollup(Type.GIVING)
+
+    def total_cents(self, type: Type) -> int:
+        """
+        Returns the exact total of the type in cents, with expenses and giving positive.
+        """
+        return self._total_cents[type]
+
+    def in_minus_out_cents(self) -> int:
+        return (
+            self._total_cents[Type.INCOME]
+            - self._total_cents[Type.EXPENSE]
+            - self._total_cents[Type.GIVING]
+        )
+
+    def rollup_cents(self, type: Type) -> pd.Series:
+        """
+        Returns the exact sums of the type in cents at every level of the category
+        hierarchy, like the *_rollup methods.
+        """
+        cents = self._category_tree.rollup(self._cents_by_category[type])
+        cents.index.name = "category"
+        return cents.rename("amount")
+
+    def has_category_hierarchy(self) -> bool:
+        return self._category_tree.is_hierarchical()
 
     def in_minus_out(self) -> float:
-        return self.income_total() - self.expense_total() - self.giving_total()
+        return self.in_minus_out_cents() / 100
 
     def line(self) -> float:
         return self._line
 
     def line_minus_expenses(self) -> float:
-        return self._line - self._expense_total
+        return self._line - self.expense_total()
+
+    def scenario_lines(
+        self, household_sizes: list[int], percentiles: list[int]
+    ) -> pd.DataFrame:
+        """
+        Evaluates line and line_minus_expenses for many scenarios in one batched FLP
+        computation, reusing the aggregates that were already computed.
+
+        :param household_sizes: The household size of each scenario.
+        :param percentiles: The percentile of each scenario, paired with household_sizes.
+        :return: A DataFrame with "household_size", "percentile", "line" and
+            "line_minus_expenses" columns, one row per scenario.
+        """
+        lines = (
+            self._flp_calculator.compute_annual_lines(household_sizes, percentiles) / 12
+        )
+        return pd.DataFrame(
+            {
+                "household_size": household_sizes,
+                "percentile": percentiles,
+                "line": lines,
+                "line_minus_expenses": lines - self.expense_total(),
+            }
+        )
 
     def no_type_rows(self) -> pd.DataFrame:
         return self._no_type_rows
 
+    def snapshot(self) -> dict:
+        """
+        Returns the aggregates every stat is read from, e.g. to be cached with ReportCache.
+        The FLP calculator isn't included.
+        """
+        # Copied, since later updates replace entries in these dicts
+        return {
+            "total_cents": dict(self._total_cents),
+            "cents_by_category": dict(self._cents_by_category),
+            "row_count_by_category": dict(self._row_count_by_category),
+            "no_type_rows": self._no_type_rows,
+            "line": self._line,
+        }
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        flp_calculator: FLPCalculator,
+        snapshot: dict,
+        category_tree: CategoryTree | None = None,
+    ) -> "Calculator":
+        """
+        Restores a Calculator from a snapshot, without the transactions it was computed
+        from. Every stat, scenario_lines and incremental updates work as on the original.
+        """
+        calculator = cls.__new__(cls)
+        calculator._flp_calculator = flp_calculator
+        calculator._category_tree = (
+            category_tree if category_tree is not None else CategoryTree([])
+        )
+        calculator._total_cents = snapshot["total_cents"]
+        calculator._cents_by_category = snapshot["cents_by_category"]
+        calculator._row_count_by_category = snapshot["row_count_by_category"]
+        calculator._no_type_rows = snapshot["no_type_rows"]
+        calculator._line = snapshot["line"]
+        return calculator
+
+    def add_transactions(self, df: pd.DataFrame) -> None:
+        """
+        Folds newly categorized transactions into the running aggregates without
+        recomputing over the transactions that were already added.
+
+        :param df: A categorized DataFrame with the same columns as the one passed to __init__.
+        """
+        self._apply_delta(df, 1)
+        self._no_type_rows = pd.concat(
+            [
+                self._no_type_rows,
+                df.loc[
+                    df["type"] == Type.NO_TYPE,
+                    ["filename", "date", "description", "amount"],
+                ],
+            ]
+        )
+
+    def remove_transactions(self, df: pd.DataFrame) -> None:
+        """
+        Removes previously added transactions from the running aggregates.
+
+        Unmatched rows are removed by filename, so df should contain every row that was
+        added for each of its files (e.g. when a statement file is re-ingested).
+
+        :param df: A categorized DataFrame that was previously added to this Calculator.
+        """
+        self._apply_delta(df, -1)
+        self._no_type_rows = self._no_type_rows[
+            ~self._no_type_rows["filename"].isin(df["filename"].unique())
+        ]
+
+    def _apply_delta(self, df: pd.DataFrame, sign: int) -> None:
+        """
+        Adds (sign=1) or subtracts (sign=-1) the totals and per-category sums of df
+        from the running aggregates. Categories whose row count drops to zero are dropped.
+        """
+        cents = (
+            df["amount_cents"]
+            if "amount_cents" in df.columns
+            else money.to_cents(df["amount"])
+        )
+        for type, direction in (
+            (Type.INCOME, 1),
+            (Type.EXPENSE, -1),
+            (Type.GIVING, -1),
+        ):
+            is_type = df["type"] == type
+            grouped = (cents[is_type] * direction * sign).groupby(
+                df.loc[is_type, "category"]
+            )
+            delta_by_category = grouped.sum()
+
+            row_counts = self._row_count_by_category[type].add(
+                grouped.size() * sign, fill_value=0
+            )
+            self._row_count_by_category[type] = row_counts[row_counts > 0]
+
+            merged = self._cents_by_category[type].add(delta_by_category, fill_value=0)
+            self._cents_by_category[type] = merged[
+                merged.index.isin(self._row_count_by_category[type].index)
+            ].sort_index()
+            self._total_cents[type] += int(delta_by_category.sum())
+
+    def _dollars_by_category(self, type: Type) -> pd.Series:
+        """
+        Returns the per-category sums of the type in dollars, indexed by category.
+        """
+        dollars = money.to_dollars(self._cents_by_category[type])
+        dollars.index.name = "category"
+        return dollars.rename("amount")
+
+    def _dollars_rollup(self, type: Type) -> pd.Series:
+        """
+        Returns the sums of the type in dollars at every level of the category hierarchy,
+        indexed by category, with parents before their children.
+        """
+        return money.to_dollars(self.rollup_cents(type))
+
     def _compute_monthly_line(self, household_size: int, percentile: int) -> float:
         """
         Computes the monthly line (our budget goal) given the household size
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+# Separates the levels of a category name, e.g. "Food:Groceries"
+SEPARATOR = ":"
+
+
+class CategoryTree:
+    """
+    The hierarchy of category names, where "Food:Groceries" and "Food:Dining" are leaves
+    under "Food".
+
+    Every category is a node, and so is every prefix of its levels. The node ids of each
+    category and its ancestors are computed once, so sums per category can be rolled up
+    into every level with one scatter-add, instead of a groupby per level.
+    """
+
+    def __init__(self, categories: list[str]) -> None:
+        """
+        :param categories: The category names, e.g. from every processor of a config.
+        :raises ValueError: If a category name has an empty level, e.g. "Food:" or "::".
+        """
+        self._node_names = []
+        self._node_id_by_name = {}
+        # The ids of each category's node and of its ancestors' nodes
+        self._node_ids_by_category = {}
+        # The node ids in display order, recomputed when nodes are added
+        self._order = None
+        for category in categories:
+            self._add(category)
+
+    def is_hierarchical(self) -> bool:
+        """
+        Returns whether any category has more than one level.
+        """
+        return any(SEPARATOR in name for name in self._node_names)
+
+    def rollup(self, amount_by_category: pd.Series) -> pd.Series:
+        """
+        Sums amounts per category into every level of the hierarchy.
+
+        Categories that were not given to the constructor are added as they are seen.
+
+        :param amount_by_category: Integer amounts, e.g. cents, indexed by category.
+        :return: The sum of every node with a category under it, including the
+            categories themselves, indexed by node name. Parents come before their
+            children, and siblings are sorted by name.
+        """
+        node_ids_by_category = [
+            (
+                self._node_ids_by_category[category]
+                if category in self._node_ids_by_category
+                else self._add(category)
+            )
+            for category in amount_by_category.index
+        ]
+        node_ids = np.concatenate([np.empty(0, dtype="int64"), *node_ids_by_category])
+        amounts = np.repeat(
+            amount_by_category.to_numpy(dtype="int64"),
+            [len(ids) for ids in node_ids_by_category],
+        )
+
+        totals = np.zeros(len(self._node_names), dtype="int64")
+        np.add.at(totals, node_ids, amounts)
+        present = np.zeros(len(self._node_names), dtype=bool)
+        present[node_ids] = True
+
+        order = self._display_order()
+        order = order[present[order]]
+        return pd.Series(
+            pd.array(totals[order], dtype="Int64"),
+            index=pd.Index(
+                np.array(self._node_names, dtype=object)[order],
+                name=amount_by_category.index.name,
+            ),
+            name=amount_by_category.name,
+        )
+
+    def _add(self, category: str) -> np.ndarray:
+        """
+        Adds the nodes of a category and its ancestors.
+
+        :return: The ids of the category's node and of its ancestors' nodes.
+        """
+        levels = category.split(SEPARATOR)
+        if any(not level.strip() for level in levels):
+            raise ValueError(f"Category {category!r} has an empty level")
+        node_ids = []
+        for depth in range(1, len(levels) + 1):
+            name = SEPARATOR.join(levels[:depth])
+            if name not in self._node_id_by_name:
+                self._node_id_by_name[name] = len(self._node_names)
+                self._node_names.append(name)
+                self._order = None
+            node_ids.append(self._node_id_by_name[name])
+        self._node_ids_by_category[category] = np.array(node_ids, dtype="int64")
+        return self._node_ids_by_category[category]
+
+    def _display_order(self) -> np.ndarray:
+        # Sorted by levels rather than by name, so that e.g. "Food Truck" doesn't sort
+        # between "Food" and "Food:Dining"
+        if self._order is None:
+            self._order = np.array(
+                sorted(
+                    range(len(self._node_names)),
+                    key=lambda node_id: self._node_names[node_id].split(SEPARATOR),
+                ),
+                dtype="int64",
+            )
+        return self._order
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+
+from engine.manifest import file_hash
+from engine.processor import Processor
+from engine.type import Type
+
+# The names of checkpoints and of the temporary files they are written to
+_CHECKPOINT_NAME = re.compile(r"[0-9a-f]{64}\.parquet(\.tmp)?")
+
+
+class CheckpointStore:
+    """
+    Stores the categorized DataFrame of each statement file as soon as it is done, so that
+    a run that fails part way can be resumed without reading the finished files again.
+
+    Checkpoints are keyed by the file's content hash, the fingerprint of the processor
+    that categorized it, its account name and the date range that was read, so a
+    checkpoint is only reused when it would be categorized the same way again. They are
+    written as Parquet, which requires pyarrow.
+
+    Checkpoints that no file of a run looked up or wrote are removed by prune, so stale
+    ones don't pile up as statements and the config change.
+    """
+
+    def __init__(
+        self,
+        checkpoint_dir: str,
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+    ) -> None:
+        """
+        :param date_range: The date range every file of the run is read with, if any.
+        :raises ValueError: If pyarrow isn't installed.
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ValueError("Checkpoints require pyarrow to be installed")
+        self._checkpoint_dir = checkpoint_dir
+        self._date_range = date_range
+        # Content hashes by file path, so each file is hashed once per run
+        self._hash_by_path = {}
+        # The checkpoint paths of every file looked up or written, which prune keeps
+        self._used_paths = set()
+
+    def get(
+        self, file_path: str, processor: Processor, account_name: str
+    ) -> pd.DataFrame | None:
+        """
+        :return: The checkpointed DataFrame of the file, or None if there is none.
+        """
+        path = self._path(file_path, processor, account_name)
+        if not os.path.exists(path):
+            return None
+        df = pd.read_parquet(path)
+        df["type"] = df["type"].map(Type)
+        return df
+
+    def put(
+        self,
+        file_path: str,
+        processor: Processor,
+        account_name: str,
+        df: pd.DataFrame,
+        content_hash: str | None = None,
+    ) -> None:
+        """
+        Checkpoints the categorized DataFrame of a file.
+
+        :param content_hash: The SHA-256 hex digest of the file's contents, if it was
+            computed while the file was read. Otherwise the file is hashed again.
+        """
+        if content_hash is not None:
+            self._hash_by_path[file_path] = content_hash
+        os.makedirs(self._checkpoint_dir, exist_ok=True)
+        path = self._path(file_path, processor, account_name)
+        # Written to a temporary file first, so that a failed run never leaves a partial
+        # checkpoint behind
+        temp_path = f"{path}.tmp"
+        df.assign(type=df["type"].map(lambda type: type.value)).to_parquet(temp_path)
+        os.replace(temp_path, path)
+
+    def prune(self) -> None:
+        """
+        Removes every checkpoint that wasn't looked up or written since this store was
+        created, e.g. of files that changed or were removed, or that were read with another
+        processor config or date range. Call it once every file of the run has been looked
+        up or written.
+        """
+        if not os.path.isdir(self._checkpoint_dir):
+            return
+        with os.scandir(self._checkpoint_dir) as entries:
+            stale = [
+                entry.path
+                for entry in entries
+                if _CHECKPOINT_NAME.fullmatch(entry.name)
+                and entry.path not in self._used_paths
+            ]
+        for path in stale:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _path(self, file_path: str, processor: Processor, account_name: str) -> str:
+        if file_path not in self._hash_by_path:
+            self._hash_by_path[file_path] = file_hash(file_path)
+        key = hashlib.sha256(
+            json.dumps(
+                [
+                    self._hash_by_path[file_path],
+                    processor.fingerprint(),
+                    account_name,
+                    os.path.basename(file_path),
+                    self._date_range,
+                ],
+                default=str,
+            ).encode()
+        ).hexdigest()
+        path = os.path.join(self._checkpoint_dir, f"{key}.parquet")
+        self._used_paths.add(path)
+        return path
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+
+class Conditions:
+    """
+    Conditions on a transaction's amount, date and account that a rule of the config can
+    add to its description identifier, e.g. "venmo" only when the amount is at least 1000.
+
+    Conditions are evaluated over whole columns at once, see mask.
+    """
+
+    def __init__(
+        self,
+        min_amount_cents: int | None = None,
+        max_amount_cents: int | None = None,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+        account_names: list[str] | None = None,
+    ) -> None:
+        """
+        :param min_amount_cents: The smallest amount, ignoring its sign, that matches.
+        :param max_amount_cents: The largest amount, ignoring its sign, that matches.
+        :param start: The first date that matches.
+        :param end: The last moment that matches, e.g. the end of a day or month.
+        :param account_names: The accounts that match.
+        """
+        self._min_amount_cents = min_amount_cents
+        self._max_amount_cents = max_amount_cents
+        self._start = start
+        self._end = end
+        self._account_names = account_names
+
+    def __eq__(self, other):
+        return isinstance(other, Conditions) and self.key() == other.key()
+
+    def key(self) -> list:
+        """
+        Returns every condition as JSON-serializable values, e.g. to fingerprint a
+        Processor.
+        """
+        return [
+            self._min_amount_cents,
+            self._max_amount_cents,
+            None if self._start is None else str(self._start),
+            None if self._end is None else str(self._end),
+            self._account_names,
+        ]
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        :param df: A DataFrame with "amount_cents", "date" and "account_name" columns.
+            Only the columns that a condition is set on are read.
+        :return: Whether each row meets every condition. Rows with a missing value in a
+            column with a condition don't.
+        """
+        mask = np.ones(len(df), dtype=bool)
+        if self._min_amount_cents is not None or self._max_amount_cents is not None:
+            cents = np.abs(
+                df["amount_cents"].to_numpy(dtype="float64", na_value=np.nan)
+            )
+            if self._min_amount_cents is not None:
+                mask &= cents >= self._min_amount_cents
+            if self._max_amount_cents is not None:
+                mask &= cents <= self._max_amount_cents
+        if self._start is not None or self._end is not None:
+            dates = pd.to_datetime(df["date"]).to_numpy()
+            if self._start is not None:
+                mask &= dates >= self._start.to_datetime64()
+            if self._end is not None:
+                mask &= dates <= self._end.to_datetime64()
+        if self._account_names is not None:
+            mask &= df["account_name"].isin(self._account_names).to_numpy()
+        return mask
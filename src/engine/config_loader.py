@@ -1,7 +1,12 @@
+from engine.category_tree import CategoryTree
+from engine.conditions import Conditions
+from engine.diagnostics import Diagnostics
+from engine.normalizer import DescriptionNormalizer
 from engine.parser import Parser
 from engine.processor import Processor
 from engine.type import Type
 import json
+import pandas as pd
 import logging
 from collections import defaultdict, Counter
 
@@ -16,6 +21,15 @@ class ConfigKeys:
     FILE_FORMAT = "file_format"
     SKIP_TRANSACTIONS = "skip_transactions"
     CATEGORIES = "categories"
+    DESCRIPTION_REWRITES = "description_rewrites"
+    PATTERN = "pattern"
+    REPLACEMENT = "replacement"
+    DESCRIPTION = "description"
+    MIN_AMOUNT = "min_amount"
+    MAX_AMOUNT = "max_amount"
+    FROM = "from"
+    TO = "to"
+    ACCOUNT_NAME = "account_name"
 
 
 class ConfigLoader:
@@ -32,17 +46,66 @@ class ConfigLoader:
         """
         return self._config_dict[ConfigKeys.FILE_NICKNAMES]
 
-    def load_processors(self) -> list[Processor]:
+    def load_category_tree(self) -> CategoryTree:
+        """
+        Returns the hierarchy of every category in the config, across processors and
+        types. Levels of a category are separated by ":", e.g. "Food:Groceries".
+
+        :raises ValueError: If a category has an empty level.
+        """
+        return CategoryTree(
+            [
+                category
+                for processor_config in self._config_dict[ConfigKeys.PROCESSORS]
+                for categories in processor_config[ConfigKeys.CATEGORIES].values()
+                for category in categories
+            ]
+        )
+
+    def load_normalizer(self) -> DescriptionNormalizer | None:
+        """
+        Returns a DescriptionNormalizer for the optional description_rewrites list, or None
+        if there are no rewrites. Each rewrite has a "pattern", and an optional
+        "replacement" that defaults to a space.
+
+        :raises ValueError: If a pattern is not a valid regular expression.
+        """
+        rewrites = self._config_dict.get(ConfigKeys.DESCRIPTION_REWRITES, [])
+        if not rewrites:
+            return None
+        return DescriptionNormalizer(
+            [
+                (rewrite[ConfigKeys.PATTERN], rewrite.get(ConfigKeys.REPLACEMENT, " "))
+                for rewrite in rewrites
+            ]
+        )
+
+    def load_processors(
+        self,
+        num_shards: int = 1,
+        diagnostics: Diagnostics | None = None,
+        normalizer: DescriptionNormalizer | None = None,
+    ) -> list[Processor]:
         """
         Loads the config from its JSON file and returns a list of Processor objects.
         All identifiers are converted to lowercase.
 
+        An identifier in skip_transactions or categories can also be a rule with
+        conditions, e.g. {"description": "venmo", "min_amount": 1000, "account_name":
+        "Checking"}, see _extract_conditional_rule.
+
         There are 3 sanity checks performed:
         1. Processor names must be unique.
-        2. For each processor, each identifier is found in only one category
+        2. For each processor, each identifier is found in only one category. Rules with
+           conditions are exempt, since their conditions tell them apart.
         3. Each processor_config must have a valid file format reader
 
-        :param config_filename: The path to the JSON file containing the configuration.
+        :param num_shards: The number of worker processes each Processor splits its
+            identifiers across when categorizing.
+        :param diagnostics: Shared by every Processor to collect skipped, unmatched and
+            conflicting transactions. Without one, nothing is collected.
+        :param normalizer: Shared by every Processor to rewrite descriptions before they
+            are matched, see load_normalizer.
         :return: A list of Processor objects.
         """
         processor_configs = self._config_dict[ConfigKeys.PROCESSORS]
@@ -51,6 +114,8 @@ class ConfigLoader:
         processors = []
         for processor_config in processor_configs:
             processor_name = processor_config[ConfigKeys.NAME]
+            skip_transactions = processor_config[ConfigKeys.SKIP_TRANSACTIONS]
+            categories = processor_config[ConfigKeys.CATEGORIES]
             processors.append(
                 Processor(
                     name=processor_name,
@@ -60,16 +125,103 @@ class ConfigLoader:
                     ),
                     skip_transactions=[
                         identifier.lower()
-                        for identifier in processor_config[ConfigKeys.SKIP_TRANSACTIONS]
+                        for identifier in skip_transactions
+                        if isinstance(identifier, str)
                     ],
                     type_category_by_identifier=self._extract_inverted_categories(
-                        processor_config[ConfigKeys.CATEGORIES], processor_name
+                        {
+                            typestr: {
+                                category: [
+                                    identifier
+                                    for identifier in identifiers
+                                    if isinstance(identifier, str)
+                                ]
+                                for category, identifiers in identifiers_by_category.items()
+                            }
+                            for typestr, identifiers_by_category in categories.items()
+                        },
+                        processor_name,
                     ),
+                    num_shards=num_shards,
+                    diagnostics=diagnostics,
+                    normalizer=normalizer,
+                    conditional_skips=[
+                        self._extract_conditional_rule(rule, processor_name)
+                        for rule in skip_transactions
+                        if isinstance(rule, dict)
+                    ],
+                    conditional_categories=[
+                        (
+                            *self._extract_conditional_rule(rule, processor_name),
+                            (Type(typestr), category),
+                        )
+                        for typestr, identifiers_by_category in categories.items()
+                        for category, identifiers in identifiers_by_category.items()
+                        for rule in identifiers
+                        if isinstance(rule, dict)
+                    ],
                 )
             )
 
         return processors
 
+    def _extract_conditional_rule(
+        self, rule: dict, processor_name: str
+    ) -> tuple[str, Conditions]:
+        """
+        Parses a rule with conditions: an optional "description" identifier, matched like
+        any other, "min_amount" and "max_amount" in dollars, compared to amounts without
+        their sign, "from" and "to" days, months or years like --from and --to, and an
+        "account_name" or a list of them. Every condition that is given must hold.
+
+        :return: The lowercase identifier, and the Conditions.
+        :raises ValueError: If the rule has an unknown key or an invalid value.
+        """
+        known_keys = {
+            ConfigKeys.DESCRIPTION,
+            ConfigKeys.MIN_AMOUNT,
+            ConfigKeys.MAX_AMOUNT,
+            ConfigKeys.FROM,
+            ConfigKeys.TO,
+            ConfigKeys.ACCOUNT_NAME,
+        }
+        unknown_keys = sorted(set(rule) - known_keys)
+        if unknown_keys:
+            raise ValueError(
+                f"Processor: {processor_name} - Unknown keys {unknown_keys} in rule {rule}"
+            )
+        try:
+            account_names = rule.get(ConfigKeys.ACCOUNT_NAME)
+            return rule.get(ConfigKeys.DESCRIPTION, "").lower(), Conditions(
+                min_amount_cents=(
+                    round(float(rule[ConfigKeys.MIN_AMOUNT]) * 100)
+                    if ConfigKeys.MIN_AMOUNT in rule
+                    else None
+                ),
+                max_amount_cents=(
+                    round(float(rule[ConfigKeys.MAX_AMOUNT]) * 100)
+                    if ConfigKeys.MAX_AMOUNT in rule
+                    else None
+                ),
+                start=(
+                    pd.Period(rule[ConfigKeys.FROM]).start_time
+                    if ConfigKeys.FROM in rule
+                    else None
+                ),
+                end=(
+                    pd.Period(rule[ConfigKeys.TO]).end_time
+                    if ConfigKeys.TO in rule
+                    else None
+                ),
+                account_names=(
+                    [account_names] if isinstance(account_names, str) else account_names
+                ),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f"Processor: {processor_name} - Invalid rule {rule}: {e}"
+            ) from e
+
     def _extract_parser(self, file_format: str, processor_name: str) -> type[Processor]:
         """
         Returns the parser for the file format.
@@ -0,0 +1,68 @@
+import pandas as pd
+
+# off: keep every row
+# exact: keep one row per (account, date, amount, description)
+# occurrence: keep as many identical rows as the file with the most of them has, so
+#   legitimate same-day identical charges within a statement survive
+DEDUP_MODES = ["off", "exact", "occurrence"]
+
+
+def transaction_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    Hashes (account_name, date, amount, normalized description) of every row into a uint64 key.
+
+    Descriptions are lowercased with whitespace collapsed, so the same transaction exported
+    with different spacing or casing gets the same key. Normalization runs once per unique
+    description rather than once per row.
+
+    :param df: A DataFrame with "account_name", "date", "amount_cents" and "description" columns.
+    :return: A uint64 Series aligned with df.
+    """
+    codes, uniques = pd.factorize(df["description"])
+    normalized_uniques = (
+        pd.Series(uniques, dtype="string")
+        .str.lower()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+    normalized_description = normalized_uniques.to_numpy()[codes]
+
+    key_columns = pd.DataFrame(
+        {
+            "account_name": df["account_name"].to_numpy(),
+            "date": df["date"].to_numpy(),
+            "amount_cents": df["amount_cents"].to_numpy(),
+            "description": normalized_description,
+        }
+    )
+    keys = pd.util.hash_pandas_object(key_columns, index=False)
+    keys.index = df.index
+    return keys
+
+
+def remove_duplicate_transactions(df: pd.DataFrame, mode: str) -> pd.DataFrame:
+    """
+    Removes transactions that appear in more than one overlapping statement file.
+
+    In "occurrence" mode, each row is keyed by (transaction key, occurrence number within its
+    file). If one file has two identical coffee purchases on the same day and an overlapping
+    file has the same two, two rows are kept, not one or four.
+
+    :param df: The combined, categorized transactions, with a "filename" column.
+    :param mode: One of DEDUP_MODES.
+    :return: df without the duplicate rows. The first occurrence of each row is kept.
+    """
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"Unrecognized dedup mode {mode}")
+    if mode == "off" or df.empty:
+        return df
+
+    keys = transaction_keys(df)
+    if mode == "exact":
+        return df[~keys.duplicated().to_numpy()]
+
+    occurrence = keys.groupby([df["filename"].to_numpy(), keys.to_numpy()]).cumcount()
+    dedup_keys = pd.DataFrame(
+        {"key": keys.to_numpy(), "occurrence": occurrence.to_numpy()}
+    )
+    return df[~dedup_keys.duplicated().to_numpy()]
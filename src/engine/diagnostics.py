@@ -0,0 +1,99 @@
+import pandas as pd
+
+SKIPPED = "skipped"
+UNMATCHED = "unmatched"
+CONFLICTING = "conflicting"
+
+
+class Diagnostics:
+    """
+    Counts skipped, unmatched and conflicting transactions per processor and identifier,
+    keeping a few sample descriptions of each, instead of logging every row.
+
+    Rows are recorded a whole DataFrame at a time with one groupby, and nothing is formatted
+    until counts() is called.
+    """
+
+    def __init__(self, max_samples: int = 3) -> None:
+        """
+        :param max_samples: The number of sample descriptions kept per
+            (kind, processor, identifier).
+        """
+        self._max_samples = max_samples
+        # [rows, samples] by (kind, processor, identifier)
+        self._entries = {}
+
+    def record(
+        self,
+        kind: str,
+        processor_name: str,
+        descriptions: pd.Series,
+        identifiers: pd.Series | None = None,
+    ) -> None:
+        """
+        Records rows of one kind.
+
+        :param kind: SKIPPED, UNMATCHED or CONFLICTING.
+        :param descriptions: The description of each row.
+        :param identifiers: The identifier each row matched, aligned with descriptions, or
+            None for rows that didn't match an identifier.
+        """
+        if descriptions.empty:
+            return
+        if identifiers is None:
+            identifiers = pd.Series("", index=descriptions.index)
+
+        rows = pd.DataFrame(
+            {
+                "identifier": identifiers.to_numpy(),
+                "description": descriptions.to_numpy(),
+            }
+        )
+        counts = rows.groupby("identifier", sort=False).size()
+        samples = (
+            rows.groupby("identifier", sort=False)
+            .head(self._max_samples)
+            .groupby("identifier", sort=False)["description"]
+            .agg(list)
+        )
+        for identifier, count in counts.items():
+            entry = self._entries.setdefault(
+                (kind, processor_name, identifier), [0, []]
+            )
+            entry[0] += int(count)
+            entry[1].extend(samples[identifier][: self._max_samples - len(entry[1])])
+
+    def clear(self, kind: str) -> None:
+        """
+        Forgets every row of one kind, e.g. to record them again from a later stage.
+        """
+        self._entries = {
+            key: entry for key, entry in self._entries.items() if key[0] != kind
+        }
+
+    def counts(self) -> pd.DataFrame:
+        """
+        :return: A DataFrame with "kind", "processor", "identifier", "rows" and "samples"
+            columns, one row per (kind, processor, identifier), most rows first within each
+            kind. Unmatched rows have an empty identifier, and samples are joined with " | ".
+        """
+        counts = pd.DataFrame(
+            [
+                (kind, processor_name, identifier, rows, " | ".join(samples))
+                for (kind, processor_name, identifier), (
+                    rows,
+                    samples,
+                ) in self._entries.items()
+            ],
+            columns=["kind", "processor", "identifier", "rows", "samples"],
+        )
+        kind_order = {SKIPPED: 0, UNMATCHED: 1, CONFLICTING: 2}
+        return counts.sort_values(
+            ["kind", "rows", "processor", "identifier"],
+            ascending=[True, False, True, True],
+            key=lambda column: (
+                column.map(kind_order) if column.name == "kind" else column
+            ),
+            kind="stable",
+            ignore_index=True,
+        )
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+# How a statement file is read for a date range, as planned by Manifest.plan
+# Entirely outside the range: not read at all
+SKIP = "skip"
+# Entirely inside the range: read whole, without filtering
+READ = "read"
+# Partially inside the range: rows are filtered while the file is parsed
+FILTER = "filter"
+# Not indexed yet, or changed since: read whole to index it, then filtered
+INDEX = "index"
+
+
+class Manifest:
+    """
+    An index of statement files, stored as a JSON file. For every file it records the
+    content hash, the number of rows, the first and last date, and the account and parser
+    it was read with, so that files outside a date range can be skipped without being read.
+
+    Entries are keyed by absolute path. An entry is trusted as long as the file's size and
+    modification time are unchanged. Otherwise the file is hashed, and the entry is only
+    kept if the contents are still the same (e.g. the file was copied or touched).
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: The JSON file the manifest is loaded from, if it exists, and saved to.
+        """
+        self._path = path
+        self._entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self._entries = json.load(f)
+
+    def lookup(self, file_path: str) -> dict | None:
+        """
+        :return: The entry of a file, or None if the file isn't indexed or has changed.
+        """
+        key = os.path.abspath(file_path)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stat = os.stat(file_path)
+        if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry
+        if entry["size"] != stat.st_size or entry["hash"] != file_hash(file_path):
+            del self._entries[key]
+            return None
+        entry["mtime_ns"] = stat.st_mtime_ns
+        return entry
+
+    def plan(
+        self, file_path: str, date_range: tuple[pd.Timestamp, pd.Timestamp]
+    ) -> str:
+        """
+        :param date_range: The inclusive range of dates to read.
+        :return: SKIP, READ, FILTER or INDEX.
+        """
+        entry = self.lookup(file_path)
+        if entry is None:
+            return INDEX
+        if entry["rows"] == 0 or entry["min_date"] is None:
+            return SKIP
+        start, end = date_range
+        min_date = pd.Timestamp(entry["min_date"])
+        max_date = pd.Timestamp(entry["max_date"])
+        if max_date < start or min_date > end:
+            return SKIP
+        if start <= min_date and max_date <= end:
+            return READ
+        return FILTER
+
+    def record(
+        self, file_path: str, df: pd.DataFrame, account_name: str, file_format: str
+    ) -> None:
+        """
+        Indexes a file from its whole parsed DataFrame, replacing any previous entry. Safe
+        to call from several threads at once, for different files.
+
+        :param df: Every row of the file, with a "date" column.
+        :param file_format: The FILE_FORMAT of the parser the file was read with.
+        """
+        stat = os.stat(file_path)
+        dates = df["date"].dropna()
+        self._entries[os.path.abspath(file_path)] = {
+            "hash": file_hash(file_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "rows": len(df),
+            "min_date": dates.min().isoformat() if len(dates) else None,
+            "max_date": dates.max().isoformat() if len(dates) else None,
+            "account_name": account_name,
+            "file_format": file_format,
+        }
+
+    def save(self) -> None:
+        """
+        Writes the manifest, replacing the previous file at once so that an interrupted
+        write never leaves a truncated manifest behind.
+        """
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self._path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self._path)
+
+
+def file_hash(file_path: str) -> str:
+    """
+    :return: The SHA-256 hex digest of a file's contents, read in 1 MB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
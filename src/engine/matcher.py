@@ -0,0 +1,315 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Descriptions whose n-grams are encoded per vectorized step. Descriptions are sorted by
+# length first, so each block is only as wide as its longest description.
+_BLOCK_ROWS = 8192
+
+# Fewer identifiers are matched in this process even when shards are asked for, since
+# starting the workers takes longer than building and matching their whole index here
+MIN_SHARD_IDENTIFIERS = 50_000
+
+
+class IdentifierMatcher:
+    """
+    Finds every identifier that is a substring of each description, for many descriptions at
+    once. Matches are the same as checking `identifier in description` for every pair.
+
+    Each identifier is indexed under its rarest byte n-gram, since any description containing
+    the identifier must contain that n-gram. Identifiers shorter than an n-gram are indexed
+    under their whole text, as n-grams of their own length. Matching encodes the n-grams of
+    all descriptions as integers, joins them with the index, and only checks the resulting
+    candidate pairs with `in`.
+    """
+
+    def __init__(self, identifiers: list[str], ngram_size: int = 5) -> None:
+        """
+        :param identifiers: Lowercase identifiers. Matches refer to them by position.
+        :param ngram_size: At most 8, so that n-grams fit in an int64.
+        """
+        self._ngram_size = ngram_size
+        self._identifiers = [identifier.encode() for identifier in identifiers]
+        lengths = np.array([len(identifier) for identifier in self._identifiers])
+        # An empty identifier is a substring of every description
+        self._empty_ids = np.flatnonzero(lengths == 0)
+
+        # Index of identifier ids by n-gram code, for each n-gram size
+        self._index_by_size = {}
+        for size in range(1, ngram_size + 1):
+            identifier_ids = np.flatnonzero(
+                lengths >= size if size == ngram_size else lengths == size
+            )
+            if len(identifier_ids):
+                self._index_by_size[size] = self._build_index(identifier_ids, size)
+
+    def match(self, descriptions: list[str]) -> pd.DataFrame:
+        """
+        :param descriptions: Lowercase descriptions.
+        :return: A DataFrame with "row" (position in descriptions) and "identifier_id"
+            (position in identifiers) columns, one row per match, sorted by both.
+        """
+        return self.match_encoded(
+            [description.encode() for description in descriptions]
+        )
+
+    def match_encoded(self, descriptions: list[bytes]) -> pd.DataFrame:
+        """
+        Like match, for UTF-8 encoded descriptions. Byte and character substrings agree
+        for UTF-8, so matching bytes finds the same identifiers.
+        """
+        candidates = [
+            pd.DataFrame(
+                {
+                    "row": np.repeat(
+                        np.arange(len(descriptions)), len(self._empty_ids)
+                    ),
+                    "identifier_id": np.tile(self._empty_ids, len(descriptions)),
+                }
+            )
+        ]
+        order = np.argsort([len(description) for description in descriptions])
+        for start in range(0, len(order), _BLOCK_ROWS):
+            rows = order[start : start + _BLOCK_ROWS]
+            block = [descriptions[row] for row in rows.tolist()]
+            for size, index in self._index_by_size.items():
+                codes, valid = byte_ngram_codes(block, size)
+                # The index is sorted by n-gram, so a binary search finds indexed n-grams
+                index_ngrams = index["ngram"].to_numpy()
+                positions = np.searchsorted(index_ngrams, codes).clip(
+                    max=len(index_ngrams) - 1
+                )
+                in_index = valid & (index_ngrams[positions] == codes)
+                candidates.append(
+                    pd.DataFrame(
+                        {
+                            "row": np.broadcast_to(rows[:, None], codes.shape)[
+                                in_index
+                            ],
+                            "ngram": codes[in_index],
+                        }
+                    )
+                    .merge(index, on="ngram")
+                    .drop(columns="ngram")
+                )
+
+        candidates = pd.concat(candidates, ignore_index=True).drop_duplicates()
+        found = [
+            self._identifiers[identifier_id] in descriptions[row]
+            for row, identifier_id in zip(
+                candidates["row"].tolist(), candidates["identifier_id"].tolist()
+            )
+        ]
+        return (
+            candidates[np.array(found, dtype=bool)]
+            .astype("int64")
+            .sort_values(["row", "identifier_id"], ignore_index=True)
+        )
+
+    def _build_index(self, identifier_ids: np.ndarray, size: int) -> pd.DataFrame:
+        """
+        Returns a DataFrame with "ngram" and "identifier_id" columns, holding the rarest
+        n-gram of the given size of each identifier.
+        """
+        codes, valid = byte_ngram_codes(
+            [self._identifiers[i] for i in identifier_ids], size
+        )
+        ngrams = pd.DataFrame(
+            {
+                "identifier_id": np.broadcast_to(identifier_ids[:, None], codes.shape)[
+                    valid
+                ],
+                "ngram": codes[valid],
+            }
+        ).drop_duplicates()
+        ngrams["frequency"] = ngrams.groupby("ngram")["ngram"].transform("size")
+        return (
+            ngrams.sort_values(["identifier_id", "frequency"], kind="stable")
+            .drop_duplicates("identifier_id")
+            .sort_values("ngram")[["ngram", "identifier_id"]]
+        )
+
+
+class ShardedIdentifierMatcher:
+    """
+    Matches like IdentifierMatcher, with the identifiers split across worker processes.
+
+    Every shard builds and holds the index of its own identifiers in its own process, so
+    building and matching both run in parallel and this process never holds an index. The
+    descriptions to match are written once into shared memory and read by every shard.
+    Matches from all shards are merged, so the result is the same as IdentifierMatcher's.
+
+    The workers are started with forkserver (spawn where it is unavailable) rather than
+    fork, since forking a process that may be running other threads is unsafe.
+
+    Call close() to stop the workers. They are also stopped when the interpreter exits.
+    """
+
+    def __init__(
+        self, identifiers: list[str], num_shards: int, ngram_size: int = 5
+    ) -> None:
+        # Identifiers are dealt out round-robin, so long and short identifiers spread evenly
+        self._identifier_ids_by_shard = [
+            np.arange(shard, len(identifiers), num_shards)
+            for shard in range(num_shards)
+        ]
+        self._executors = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=_worker_context(),
+                initializer=_init_shard,
+                initargs=([identifiers[i] for i in identifier_ids], ngram_size),
+            )
+            for identifier_ids in self._identifier_ids_by_shard
+        ]
+        # Start the workers and their indexes now, rather than on the first match, so that
+        # building overlaps with reading the files
+        for executor in self._executors:
+            executor.submit(int)
+
+    def match(self, descriptions: list[str]) -> pd.DataFrame:
+        """
+        :param descriptions: Lowercase descriptions.
+        :return: The same DataFrame as IdentifierMatcher.match.
+        """
+        encoded = [description.encode() for description in descriptions]
+        offsets = np.zeros(len(encoded) + 1, dtype="int64")
+        np.cumsum([len(description) for description in encoded], out=offsets[1:])
+
+        # Offsets first, then the concatenated descriptions
+        shared = SharedMemory(create=True, size=max(offsets.nbytes + offsets[-1], 1))
+        try:
+            shared.buf[: offsets.nbytes] = offsets.tobytes()
+            shared.buf[offsets.nbytes : offsets.nbytes + offsets[-1]] = b"".join(
+                encoded
+            )
+            futures = [
+                executor.submit(_match_shard, shared.name, len(encoded))
+                for executor in self._executors
+            ]
+            matches = []
+            for future, identifier_ids in zip(futures, self._identifier_ids_by_shard):
+                rows, shard_identifier_ids = future.result()
+                matches.append(
+                    pd.DataFrame(
+                        {
+                            "row": rows,
+                            "identifier_id": identifier_ids[shard_identifier_ids],
+                        }
+                    )
+                )
+        finally:
+            shared.close()
+            shared.unlink()
+
+        return (
+            pd.concat(matches, ignore_index=True)
+            .astype("int64")
+            .sort_values(["row", "identifier_id"], ignore_index=True)
+        )
+
+    def close(self) -> None:
+        for executor in self._executors:
+            executor.shutdown()
+
+
+def create_matcher(
+    identifiers: list[str],
+    num_shards: int = 1,
+    min_shard_identifiers: int = MIN_SHARD_IDENTIFIERS,
+) -> IdentifierMatcher | ShardedIdentifierMatcher:
+    """
+    Returns a sharded matcher for more than one shard and at least min_shard_identifiers
+    identifiers, and an in-process matcher otherwise.
+    """
+    if num_shards <= 1 or len(identifiers) < min_shard_identifiers:
+        return IdentifierMatcher(identifiers)
+    return ShardedIdentifierMatcher(identifiers, num_shards)
+
+
+def byte_ngram_codes(
+    texts: list[bytes], ngram_size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encodes the byte n-grams of every text as integers.
+
+    :return: A (len(texts), longest length - ngram_size + 1) int64 matrix of n-gram codes,
+        and a boolean matrix of the same shape marking which codes fall inside their text.
+    """
+    lengths = np.array([len(text) for text in texts], dtype="int64")
+    max_length = max(int(lengths.max(initial=0)), ngram_size)
+    chars = (
+        np.array(texts, dtype=f"S{max_length}")
+        .view(np.uint8)
+        .reshape(len(texts), max_length)
+        .astype("int64")
+    )
+    width = max_length - ngram_size + 1
+    codes = np.zeros((len(texts), width), dtype="int64")
+    for offset in range(ngram_size):
+        codes = (codes << 8) | chars[:, offset : offset + width]
+    valid = np.arange(width)[None, :] + ngram_size <= lengths[:, None]
+    return codes, valid
+
+
+# The matcher of the shard held by a worker process
+_shard_matcher = None
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # The slow imports of a worker, done once by the server instead of by every worker.
+        # Only applies until the server is started.
+        context.set_forkserver_preload(["numpy", "pandas"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _attach_shared_memory(name: str) -> SharedMemory:
+    """
+    Attaches to a block created by the process that started this worker. Only the creator
+    unlinks the block.
+
+    Workers started by _worker_context share the creator's resource tracker, so before
+    Python 3.13, where attaching always registers the block, the registration is a
+    duplicate of the creator's and is dropped when the creator unlinks it. Unregistering it
+    here would drop the creator's instead. (Forked workers would start their own tracker,
+    which warns about a leak and unlinks the block when the worker exits.)
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
+
+
+def _init_shard(identifiers: list[str], ngram_size: int) -> None:
+    global _shard_matcher
+    _shard_matcher = IdentifierMatcher(identifiers, ngram_size)
+
+
+def _match_shard(
+    shared_memory_name: str, num_descriptions: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Matches the descriptions in shared memory against the worker's shard.
+
+    :return: The "row" and shard-local "identifier_id" of every match.
+    """
+    shared = _attach_shared_memory(shared_memory_name)
+    try:
+        buffer = shared.buf
+        offsets_size = (num_descriptions + 1) * 8
+        offsets = np.frombuffer(bytes(buffer[:offsets_size]), dtype="int64")
+        descriptions = [
+            bytes(buffer[offsets_size + start : offsets_size + end])
+            for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+        del buffer
+    finally:
+        shared.close()
+    matches = _shard_matcher.match_encoded(descriptions)
+    return matches["row"].to_numpy(), matches["identifier_id"].to_numpy()
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+# Amount strings as they appear in bank exports, after whitespace, "$" and thousands
+# separators are removed. Parentheses mark negative amounts in some exports.
+_AMOUNT_PATTERN = (
+    r"^(?P<open>\()?(?P<sign>[-+]?)"
+    r"(?P<whole>\d*)(?:\.(?P<fraction>\d*))?"
+    r"(?P<close>\))?$"
+)
+
+# Plain amounts of up to this many characters are parsed with integer math, see
+# _parse_plain_cents. 16 digits of dollars still fit in int64 cents.
+_PLAIN_MAX_LENGTH = 16
+
+# The classes of ASCII characters in amounts, see _parse_plain_cents
+_SKIP, _DIGIT, _DOT, _MINUS, _PLUS, _OPEN, _CLOSE, _OTHER = range(8)
+_CHAR_CLASSES = np.full(129, _OTHER, dtype=np.int8)
+_CHAR_CLASSES[[ord(char) for char in " \t$,"]] = _SKIP
+_CHAR_CLASSES[ord("0") : ord("9") + 1] = _DIGIT
+_CHAR_CLASSES[ord(".")] = _DOT
+_CHAR_CLASSES[ord("-")] = _MINUS
+_CHAR_CLASSES[ord("+")] = _PLUS
+_CHAR_CLASSES[ord("(")] = _OPEN
+_CHAR_CLASSES[ord(")")] = _CLOSE
+_POWERS_OF_10 = 10 ** np.arange(3, dtype="int64")
+
+
+def parse_cents(amounts: pd.Series) -> pd.Series:
+    """
+    Parses a Series of amount strings (e.g. "1,234.56", "-0.5", "$12", "(3.00)") into exact
+    integer cents, without going through float. Missing or empty amounts become <NA>.
+    Amounts with more than 2 decimal places are rounded half away from zero.
+
+    :param amounts: A Series of strings, or of numbers already parsed by read_csv.
+    :return: A nullable Int64 Series of cents.
+    :raises ValueError: If any non-empty amount can't be parsed.
+    """
+    if pd.api.types.is_numeric_dtype(amounts):
+        return to_cents(amounts)
+
+    # Statements repeat the same amount strings many times, so each distinct string is
+    # parsed once and the results are expanded back to every row
+    codes, uniques = pd.factorize(amounts)
+    uniques = np.asarray(uniques, dtype=object)
+    cents, is_plain = _parse_plain_cents(uniques)
+    cents = pd.array(cents, dtype="Int64")
+    if not is_plain.all():
+        cents[~is_plain] = _parse_unique_cents(
+            pd.Series(uniques[~is_plain], dtype="string")
+        ).array
+    return pd.Series(cents.take(codes, allow_fill=True), index=amounts.index)
+
+
+def _parse_plain_cents(amounts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Parses the amounts with at most 2 decimal places, optionally signed or in parentheses,
+    with integer math over a matrix of their characters. Spaces, tabs, "$" and thousands
+    separators are skipped, as _parse_unique_cents removes them.
+
+    :param amounts: An object array of amount strings.
+    :return: The cents of each amount, and whether it could be parsed this way. The cents
+        of amounts that couldn't are 0, and are left for _parse_unique_cents.
+    """
+    lengths = np.fromiter(map(len, amounts), dtype="int64", count=len(amounts))
+    short = np.flatnonzero((lengths > 0) & (lengths <= _PLAIN_MAX_LENGTH))
+    cents = np.zeros(len(amounts), dtype="int64")
+    is_plain = np.zeros(len(amounts), dtype=bool)
+    if len(short) == 0:
+        return cents, is_plain
+
+    lengths = lengths[short]
+    width = int(lengths.max())
+    chars = (
+        np.array(amounts[short], dtype=f"U{width}")
+        .view(np.uint32)
+        .reshape(len(short), width)
+    )
+    # Every non-ASCII character is _OTHER, and the padding after each amount is _SKIP
+    classes = _CHAR_CLASSES[np.minimum(chars, len(_CHAR_CLASSES) - 1)]
+    classes[np.arange(width)[None, :] >= lengths[:, None]] = _SKIP
+
+    # A sign or "(" may come first, and ")" last, if it closes a "("
+    rows = np.arange(len(short))
+    significant = classes != _SKIP
+    first = significant.argmax(axis=1)
+    last = width - 1 - significant[:, ::-1].argmax(axis=1)
+    first_class = classes[rows, first]
+    is_signed = (
+        (first_class == _MINUS) | (first_class == _PLUS) | (first_class == _OPEN)
+    )
+    negative = (first_class == _MINUS) | (first_class == _OPEN)
+    is_closed = (classes[rows, last] == _CLOSE) & (last > first)
+    classes[rows[is_signed], first[is_signed]] = _SKIP
+    classes[rows[is_closed], last[is_closed]] = _SKIP
+
+    is_digit = classes == _DIGIT
+    is_dot = classes == _DOT
+    is_fraction = is_digit & (np.cumsum(is_dot, axis=1, dtype=np.int8) > 0)
+    num_fraction_digits = is_fraction.sum(axis=1)
+    valid = (
+        ((classes == _SKIP) | is_digit | is_dot).all(axis=1)
+        & is_digit.any(axis=1)
+        & (is_dot.sum(axis=1) <= 1)
+        & (num_fraction_digits <= 2)
+        & ((first_class == _OPEN) == is_closed)
+    )
+
+    # Horner's method, where only digits shift the value
+    digits = (chars - ord("0")).astype(np.int8) * is_digit
+    value = np.zeros(len(short), dtype="int64")
+    for position in range(width):
+        value = np.where(is_digit[:, position], value * 10 + digits[:, position], value)
+    short_cents = value * _POWERS_OF_10[2 - np.minimum(num_fraction_digits, 2)]
+
+    cents[short] = np.where(valid, np.where(negative, -short_cents, short_cents), 0)
+    is_plain[short] = valid
+    return cents, is_plain
+
+
+def _parse_unique_cents(amounts: pd.Series) -> pd.Series:
+    """
+    Parses a Series of amount strings into Int64 cents, as described in parse_cents.
+    """
+    cleaned = (
+        amounts.astype("string")
+        .str.strip()
+        .str.replace(r"[\s$,]", "", regex=True)
+        .replace("", pd.NA)
+    )
+    parts = cleaned.str.extract(_AMOUNT_PATTERN)
+    invalid = cleaned.notna() & (
+        parts["whole"].isna()
+        | (parts["whole"].fillna("") + parts["fraction"].fillna("") == "")
+        | (parts["open"].isna() != parts["close"].isna())
+    )
+    if invalid.any():
+        raise ValueError(f"Unparseable amounts: {cleaned[invalid].unique().tolist()}")
+
+    fraction = parts["fraction"].fillna("").str.ljust(3, "0")
+    cents = parts["whole"].replace("", "0").astype("Int64") * 100 + fraction.str[
+        :2
+    ].astype("Int64")
+    cents += (fraction.str[2].astype("Int64") >= 5).astype("Int64")
+
+    negative = (parts["sign"] == "-") | parts["open"].notna()
+    return cents.where(~negative, -cents).astype("Int64")
+
+
+def to_cents(amounts: pd.Series) -> pd.Series:
+    """
+    Converts float dollar amounts to integer cents, rounding to the nearest cent.
+
+    :return: A nullable Int64 Series of cents.
+    """
+    return (amounts.astype("float64") * 100).round().astype("Int64")
+
+
+def to_dollars(cents: pd.Series) -> pd.Series:
+    """
+    Converts integer cents to float64 dollars for display. Missing cents become NaN.
+    """
+    return cents.astype("float64") / 100
+
+
+def format_cents(cents: int) -> str:
+    """
+    Formats integer cents as a dollar string with exactly 2 decimal places, e.g. -123456 -> "-1234.56".
+    """
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(int(cents)), 100)
+    return f"{sign}{dollars}.{remainder:02d}"
@@ -0,0 +1,96 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class DescriptionNormalizer:
+    """
+    Rewrites lowercase transaction descriptions before they are checked against
+    skip_transactions and identifiers, e.g. to remove store numbers, card suffixes, dates
+    and reference ids. Descriptions that only differ by those then become the same text,
+    so each is matched once instead of once per variant.
+
+    The rewrites are compiled once and applied in order. Each distinct description is
+    rewritten once and remembered, so skipping and categorizing the same file, or reading repeated
+    descriptions across files, only looks the rewrites up. The descriptions themselves are
+    not changed.
+
+    Rewriting is a Python loop over the new distinct descriptions, calling re.sub for each
+    rewrite. Series.str.replace runs the same loop inside pandas for object strings, and
+    pyarrow strings would match with RE2, whose syntax differs from re.
+    """
+
+    def __init__(self, rewrites: list[tuple[str, str]]) -> None:
+        """
+        :param rewrites: (pattern, replacement) pairs, applied in order. Patterns are
+            regular expressions, matched case insensitively, and replacements may refer to
+            their groups.
+        :raises ValueError: If a pattern is not a valid regular expression.
+        """
+        self._rewrites = rewrites
+        self._passes = self._compile(rewrites)
+        # Every distinct description seen so far, with what it was rewritten to
+        self._rewritten_by_description = {}
+
+    def rewrites(self) -> list[tuple[str, str]]:
+        """
+        Returns the (pattern, replacement) pairs, e.g. to fingerprint a Processor.
+        """
+        return list(self._rewrites)
+
+    def normalize(
+        self, codes: np.ndarray, descriptions: pd.Index
+    ) -> tuple[np.ndarray, pd.Index]:
+        """
+        Rewrites factorized descriptions, and factorizes the results again.
+
+        Whitespace left behind by the rewrites is collapsed and stripped.
+
+        :param codes: The code of each row's description, or -1 if it is missing, as
+            returned by pd.factorize.
+        :param descriptions: The distinct lowercase descriptions.
+        :return: The code of each row's rewritten description (still -1 if it is
+            missing), and the distinct rewritten descriptions.
+        """
+        descriptions = descriptions.tolist()
+        rewritten_by_description = self._rewritten_by_description
+        for description in descriptions:
+            if description not in rewritten_by_description:
+                rewritten_by_description[description] = self._rewrite(description)
+
+        rewritten_codes, uniques = pd.factorize(
+            np.array([rewritten_by_description[d] for d in descriptions], dtype=object)
+        )
+        # The last slot stands for missing descriptions, whose code is -1
+        return np.append(rewritten_codes, -1)[codes], pd.Index(uniques)
+
+    def distinct_counts(self) -> tuple[int, int]:
+        """
+        :return: The number of distinct descriptions normalized so far, and the number of
+            distinct descriptions they were rewritten to.
+        """
+        return (
+            len(self._rewritten_by_description),
+            len(set(self._rewritten_by_description.values())),
+        )
+
+    def _rewrite(self, description: str) -> str:
+        """
+        Applies every rewrite to one description, then collapses and strips whitespace.
+        """
+        for pattern, replacement in self._passes:
+            description = pattern.sub(replacement, description)
+        return " ".join(description.split())
+
+    def _compile(self, rewrites: list[tuple[str, str]]) -> list[tuple[re.Pattern, str]]:
+        """
+        :raises ValueError: If a pattern is not a valid regular expression.
+        """
+        passes = []
+        for pattern, replacement in rewrites:
+            try:
+                passes.append((re.compile(pattern, re.IGNORECASE), replacement))
+            except re.error as e:
+                raise ValueError(f"Invalid description rewrite {pattern!r}: {e}")
+        return passes
@@ -1,8 +1,30 @@
+import csv
+import io
+from typing import Callable
+
 import pandas as pd
 
+from engine import money
+
+# Rows read per chunk when only a date range of a file is kept
+CHUNK_ROWS = 100_000
+# How much of a file is read to check its header
+SNIFF_BYTES = 4096
+
 
 class Parser:
-    def __init__(self, income_is_positive: bool) -> None:
+    # The file_format name used for this parser in the config file
+    FILE_FORMAT = None
+    # Columns that must all be present in the header row of files this parser can read
+    HEADER_SIGNATURE = []
+    # Number of non-blank lines before the header row
+    HEADER_ROW = 0
+    # The normalized columns the rest of the pipeline consumes. Everything else is dropped.
+    NORMALIZED_COLUMNS = ["date", "description", "amount", "amount_cents"]
+    # pandas CSV engines a parser can be configured with
+    ENGINES = ["c", "pyarrow"]
+
+    def __init__(self, income_is_positive: bool, engine: str = "c") -> None:
         """
         Initializes the Parser with a flag indicating whether the raw file
         contains income as positive. If and only if income_is_positive is False,
@@ -10,10 +32,19 @@ class Parser:
 
         :param income_is_positive: A boolean indicating whether income is positive
             in the raw file.
+        :param engine: The pandas CSV engine to read files with, "c" or "pyarrow".
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unrecognized CSV engine {engine}")
         self._income_is_positive = income_is_positive
+        self._engine = engine
 
-    def parse_and_normalize_column_names(self, file_path: str) -> pd.DataFrame:
+    def parse_and_normalize_column_names(
+        self,
+        file_path: str,
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        on_read: Callable[[bytes], None] | None = None,
+    ) -> pd.DataFrame:
         """
         Reads a file, normalizes the column names, and returns a DataFrame.
         If the raw file's income is negative, the amount will be flipped so that
@@ -26,21 +57,34 @@ class Parser:
 
         - "description" (str)
         - "date" (datetime64[ns])
+        - "amount_cents" (Int64)
+            - Exact amount in cents. Positive amounts are income, negative amounts are expenses
         - "amount" (float64)
-            - Positive amounts are income, negative amounts are expenses
+            - amount_cents in dollars, for display
 
         :param file_path: The path to the file to read.
+        :param date_range: If given, only rows dated within this inclusive range are kept.
+            They are filtered while the file is read, before amounts are parsed.
+        :param on_read: Called with all of the file's bytes, in order, as they are read,
+            e.g. the update method of a hashlib hash, so that the file can be hashed
+            without being read again.
         :return: A DataFrame with the normalized columns.
         """
-        df = self._parse(file_path)
-        df = self._rename_columns(df)
+        df = self._parse(file_path, date_range, on_read)
+        df = self._rename_columns(df).rename(columns={"amount": "amount_cents"})
         if not self._income_is_positive:
-            df["amount"] *= -1
-        return df
+            df["amount_cents"] *= -1
+        df["amount"] = money.to_dollars(df["amount_cents"])
+        return df[self.NORMALIZED_COLUMNS]
 
-    def _parse(self, file_path: str) -> pd.DataFrame:
+    def _parse(
+        self,
+        file_path: str,
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        on_read: Callable[[bytes], None] | None = None,
+    ) -> pd.DataFrame:
         """
-        Reads a file and returns a DataFrame.
+        Reads a file and returns a DataFrame, keeping only rows within date_range if given.
 
         Subclasses should implement this method to read the file.
 
@@ -48,10 +92,11 @@ class Parser:
 
         - "Date" (datetime64[ns])
         - "Description" (str)
-        - "Amount" (float64)
-            - Positive amounts are income, negative amounts are expenses
+        - "Amount" (Int64)
+            - Amount in cents, as parsed by _read_csv
 
         :param file_path: The path to the file to read.
+        :param on_read: Passed on to _read_csv.
         :return: A DataFrame with the required columns.
         """
         raise NotImplementedError
@@ -67,27 +112,222 @@ class Parser:
 
         - "description" (str)
         - "date" (datetime64[ns])
-        - "amount" (float64)
-            - Positive amounts are income, negative amounts are expenses
+        - "amount" (Int64)
+            - Amount in cents, in the raw file's sign convention
 
         :param df: The DataFrame to rename the columns of.
         :return: The DataFrame with the normalized column names.
         """
         raise NotImplementedError
 
+    def _read_csv(
+        self,
+        file_path: str,
+        usecols: list[str],
+        amount_columns: list[str],
+        description_column: str = "Description",
+        date_column: str = "Date",
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        on_read: Callable[[bytes], None] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Reads only usecols from a CSV file with the configured engine and explicit dtypes,
+        using the line at HEADER_ROW (not counting blank lines) as the header.
+
+        read_csv starts at the header row found by find_row_offset, so the preamble before
+        the header is never tokenized.
+
+        Amount columns are read as strings and parsed into exact Int64 cents, so amounts
+        never pass through float and thousands separators are handled for every engine.
+        Descriptions and amounts are read as pyarrow-backed strings with the pyarrow engine,
+        which are much smaller than Python str objects.
+
+        With date_range, the c engine reads CHUNK_ROWS rows at a time and keeps the rows
+        within the range from each chunk, so a large file is never held whole, and amounts
+        are only parsed for the rows that are kept. The pyarrow engine doesn't read in
+        chunks, so its rows are filtered after the whole file is read.
+
+        :param usecols: The raw columns to read. Columns the pipeline doesn't consume should
+            be left out so they are never materialized.
+        :param amount_columns: The raw columns holding amounts.
+        :param description_column: The raw name of the description column.
+        :param date_column: The raw name of the date column, which is parsed as dates.
+        :param date_range: If given, only rows dated within this inclusive range are kept.
+        :param on_read: Called with all of the file's bytes, in order, as read_csv reads
+            them. Bytes after the last row read_csv needs are read for it too.
+        :return: The parsed DataFrame.
+        """
+        # Python str with the c engine, since a "string" column validates every value as
+        # it is built
+        text_dtype = "string[pyarrow]" if self._engine == "pyarrow" else str
+        read_csv_kwargs = {
+            "engine": self._engine,
+            "usecols": usecols,
+            "dtype": {
+                **{column: text_dtype for column in amount_columns},
+                description_column: text_dtype,
+            },
+            "parse_dates": [date_column],
+        }
+        if date_range is not None and self._engine != "pyarrow":
+            read_csv_kwargs["chunksize"] = CHUNK_ROWS
+        # The header row is found here rather than with header=HEADER_ROW, which the
+        # pyarrow engine turns into a number of lines to skip that counts lines of whitespace
+        with open(file_path, "rb") as f:
+            head = _read_through_row(f, self.HEADER_ROW)
+            offset = find_row_offset(head, self.HEADER_ROW)
+            if on_read is not None:
+                on_read(head[:offset])
+            f.seek(offset)
+            reader = f if on_read is None else _ObservedReader(f, on_read)
+            df = _read_in_range(
+                pd.read_csv(reader, header=0, **read_csv_kwargs),
+                date_column,
+                date_range,
+            )
+            if on_read is not None:
+                reader.read()
+        for column in amount_columns:
+            df[column] = money.parse_cents(df[column])
+        return df
+
+    def matches_header(self, lines: list[str]) -> bool:
+        """
+        Checks whether the leading lines of a file look like this parser's format.
+
+        :param lines: The first non-blank lines of the file.
+        :return: True if the line at HEADER_ROW contains every column in HEADER_SIGNATURE.
+        """
+        if not self.HEADER_SIGNATURE or len(lines) <= self.HEADER_ROW:
+            return False
+        columns = {
+            column.strip() for column in next(csv.reader([lines[self.HEADER_ROW]]))
+        }
+        return all(column in columns for column in self.HEADER_SIGNATURE)
+
+    def matches_file(self, file_path: str) -> bool:
+        """
+        Checks whether a file looks like this parser's format, reading only its first
+        SNIFF_BYTES. Parsers without a HEADER_SIGNATURE match every file.
+        """
+        if not self.HEADER_SIGNATURE:
+            return True
+        return self.matches_header(read_leading_lines(file_path))
+
+    def file_format(self, file_path: str) -> str:
+        """
+        Returns the FILE_FORMAT the file is read as.
+        """
+        return self.FILE_FORMAT
+
+
+class _ObservedReader(io.RawIOBase):
+    """
+    A binary file reader that passes every chunk it reads to a callback.
+    """
+
+    def __init__(self, raw: io.RawIOBase, on_read: Callable[[bytes], None]) -> None:
+        self._raw = raw
+        self._on_read = on_read
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:
+        size = self._raw.readinto(buffer)
+        if size:
+            self._on_read(memoryview(buffer)[:size])
+        return size
+
+
+def _read_in_range(
+    reader: pd.DataFrame | pd.io.parsers.TextFileReader,
+    date_column: str,
+    date_range: tuple[pd.Timestamp, pd.Timestamp] | None,
+) -> pd.DataFrame:
+    """
+    Keeps the rows of a DataFrame, or of every chunk of a chunked reader, whose date is
+    within date_range.
+    """
+    if date_range is None:
+        return reader
+    if isinstance(reader, pd.DataFrame):
+        return reader[reader[date_column].between(*date_range)].reset_index(drop=True)
+    with reader:
+        chunks = [chunk[chunk[date_column].between(*date_range)] for chunk in reader]
+    # read_csv yields at least one chunk, which keeps the columns if no rows are in range
+    return pd.concat(
+        [chunk for chunk in chunks if len(chunk)] or chunks[:1], ignore_index=True
+    )
+
+
+def read_leading_lines(file_path: str, num_bytes: int = SNIFF_BYTES) -> list[str]:
+    """
+    Returns the non-blank lines within the first num_bytes of a file.
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(num_bytes).decode("utf-8-sig", errors="replace")
+    return [line for line in head.splitlines() if line.strip()]
+
+
+def _read_through_row(f: io.BufferedReader, row: int) -> bytes:
+    """
+    Reads a binary file from the start, SNIFF_BYTES at a time, until it has read the start
+    of a row as found by find_row_offset, or the whole file if it has fewer lines.
+    """
+    head = b""
+    while block := f.read(SNIFF_BYTES):
+        head += block
+        # Only whole lines, since a partial line could look blank
+        lines = head[: head.rfind(b"\n") + 1]
+        if find_row_offset(lines, row) < len(lines):
+            break
+    return head
+
+
+def find_row_offset(buffer: bytes, row: int) -> int:
+    """
+    Finds where a row starts by scanning for line breaks, skipping blank lines the same
+    way read_csv does. Only the lines before the row are inspected.
+
+    :param buffer: The leading contents of the file.
+    :param row: The number of non-blank lines before the row.
+    :return: The byte offset of the row, or len(buffer) if the file has fewer lines.
+    """
+    start = 0
+    non_blank_lines = 0
+    while start < len(buffer):
+        end = buffer.find(b"\n", start)
+        if end == -1:
+            end = len(buffer)
+        if buffer[start:end].strip():
+            if non_blank_lines == row:
+                return start
+            non_blank_lines += 1
+        start = end + 1
+    return len(buffer)
+
 
 class BOADebitParser(Parser):
-    def __init__(self) -> None:
-        super().__init__(True)
+    FILE_FORMAT = "boa_debit"
+    HEADER_SIGNATURE = ["Date", "Description", "Amount", "Running Bal."]
+    HEADER_ROW = 5
+
+    def __init__(self, engine: str = "c") -> None:
+        super().__init__(True, engine)
 
-    def _parse(self, file_path: str) -> pd.DataFrame:
-        df = pd.read_csv(
+    def _parse(
+        self,
+        file_path: str,
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        on_read: Callable[[bytes], None] | None = None,
+    ) -> pd.DataFrame:
+        df = self._read_csv(
             file_path,
-            header=5,
             usecols=["Date", "Description", "Amount"],
-            dtype={"Amount": float},
-            parse_dates=["Date"],
-            thousands=",",
+            amount_columns=["Amount"],
+            date_range=date_range,
+            on_read=on_read,
         )
         return df
 
@@ -97,40 +337,53 @@ class BOADebitParser(Parser):
 
 
 class ChaseCreditParser(Parser):
-    def __init__(self) -> None:
-        super().__init__(True)
+    FILE_FORMAT = "chase_credit"
+    HEADER_SIGNATURE = ["Transaction Date", "Post Date", "Description", "Amount"]
 
-    def _parse(self, file_path: str) -> pd.DataFrame:
-        df = pd.read_csv(
+    def __init__(self, engine: str = "c") -> None:
+        super().__init__(True, engine)
+
+    def _parse(
+        self,
+        file_path: str,
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        on_read: Callable[[bytes], None] | None = None,
+    ) -> pd.DataFrame:
+        df = self._read_csv(
             file_path,
-            usecols=["Transaction Date", "Description", "Category", "Type", "Amount"],
-            dtype={"Amount": float},
-            parse_dates=["Transaction Date"],
+            usecols=["Transaction Date", "Description", "Amount"],
+            amount_columns=["Amount"],
+            date_column="Transaction Date",
+            date_range=date_range,
+            on_read=on_read,
         )
         return df
 
     def _rename_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.rename(
-            columns={
-                "Transaction Date": "date",
-                "Category": "chase_category",
-                "Type": "chase_type",
-            }
-        )
+        df = df.rename(columns={"Transaction Date": "date"})
         df.columns = df.columns.str.lower()
         return df
 
 
 class CitiCreditParser(Parser):
-    def __init__(self) -> None:
-        super().__init__(False)
+    FILE_FORMAT = "citi_credit"
+    HEADER_SIGNATURE = ["Date", "Description", "Debit", "Credit"]
+
+    def __init__(self, engine: str = "c") -> None:
+        super().__init__(False, engine)
 
-    def _parse(self, file_path: str) -> pd.DataFrame:
-        df = pd.read_csv(
+    def _parse(
+        self,
+        file_path: str,
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        on_read: Callable[[bytes], None] | None = None,
+    ) -> pd.DataFrame:
+        df = self._read_csv(
             file_path,
             usecols=["Date", "Description", "Debit", "Credit"],
-            dtype={"Debit": float, "Credit": float},
-            parse_dates=["Date"],
+            amount_columns=["Debit", "Credit"],
+            date_range=date_range,
+            on_read=on_read,
         )
         return df
 
@@ -138,3 +391,25 @@ class CitiCreditParser(Parser):
         df["amount"] = df["Debit"].fillna(df["Credit"])
         df.columns = df.columns.str.lower()
         return df
+
+
+class ChaseDebitParser(Parser):
+    """
+    Placeholder that keeps "chase_debit" a recognized file_format in existing configs.
+    Chase debit exports are not supported yet, so reading one raises an error.
+    """
+
+    FILE_FORMAT = "chase_debit"
+
+    def __init__(self, engine: str = "c") -> None:
+        super().__init__(True, engine)
+
+    def _parse(
+        self,
+        file_path: str,
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        on_read: Callable[[bytes], None] | None = None,
+    ) -> pd.DataFrame:
+        raise ValueError(
+            f"Cannot read {file_path}: the {self.FILE_FORMAT} file format is not supported yet"
+        )
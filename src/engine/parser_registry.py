@@ -0,0 +1,119 @@
+import os
+from typing import Callable
+
+import pandas as pd
+
+from engine.parser import SNIFF_BYTES, Parser, read_leading_lines
+
+
+class ParserRegistry:
+    """
+    Holds one Parser per file format and detects which format a file is in by sniffing
+    its header, without reading the whole file.
+    """
+
+    # The file_format name that makes a processor detect the format of each file
+    AUTO_FORMAT = "auto"
+    # How much of each file is read to detect its format
+    SNIFF_BYTES = SNIFF_BYTES
+
+    def __init__(self, parsers: list[Parser]) -> None:
+        self._parser_by_format = {}
+        # (path, size, mtime_ns) -> detected file format, or None if nothing matched
+        self._format_by_fingerprint = {}
+        for parser in parsers:
+            self.register(parser)
+
+    def register(self, parser: Parser) -> None:
+        """
+        Adds a parser to the registry under its FILE_FORMAT.
+
+        :raises ValueError: If the parser has no FILE_FORMAT or the format is already registered.
+        """
+        if not parser.FILE_FORMAT:
+            raise ValueError(f"{type(parser).__name__} does not declare a FILE_FORMAT")
+        if parser.FILE_FORMAT in self._parser_by_format:
+            raise ValueError(f"File format {parser.FILE_FORMAT} is already registered")
+        self._parser_by_format[parser.FILE_FORMAT] = parser
+
+    def parser_by_format(self) -> dict[str, Parser]:
+        """
+        Returns the parsers keyed by file format, as expected by ConfigLoader. The "auto"
+        format maps to a parser that detects each file's format before parsing it.
+        """
+        return {**self._parser_by_format, self.AUTO_FORMAT: AutoDetectParser(self)}
+
+    def detect(self, file_path: str) -> Parser | None:
+        """
+        Returns the parser whose header signature matches the file, or None if no parser matches.
+        Results are cached per file fingerprint, so unchanged files are only sniffed once.
+
+        :raises ValueError: If the header matches more than one parser.
+        """
+        stat = os.stat(file_path)
+        fingerprint = (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns)
+        if fingerprint not in self._format_by_fingerprint:
+            self._format_by_fingerprint[fingerprint] = self._sniff_format(file_path)
+
+        file_format = self._format_by_fingerprint[fingerprint]
+        return self._parser_by_format[file_format] if file_format else None
+
+    def _sniff_format(self, file_path: str) -> str | None:
+        """
+        Reads the first SNIFF_BYTES of the file and matches its leading non-blank lines
+        against every registered parser's header signature.
+        """
+        lines = read_leading_lines(file_path, self.SNIFF_BYTES)
+        matching_formats = [
+            file_format
+            for file_format, parser in self._parser_by_format.items()
+            if parser.matches_header(lines)
+        ]
+        if len(matching_formats) > 1:
+            raise ValueError(
+                f"Multiple file formats: {matching_formats} match the header of {file_path}"
+            )
+        return matching_formats[0] if matching_formats else None
+
+
+class AutoDetectParser(Parser):
+    """
+    Parser for processors configured with the "auto" file format. Each file is handed to
+    whichever registered parser matches its header.
+    """
+
+    FILE_FORMAT = ParserRegistry.AUTO_FORMAT
+
+    def __init__(self, registry: ParserRegistry) -> None:
+        super().__init__(True)
+        self._registry = registry
+
+    def parse_and_normalize_column_names(
+        self,
+        file_path: str,
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        on_read: Callable[[bytes], None] | None = None,
+    ) -> pd.DataFrame:
+        parser = self._registry.detect(file_path)
+        if parser is None:
+            raise ValueError(f"Could not detect the file format of {file_path}")
+        return parser.parse_and_normalize_column_names(file_path, date_range, on_read)
+
+    def matches_file(self, file_path: str) -> bool:
+        """
+        Checks whether any registered parser matches the file.
+
+        :raises ValueError: If the header matches more than one parser.
+        """
+        return self._registry.detect(file_path) is not None
+
+    def file_format(self, file_path: str) -> str:
+        """
+        Returns the FILE_FORMAT of the parser detected for the file.
+
+        :raises ValueError: If no registered parser matches the file, or more than one does.
+        """
+        parser = self._registry.detect(file_path)
+        if parser is None:
+            raise ValueError(f"Could not detect the file format of {file_path}")
+        return parser.FILE_FORMAT
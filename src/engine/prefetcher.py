@@ -0,0 +1,44 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+def prefetch(
+    function: Callable[[Item], Result], items: Iterable[Item], depth: int
+) -> Iterator[tuple[Item, Result]]:
+    """
+    Yields (item, function(item)) for every item in order, computing the results of up to
+    depth upcoming items in a thread pool while the caller works on the current one.
+
+    This suits I/O such as reading statement files: pandas' CSV reader releases the GIL, so
+    the next files are read while the main thread categorizes the current one. At most depth
+    results are computed ahead and not yet consumed, which caps the memory they hold.
+
+    An exception raised by function is re-raised when the caller reaches its item. Results
+    that were prefetched but not consumed are discarded when the caller stops iterating.
+
+    :param depth: The number of items computed ahead. With 0, each item is computed only
+        when the caller reaches it, without threads.
+    """
+    if depth <= 0:
+        for item in items:
+            yield item, function(item)
+        return
+
+    items = iter(items)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=depth)
+    try:
+        for item in items:
+            pending.append((item, executor.submit(function, item)))
+            if len(pending) > depth:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
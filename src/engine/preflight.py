@@ -0,0 +1,61 @@
+import os
+
+from engine.router import ProcessorRouter
+
+
+def find_problems(
+    file_dir: str,
+    filenames: list[str],
+    router: ProcessorRouter,
+    nickname_by_filename: dict[str, str],
+) -> list[str]:
+    """
+    Checks every statement file before any of them is parsed: each file must have a
+    nickname in the config, match a processor's file prefix, and have the header of that
+    processor's file format. Only the first few KB of each file are read.
+
+    :return: One message per problem, for every file, in filename order.
+    """
+    problems = []
+    for filename in sorted(filenames):
+        if filename not in nickname_by_filename:
+            problems.append(f"{filename}: does not have a nickname in the config file")
+        processor = router.find(filename)
+        if processor is None:
+            problems.append(f"{filename}: no processor prefix matches the file")
+            continue
+
+        file_path = f"{file_dir}/{os.fsdecode(filename)}"
+        if os.path.getsize(file_path) == 0:
+            problems.append(f"{filename}: is empty")
+            continue
+        try:
+            matches = processor._parser.matches_file(file_path)
+        except ValueError as e:
+            problems.append(f"{filename}: {e}")
+            continue
+        if not matches:
+            problems.append(
+                f"{filename}: the header doesn't match the {processor._parser.FILE_FORMAT} "
+                f"format of processor {processor._name}"
+            )
+    return problems
+
+
+def preflight(
+    file_dir: str,
+    filenames: list[str],
+    router: ProcessorRouter,
+    nickname_by_filename: dict[str, str],
+) -> None:
+    """
+    Runs find_problems and reports every problem at once.
+
+    :raises ValueError: If any file has a problem.
+    """
+    problems = find_problems(file_dir, filenames, router, nickname_by_filename)
+    if problems:
+        raise ValueError(
+            f"{len(problems)} problem(s) found before reading statement files:\n"
+            + "\n".join(problems)
+        )
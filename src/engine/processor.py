@@ -1,5 +1,14 @@
+from engine import diagnostics
+from engine.conditions import Conditions
+from engine.diagnostics import Diagnostics
+from engine.matcher import MIN_SHARD_IDENTIFIERS, create_matcher
+from engine.normalizer import DescriptionNormalizer
 from engine.parser import Parser
 from engine.type import Type
+import hashlib
+import json
+from typing import Callable
+import numpy as np
 import pandas as pd
 import logging
 
@@ -16,13 +25,53 @@ class Processor:
         parser: Parser,
         skip_transactions: list[str],
         type_category_by_identifier: dict[str, tuple[Type, str]],
+        num_shards: int = 1,
+        diagnostics: Diagnostics | None = None,
+        normalizer: DescriptionNormalizer | None = None,
+        conditional_skips: list[tuple[str, Conditions]] | None = None,
+        conditional_categories: (
+            list[tuple[str, Conditions, tuple[Type, str]]] | None
+        ) = None,
+        min_shard_identifiers: int = MIN_SHARD_IDENTIFIERS,
     ):
+        """
+        :param num_shards: The number of worker processes that categorize splits the
+            identifiers across. With 1, identifiers are matched in this process.
+        :param diagnostics: Collects skipped, unmatched and conflicting transactions. Several
+            processors can share one. Without one, nothing is collected.
+        :param normalizer: Rewrites descriptions before they are checked against
+            skip_transactions and identifiers. Several processors can share one.
+        :param conditional_skips: (identifier, conditions) pairs. Rows whose description
+            contains the identifier and that meet the conditions are skipped too.
+        :param conditional_categories: (identifier, conditions, (type, category)) rules.
+            Rows whose description contains the identifier and that meet the conditions
+            get its type and category, instead of those of type_category_by_identifier.
+        :param min_shard_identifiers: With fewer identifiers, they are matched in this
+            process regardless of num_shards, see create_matcher.
+        """
         self._name = name
         self._file_prefix = file_prefix
         self._parser = parser
         self._skip_transactions = skip_transactions
         self._type_category_by_identifier = type_category_by_identifier
         self._identifiers = type_category_by_identifier.keys()
+        self._num_shards = num_shards
+        self._min_shard_identifiers = min_shard_identifiers
+        self._diagnostics = diagnostics
+        self._normalizer = normalizer
+        self._conditional_skips = (
+            conditional_skips if conditional_skips is not None else []
+        )
+        self._conditional_categories = (
+            conditional_categories if conditional_categories is not None else []
+        )
+        # Sharded workers are started right away, before the caller starts any threads.
+        # Otherwise the matcher is built on first use, so that loading a config stays cheap.
+        self._matcher = (
+            create_matcher(list(self._identifiers), num_shards, min_shard_identifiers)
+            if num_shards > 1 and len(self._identifiers) >= min_shard_identifiers
+            else None
+        )
 
     def __eq__(self, other):
         return (
@@ -32,56 +81,368 @@ class Processor:
             and self._skip_transactions == other._skip_transactions
             and self._type_category_by_identifier == other._type_category_by_identifier
             and self._identifiers == other._identifiers
+            and self._conditional_skips == other._conditional_skips
+            and self._conditional_categories == other._conditional_categories
         )
 
-    def parse(self, file_path: str) -> pd.DataFrame:
+    def fingerprint(self) -> str:
+        """
+        Returns a hash of everything that decides how this processor parses and
+        categorizes a file: its name, file prefix, file format, skip_transactions,
+        identifiers with their types and categories, conditional rules, and description
+        rewrites.
+        """
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    self._name,
+                    self._file_prefix,
+                    getattr(self._parser, "FILE_FORMAT", None),
+                    self._skip_transactions,
+                    sorted(
+                        (identifier, type.value, category)
+                        for identifier, (
+                            type,
+                            category,
+                        ) in self._type_category_by_identifier.items()
+                    ),
+                    [
+                        (identifier, conditions.key())
+                        for identifier, conditions in self._conditional_skips
+                    ],
+                    [
+                        (identifier, conditions.key(), type.value, category)
+                        for identifier, conditions, (
+                            type,
+                            category,
+                        ) in self._conditional_categories
+                    ],
+                    (
+                        self._normalizer.rewrites()
+                        if self._normalizer is not None
+                        else []
+                    ),
+                ]
+            ).encode()
+        ).hexdigest()
+
+    def parse(
+        self,
+        file_path: str,
+        date_range: tuple[pd.Timestamp, pd.Timestamp] | None = None,
+        on_read: Callable[[bytes], None] | None = None,
+    ) -> pd.DataFrame:
         """
-        Reads a file, normalizes the column names, and returns a DataFrame.
+        Reads a file, normalizes the column names, and returns a DataFrame, keeping only
+        rows within date_range if given. on_read is called with the file's bytes as they
+        are read, see Parser.parse_and_normalize_column_names.
         """
-        df = self._parser.parse_and_normalize_column_names(file_path)
+        df = self._parser.parse_and_normalize_column_names(
+            file_path, date_range, on_read
+        )
         return df
 
+    def file_format(self, file_path: str) -> str:
+        """
+        Returns the file format the file is read as, e.g. the format detected for it when
+        the processor's file format is "auto".
+        """
+        return self._parser.file_format(file_path)
+
     def remove_skipped_transactions(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Removes rows from the DataFrame that have descriptions matching any of the
-        skip_transactions.
+        skip_transactions, or that match any of the conditional_skips.
 
-        This method converts the description to lowercase and checks if it contains any
-        of the strings in skip_transactions using the _word_contains_any_substring method.
+        Each distinct lowercase description, rewritten by the normalizer if there is one,
+        is checked once. Skipped rows are recorded in
+        the diagnostics under the first skip_transactions entry they contain, or else the
+        identifier of the first conditional skip they match.
 
-        :param df: A pandas DataFrame with a "description" column containing transaction details.
+        :param df: A pandas DataFrame with a "description" column containing transaction
+            details, and the columns that conditional_skips have conditions on.
         :return: A DataFrame with rows removed that match any skip_transactions.
         """
-        skip_filter = (
-            df["description"]
-            .str.lower()
-            .apply(
-                lambda desc: Processor._word_contains_any_substring(
-                    desc, self._skip_transactions
+        codes, uniques = self._factorize_descriptions(df)
+        # The position of the first skip_transactions entry in each description, or -1 if
+        # there is none. The last slot stands for missing descriptions, whose code is -1.
+        skip_id_by_unique = np.array(
+            [
+                next(
+                    (
+                        skip_id
+                        for skip_id, skip in enumerate(self._skip_transactions)
+                        if skip in description
+                    ),
+                    -1,
                 )
-            )
+                for description in uniques.to_numpy(dtype=object).tolist()
+            ]
+            + [-1],
+            dtype="int64",
         )
-        logger.debug(f"Skipping transactions: {df[skip_filter]}")
+        skip_ids = skip_id_by_unique[codes]
+        if self._conditional_skips:
+            masks = self._condition_masks(df, codes, uniques, self._conditional_skips)
+            conditional = (skip_ids < 0) & masks.any(axis=1)
+            skip_ids[conditional] = len(self._skip_transactions) + masks[
+                conditional
+            ].argmax(axis=1)
+        skip_filter = skip_ids >= 0
+
+        if self._diagnostics is not None:
+            self._diagnostics.record(
+                diagnostics.SKIPPED,
+                self._name,
+                df["description"][skip_filter],
+                pd.Series(
+                    np.array(
+                        self._skip_transactions
+                        + [identifier for identifier, _ in self._conditional_skips],
+                        dtype=object,
+                    )[skip_ids[skip_filter]]
+                ),
+            )
+        logger.debug("Skipped %d transactions", skip_filter.sum())
         return df[~skip_filter]
 
     def categorize(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Categorizes each row in the DataFrame based on its description.
 
-        This method applies the _categorize_row function to each row in the DataFrame,
-        which assigns a type and category to each transaction based on known identifiers.
-        The resulting DataFrame will have separate columns for the type and category of
-        each transaction.
+        Assigns the same type and category as _categorize_row would for every row, but
+        matches each distinct lowercase description once, against all identifiers at once
+        (see IdentifierMatcher), instead of checking every identifier against every row.
+        Conditional categories are then checked over whole columns, see _condition_masks,
+        and take precedence over the plain identifiers.
 
-        :param df: A pandas DataFrame with a "description" column containing transaction details.
+        :param df: A pandas DataFrame with a "description" column containing transaction
+            details, and the columns that conditional_categories have conditions on.
         :return: A DataFrame with additional columns for "type" and "category".
+        :raises ValueError: If a description contains identifiers from different categories.
         """
-        applied_df = df.apply(
-            lambda row: self._categorize_row(row),
+        if self._matcher is None:
+            self._matcher = create_matcher(
+                list(self._identifiers), self._num_shards, self._min_shard_identifiers
+            )
+        codes, uniques, matches = self._match_descriptions(df, self._matcher)
+        num_uniques = len(uniques)
+
+        # Identifiers of the same (type, category) share an id, so a description with more
+        # than one id among its matches is a conflict
+        type_categories = list(self._type_category_by_identifier.values())
+        id_by_type_category = {}
+        type_category_ids = np.array(
+            [
+                id_by_type_category.setdefault(type_category, len(id_by_type_category))
+                for type_category in type_categories
+            ],
+            dtype="int64",
+        )
+        matches["type_category_id"] = type_category_ids[
+            matches["identifier_id"].to_numpy()
+        ]
+        categories_per_description = matches.groupby("row")[
+            "type_category_id"
+        ].nunique()
+        conflicting = categories_per_description.index[categories_per_description > 1]
+        if len(conflicting):
+            identifiers = list(self._identifiers)
+            matching_identifiers_by_unique = (
+                matches[matches["row"].isin(conflicting)]
+                .groupby("row")["identifier_id"]
+                .agg(lambda ids: ", ".join(identifiers[i] for i in ids))
+            )
+            conflicting_rows = np.isin(codes, conflicting)
+            if self._diagnostics is not None:
+                self._diagnostics.record(
+                    diagnostics.CONFLICTING,
+                    self._name,
+                    df["description"][conflicting_rows],
+                    pd.Series(
+                        matching_identifiers_by_unique.reindex(
+                            codes[conflicting_rows]
+                        ).to_numpy()
+                    ),
+                )
+
+            # Report the first conflicting row of df, like _categorize_row would
+            first = conflicting.min()
+            logger.error(df.iloc[int(np.argmax(codes == first))])
+            matching_identifiers = [
+                identifiers[identifier_id]
+                for identifier_id in matches.loc[
+                    matches["row"] == first, "identifier_id"
+                ]
+            ]
+            raise ValueError(
+                f"Transaction contained identifiers across multiple categories: {matching_identifiers}"
+            )
+
+        # The last slot stands for missing descriptions, whose code is -1
+        type_by_unique = np.full(num_uniques + 1, Type.NO_TYPE, dtype=object)
+        category_by_unique = np.full(
+            num_uniques + 1, Processor.NO_CATEGORY, dtype=object
+        )
+        first_matches = matches.drop_duplicates("row")
+        rows = first_matches["row"].to_numpy()
+        type_by_unique[rows] = [
+            type_categories[identifier_id][0]
+            for identifier_id in first_matches["identifier_id"]
+        ]
+        category_by_unique[rows] = [
+            type_categories[identifier_id][1]
+            for identifier_id in first_matches["identifier_id"]
+        ]
+
+        types = type_by_unique[codes]
+        categories = category_by_unique[codes]
+        if self._conditional_categories:
+            self._apply_conditional_categories(df, codes, uniques, types, categories)
+
+        unmatched = types == Type.NO_TYPE
+        if self._diagnostics is not None:
+            self._diagnostics.record(
+                diagnostics.UNMATCHED, self._name, df["description"][unmatched]
+            )
+
+        return pd.concat(
+            [
+                df,
+                pd.DataFrame(
+                    {
+                        "type": types,
+                        "category": categories,
+                    },
+                    index=df.index,
+                ),
+            ],
             axis="columns",
-            result_type="expand",
         )
-        return pd.concat([df, applied_df], axis="columns")
+
+    def _apply_conditional_categories(
+        self,
+        df: pd.DataFrame,
+        codes: np.ndarray,
+        uniques: pd.Index,
+        types: np.ndarray,
+        categories: np.ndarray,
+    ) -> None:
+        """
+        Overwrites types and categories, in place, for the rows that match any of the
+        conditional_categories.
+
+        :raises ValueError: If a row matches conditional categories of different types or
+            categories.
+        """
+        masks = self._condition_masks(df, codes, uniques, self._conditional_categories)
+        id_by_type_category = {}
+        type_category_ids = np.array(
+            [
+                id_by_type_category.setdefault(type_category, len(id_by_type_category))
+                for _, _, type_category in self._conditional_categories
+            ],
+            dtype="int64",
+        )
+        matched = masks.any(axis=1)
+        lowest_ids = np.where(masks, type_category_ids, len(id_by_type_category)).min(
+            axis=1
+        )
+        highest_ids = np.where(masks, type_category_ids, -1).max(axis=1)
+
+        conflicting = matched & (lowest_ids != highest_ids)
+        if conflicting.any():
+            matching_identifiers = [
+                [self._conditional_categories[i][0] for i in np.flatnonzero(row)]
+                for row in masks[conflicting]
+            ]
+            if self._diagnostics is not None:
+                self._diagnostics.record(
+                    diagnostics.CONFLICTING,
+                    self._name,
+                    df["description"][conflicting],
+                    pd.Series(
+                        [", ".join(identifiers) for identifiers in matching_identifiers]
+                    ),
+                )
+            logger.error(df.iloc[int(np.argmax(conflicting))])
+            raise ValueError(
+                f"Transaction contained identifiers across multiple categories: {matching_identifiers[0]}"
+            )
+
+        type_categories = list(id_by_type_category)
+        types[matched] = np.array([type for type, _ in type_categories], dtype=object)[
+            lowest_ids[matched]
+        ]
+        categories[matched] = np.array(
+            [category for _, category in type_categories], dtype=object
+        )[lowest_ids[matched]]
+
+    def _condition_masks(
+        self, df: pd.DataFrame, codes: np.ndarray, uniques: pd.Index, rules: list
+    ) -> np.ndarray:
+        """
+        Evaluates rules whose first two items are an identifier and its Conditions. Each
+        identifier is checked once against the distinct descriptions, and each rule's
+        conditions once over the columns of df, so no rule is evaluated row by row.
+
+        :param codes: The code of each row's description, as from _factorize_descriptions.
+        :param uniques: The distinct descriptions, as from _factorize_descriptions.
+        :return: A boolean matrix with a row per row of df and a column per rule.
+        """
+        descriptions = pd.Series(uniques, dtype="string")
+        contains_by_identifier = {}
+        masks = np.zeros((len(df), len(rules)), dtype=bool)
+        for rule_id, (identifier, conditions, *_) in enumerate(rules):
+            if identifier not in contains_by_identifier:
+                # The last slot stands for missing descriptions, whose code is -1
+                contains_by_identifier[identifier] = np.append(
+                    descriptions.str.contains(identifier, regex=False).to_numpy(
+                        dtype=bool
+                    ),
+                    identifier == "",
+                )
+            masks[:, rule_id] = contains_by_identifier[identifier][
+                codes
+            ] & conditions.mask(df)
+        return masks
+
+    def _match_descriptions(
+        self, df: pd.DataFrame, matcher
+    ) -> tuple[np.ndarray, pd.Index, pd.DataFrame]:
+        """
+        Matches each distinct lowercase description of df once.
+
+        :return: The code of each row's description (-1 if it is missing), the distinct
+            descriptions, and the matches of the distinct descriptions.
+        """
+        codes, uniques = self._factorize_descriptions(df)
+        return (
+            codes,
+            uniques,
+            matcher.match(uniques.to_numpy(dtype=object).tolist()),
+        )
+
+    def _factorize_descriptions(self, df: pd.DataFrame) -> tuple[np.ndarray, pd.Index]:
+        """
+        Factorizes the lowercase descriptions of df, rewritten by the normalizer if there
+        is one.
+
+        :return: The code of each row's description (-1 if it is missing), and the
+            distinct descriptions.
+        """
+        codes, uniques = pd.factorize(df["description"].astype("string").str.lower())
+        if self._normalizer is not None:
+            codes, uniques = self._normalizer.normalize(codes, uniques)
+        return codes, uniques
+
+    def close(self) -> None:
+        """
+        Stops the worker processes of sharded matching, if any were started.
+        """
+        if self._matcher is not None and hasattr(self._matcher, "close"):
+            self._matcher.close()
+        self._matcher = None
 
     def _categorize_row(self, row: pd.Series) -> str:
         """
@@ -102,7 +463,7 @@ class Processor:
             lowercase_desc, self._identifiers
         )
         if not matching_identifiers:
-            logger.info(f"No category found for {row['description']}")
+            logger.info("No category found for %s", row["description"])
             return {"type": Type.NO_TYPE, "category": Processor.NO_CATEGORY}
 
         if len(matching_identifiers) > 1:
@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+
+from engine import money
+from engine.suggester import normalize_descriptions
+
+# Recognized periods, in days
+PERIOD_DAYS = {
+    "weekly": 7.0,
+    "biweekly": 14.0,
+    "monthly": 365.25 / 12,
+    "quarterly": 365.25 / 4,
+    "yearly": 365.25,
+}
+# How far an interval may be from its period, relative to the period
+PERIOD_TOLERANCE = 0.15
+# A new amount band starts where consecutive amounts of a merchant, in sorted order, grow
+# by more than this factor
+AMOUNT_BAND_FACTOR = 1.2
+
+COLUMNS = [
+    "account_name",
+    "merchant",
+    "description",
+    "period",
+    "occurrences",
+    "amount",
+    "yearly_amount",
+    "first_date",
+    "last_date",
+    "next_date",
+    "regularity",
+]
+
+
+def detect_recurring(
+    df: pd.DataFrame, min_occurrences: int = 3, min_regularity: float = 0.6
+) -> pd.DataFrame:
+    """
+    Finds recurring transactions, such as subscriptions, rent and payroll.
+
+    Transactions are grouped by account, normalized merchant (the description without
+    digits and punctuation, see normalize_descriptions) and amount band. Bands are found by
+    sorting each merchant's amounts and splitting where one is more than
+    AMOUNT_BAND_FACTOR times the previous, so small price changes stay in one band. The
+    days between consecutive transactions of each group are computed for all groups at
+    once on the sorted rows, and a group is recurring if its median interval is within
+    PERIOD_TOLERANCE of a period in PERIOD_DAYS and at least min_regularity of its
+    intervals are.
+
+    :param df: A DataFrame with "account_name", "date", "description" and "amount_cents"
+        columns.
+    :param min_occurrences: The number of transactions a group needs to be recurring.
+    :param min_regularity: The fraction of intervals that must match the period.
+    :return: A DataFrame with COLUMNS, one row per recurring group, the largest yearly
+        amounts first. "amount" is the median amount in dollars, "description" the most
+        recent one, and "next_date" when the next transaction is expected.
+    """
+    # Each distinct description is normalized once. Missing descriptions get code -1.
+    codes, descriptions = pd.factorize(df["description"])
+    merchants = np.append(
+        normalize_descriptions(pd.Series(descriptions, dtype=object)).to_numpy(), ""
+    )
+    rows = pd.DataFrame(
+        {
+            "account_name": df["account_name"].to_numpy(),
+            "merchant": merchants[codes],
+            "date": pd.to_datetime(df["date"]).to_numpy(),
+            "cents": df["amount_cents"].to_numpy(dtype="float64", na_value=np.nan),
+            "description": df["description"].to_numpy(),
+        }
+    )
+    rows = rows[
+        (rows["merchant"] != "")
+        & rows["date"].notna()
+        & rows["cents"].notna()
+        & (rows["cents"] != 0)
+    ].sort_values(["account_name", "merchant", "cents"], kind="stable")
+    if rows.empty:
+        return pd.DataFrame(columns=COLUMNS)
+
+    # Number the (account, merchant, amount band) groups in sorted order, then sort each
+    # group's rows by date
+    merchant = rows.groupby(["account_name", "merchant"], sort=False).ngroup()
+    cents = rows["cents"].to_numpy()
+    new_band = np.r_[
+        True,
+        (merchant.to_numpy()[1:] != merchant.to_numpy()[:-1])
+        | (np.sign(cents[1:]) != np.sign(cents[:-1]))
+        | (np.abs(cents[1:]) > AMOUNT_BAND_FACTOR * np.abs(cents[:-1]))
+        | (np.abs(cents[:-1]) > AMOUNT_BAND_FACTOR * np.abs(cents[1:])),
+    ]
+    rows["group"] = np.cumsum(new_band) - 1
+    rows = rows.sort_values(["group", "date"], kind="stable")
+
+    group = rows["group"].to_numpy()
+    days = rows["date"].to_numpy().astype("datetime64[D]").astype("int64")
+    # The interval before each row, within its group. The first row of a group has none.
+    first_in_group = np.r_[True, group[1:] != group[:-1]]
+    intervals = np.where(first_in_group, np.nan, np.diff(days, prepend=days[0]))
+    rows["interval"] = intervals
+
+    groups = rows.groupby("group").agg(
+        account_name=("account_name", "first"),
+        merchant=("merchant", "first"),
+        description=("description", "last"),
+        occurrences=("date", "size"),
+        cents=("cents", "median"),
+        first_date=("date", "min"),
+        last_date=("date", "max"),
+        median_interval=("interval", "median"),
+    )
+
+    # The period closest to each group's median interval, by ratio. Same-day repeats are
+    # treated as half a day apart, so that the ratio stays finite.
+    period_names = np.array(list(PERIOD_DAYS))
+    period_days = np.array(list(PERIOD_DAYS.values()))
+    median_interval = np.maximum(groups["median_interval"].to_numpy(), 0.5)
+    closest = np.abs(np.log(median_interval[:, None] / period_days[None, :])).argmin(
+        axis=1
+    )
+    groups["period_days"] = period_days[closest]
+    groups["period"] = period_names[closest]
+
+    # The fraction of each group's intervals that are within tolerance of its period
+    row_period_days = groups["period_days"].to_numpy()[group]
+    on_period = (
+        np.abs(intervals - row_period_days) <= PERIOD_TOLERANCE * row_period_days
+    )
+    num_groups = len(groups)
+    groups["regularity"] = np.bincount(
+        group, weights=on_period, minlength=num_groups
+    ) / np.maximum(np.bincount(group, minlength=num_groups) - 1, 1)
+
+    recurring = groups[
+        (groups["occurrences"] >= min_occurrences)
+        & (
+            np.abs(groups["median_interval"] - groups["period_days"])
+            <= PERIOD_TOLERANCE * groups["period_days"]
+        )
+        & (groups["regularity"] >= min_regularity)
+    ]
+    amount = money.to_dollars(recurring["cents"].round().astype("Int64"))
+    recurring = recurring.assign(
+        amount=amount,
+        yearly_amount=(amount * 365.25 / recurring["period_days"]).round(2),
+        next_date=recurring["last_date"]
+        + pd.to_timedelta(recurring["period_days"].round(), unit="D"),
+        regularity=recurring["regularity"].round(2),
+    )
+    return recurring.sort_values(
+        ["yearly_amount", "account_name", "merchant"],
+        key=lambda column: (
+            -column.abs() if column.name == "yearly_amount" else column
+        ),
+        kind="stable",
+    )[COLUMNS].reset_index(drop=True)
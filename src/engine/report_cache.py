@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import pickle
+
+from engine.manifest import file_hash
+
+# Bump when the cached snapshot format changes, so that old entries are never read
+CACHE_VERSION = 1
+
+
+class ReportCache:
+    """
+    Caches Calculator snapshots on disk, one pickle file per fingerprint of the inputs.
+
+    The cache holds at most max_entries snapshots. Reading an entry marks it as recently
+    used by updating its modification time, and the least recently used entries are
+    evicted when a new one is stored.
+    """
+
+    SUFFIX = ".pkl"
+
+    def __init__(self, cache_dir: str, max_entries: int = 16) -> None:
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+
+    def get(self, fingerprint: str) -> dict | None:
+        """
+        :return: The snapshot stored under the fingerprint, or None on a miss or if the
+            entry can't be read.
+        """
+        path = self._path(fingerprint)
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return snapshot
+
+    def put(self, fingerprint: str, snapshot: dict) -> None:
+        """
+        Stores a snapshot, then evicts the least recently used entries beyond max_entries.
+        """
+        os.makedirs(self._cache_dir, exist_ok=True)
+        path = self._path(fingerprint)
+        # Written to a temporary file first, so that readers never see a partial entry
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self._cache_dir, fingerprint + self.SUFFIX)
+
+    def _evict(self) -> None:
+        with os.scandir(self._cache_dir) as entries:
+            cached = sorted(
+                (entry for entry in entries if entry.name.endswith(self.SUFFIX)),
+                key=lambda entry: entry.stat().st_mtime_ns,
+                reverse=True,
+            )
+        for entry in cached[self._max_entries :]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def fingerprint(
+    statement_paths: list[str],
+    config_file: str,
+    dataset_files: list[str],
+    options: dict,
+) -> str:
+    """
+    Fingerprints the inputs of a report: the name and content of every statement file, the
+    config and FLP dataset contents, and every option the stats depend on (e.g. household
+    size, percentile and deduplication).
+
+    :param options: JSON-serializable option values.
+    :return: A hex digest that changes whenever any input does.
+    """
+    inputs = {
+        "version": CACHE_VERSION,
+        "statements": sorted(
+            (os.path.basename(path), file_hash(path)) for path in statement_paths
+        ),
+        "config": file_hash(config_file),
+        "dataset": [file_hash(path) for path in dataset_files],
+        "options": options,
+    }
+    return hashlib.sha256(
+        json.dumps(inputs, sort_keys=True, default=str).encode()
+    ).hexdigest()
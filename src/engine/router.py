@@ -0,0 +1,95 @@
+from engine.processor import Processor
+
+
+class _TrieNode:
+    def __init__(self) -> None:
+        self.children = {}
+        self.processor = None
+
+
+class ProcessorRouter:
+    """
+    Routes filenames to the Processor whose file prefix matches, using a prefix trie
+    built once from every Processor's file prefix.
+
+    Because prefixes are validated to never overlap, at most one prefix can match a
+    filename, and routing walks the trie once in O(len(filename)).
+    """
+
+    def __init__(self, processors: list[Processor]) -> None:
+        """
+        Builds the trie from the processors' file prefixes.
+
+        :raises ValueError: If any file prefix is empty, duplicated, or a prefix of another
+            processor's file prefix, since a file could then match multiple processors.
+        """
+        self._root = _TrieNode()
+        overlaps = []
+        for processor in processors:
+            overlaps.extend(self._insert(processor))
+
+        if overlaps:
+            raise ValueError(
+                "Processor file prefixes must not overlap. Overlapping processors: "
+                + ", ".join(f"{a} and {b}" for a, b in overlaps)
+            )
+
+    def find(self, filename: str) -> Processor | None:
+        """
+        Returns the processor whose prefix matches the filename, or None if there is none.
+        """
+        node = self._root
+        for char in filename:
+            node = node.children.get(char)
+            if node is None:
+                return None
+            if node.processor is not None:
+                return node.processor
+        return None
+
+    def route(self, filename: str) -> Processor:
+        """
+        Returns the processor whose prefix matches the filename.
+        If no processor matches, raise an exception.
+        """
+        processor = self.find(filename)
+        if processor is None:
+            raise ValueError(f"No processor prefix matches file: {filename}")
+        return processor
+
+    def _insert(self, processor: Processor) -> list[tuple[str, str]]:
+        """
+        Inserts the processor's prefix into the trie.
+
+        :return: The (existing processor name, new processor name) pairs whose prefixes overlap.
+        """
+        if not processor._file_prefix:
+            return [(processor._name, "every other processor")]
+
+        overlaps = []
+        node = self._root
+        for char in processor._file_prefix:
+            node = node.children.setdefault(char, _TrieNode())
+            if node.processor is not None:
+                overlaps.append((node.processor._name, processor._name))
+
+        if node.processor is None:
+            overlaps.extend(
+                (descendant._name, processor._name)
+                for descendant in self._descendant_processors(node)
+            )
+            node.processor = processor
+        return overlaps
+
+    def _descendant_processors(self, node: _TrieNode) -> list[Processor]:
+        """
+        Returns every processor stored strictly below the given node.
+        """
+        processors = []
+        stack = list(node.children.values())
+        while stack:
+            child = stack.pop()
+            if child.processor is not None:
+                processors.append(child.processor)
+            stack.extend(child.children.values())
+        return processors
@@ -0,0 +1,314 @@
+import numpy as np
+import pandas as pd
+
+from engine.processor import Processor
+from engine.type import Type
+
+# Modulus of the universal hash functions used for MinHash signatures
+_MERSENNE_PRIME = (1 << 31) - 1
+# Rows of MinHash signatures computed per vectorized step
+_SIGNATURE_BLOCK_ROWS = 256
+
+
+def normalize_descriptions(descriptions: pd.Series) -> pd.Series:
+    """
+    Lowercases descriptions and replaces digits and punctuation with single spaces, so that
+    e.g. "WHOLEFDS MKT #10234" and "Wholefds Mkt #998" normalize to the same text.
+    """
+    return (
+        descriptions.astype("string")
+        .str.lower()
+        .str.replace(r"[^a-z]+", " ", regex=True)
+        .str.strip()
+        .fillna("")
+    )
+
+
+def ngram_codes(
+    texts: pd.Series, ngram_size: int, max_length: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encodes the character n-grams of every text as integers, without a Python loop per n-gram.
+    Texts are padded with a space on each side, so word boundaries count as n-gram characters.
+
+    :param texts: Normalized, ASCII texts.
+    :param max_length: Texts are truncated to this many characters, padding included.
+    :return: A (len(texts), max_length - ngram_size + 1) int64 matrix of n-gram codes, and a
+        boolean matrix of the same shape marking which codes fall inside their text.
+    """
+    padded = (" " + texts.astype("string") + " ").str.slice(0, max_length)
+    encoded = np.array(padded.to_numpy(dtype=object), dtype=f"S{max_length}")
+    chars = encoded.view(np.uint8).reshape(len(texts), max_length).astype("int64")
+    lengths = np.char.str_len(encoded)
+
+    width = max_length - ngram_size + 1
+    codes = np.zeros((len(texts), width), dtype="int64")
+    for offset in range(ngram_size):
+        codes = (codes << 8) | chars[:, offset : offset + width]
+    valid = np.arange(width)[None, :] + ngram_size <= lengths[:, None]
+    return codes, valid
+
+
+class SuggestionEngine:
+    """
+    Suggests how to categorize the transactions that did not match any identifier.
+
+    Similar descriptions are clustered with MinHash signatures over character n-grams and
+    locality-sensitive hashing: signatures are split into bands, and a description joins the
+    cluster of the first description it shares a band bucket with if their signatures agree
+    closely enough. Each description is only compared with one description per band, never
+    with every other description.
+
+    Each cluster is then ranked against the existing identifiers of every processor with an
+    inverted index from n-gram to identifier, scoring an identifier by the fraction of its
+    n-grams that appear in the cluster's description.
+    """
+
+    def __init__(
+        self,
+        processors: list[Processor],
+        ngram_size: int = 3,
+        num_hashes: int = 64,
+        num_bands: int = 16,
+        similarity_threshold: float = 0.5,
+        min_score: float = 0.4,
+        max_suggestions: int = 1,
+        max_length: int = 64,
+        seed: int = 0,
+    ) -> None:
+        """
+        :param num_hashes: The length of each MinHash signature. Must be divisible by num_bands.
+        :param num_bands: More bands find less similar descriptions, at the cost of more
+            candidate links to check.
+        :param similarity_threshold: The minimum estimated n-gram Jaccard similarity for two
+            descriptions to be clustered together.
+        :param min_score: The minimum fraction of an identifier's n-grams that must appear in a
+            cluster's description for the identifier to be suggested.
+        :param max_suggestions: The number of identifiers suggested per cluster.
+        """
+        if num_hashes % num_bands:
+            raise ValueError(
+                f"num_hashes ({num_hashes}) must be divisible by num_bands ({num_bands})"
+            )
+        self._ngram_size = ngram_size
+        self._num_bands = num_bands
+        self._similarity_threshold = similarity_threshold
+        self._min_score = min_score
+        self._max_suggestions = max_suggestions
+        self._max_length = max_length
+
+        rng = np.random.default_rng(seed)
+        self._hash_a = rng.integers(1, _MERSENNE_PRIME, num_hashes, dtype="int64")
+        self._hash_b = rng.integers(0, _MERSENNE_PRIME, num_hashes, dtype="int64")
+
+        identifiers = pd.DataFrame(
+            [
+                (processor._name, identifier, Type(type).value, category)
+                for processor in processors
+                for identifier, (
+                    type,
+                    category,
+                ) in processor._type_category_by_identifier.items()
+            ],
+            columns=["processor", "identifier", "type", "category"],
+        )
+        self._identifiers = identifiers
+        self._identifier_ngrams = self._unique_ngrams(
+            normalize_descriptions(identifiers["identifier"])
+        ).rename(columns={"row": "identifier_id"})
+        self._identifier_ngram_counts = self._identifier_ngrams.groupby(
+            "identifier_id"
+        ).size()
+
+    def cluster(self, descriptions: pd.Series) -> pd.Series:
+        """
+        Clusters similar descriptions.
+
+        :return: An int64 Series aligned with descriptions. Descriptions with the same value are
+            in the same cluster.
+        """
+        # Missing descriptions are kept as a unique of their own, which normalizes to ""
+        codes, uniques = pd.factorize(descriptions, use_na_sentinel=False)
+        labels = self._cluster_unique(normalize_descriptions(pd.Series(uniques)))
+        return pd.Series(labels[codes], index=descriptions.index, dtype="int64")
+
+    def suggest(self, no_type_rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Clusters unmatched transactions and suggests existing identifiers for each cluster.
+
+        :param no_type_rows: A DataFrame with "description" and "amount" columns, e.g. the
+            Calculator's no_type_rows().
+        :return: A DataFrame with "description" (the cluster's most common description), "rows",
+            "amount", "identifier", "processor", "type", "category" and "score" columns, with
+            max_suggestions rows per cluster ordered by score. Clusters without a suggestion
+            have <NA> identifiers. Largest clusters come first.
+        """
+        columns = [
+            "description",
+            "rows",
+            "amount",
+            "identifier",
+            "processor",
+            "type",
+            "category",
+            "score",
+        ]
+        if no_type_rows.empty:
+            return pd.DataFrame(columns=columns)
+
+        # Missing descriptions are kept as a unique of their own, see cluster
+        codes, uniques = pd.factorize(
+            no_type_rows["description"], use_na_sentinel=False
+        )
+        normalized = normalize_descriptions(pd.Series(uniques))
+        labels = self._cluster_unique(normalized)
+
+        rows = pd.DataFrame(
+            {
+                "cluster": labels[codes],
+                "unique": codes,
+                "amount": no_type_rows["amount"].to_numpy(),
+            }
+        )
+        # The most common description of each cluster represents it
+        representatives = (
+            rows.groupby(["cluster", "unique"]).size().rename("count").reset_index()
+        )
+        representatives = representatives.sort_values(
+            ["cluster", "count"], ascending=[True, False], kind="stable"
+        ).drop_duplicates("cluster")
+        clusters = rows.groupby("cluster").agg(
+            rows=("unique", "size"), amount=("amount", "sum")
+        )
+        clusters["unique"] = representatives.set_index("cluster")["unique"]
+        clusters["description"] = uniques[clusters["unique"].to_numpy()]
+
+        suggestions = self._rank_identifiers(
+            normalized.iloc[clusters["unique"].to_numpy()].set_axis(clusters.index)
+        )
+        return (
+            clusters.reset_index()
+            .merge(suggestions, on="cluster", how="left")
+            .sort_values(
+                ["rows", "cluster", "score"],
+                ascending=[False, True, False],
+                kind="stable",
+                ignore_index=True,
+            )[columns]
+        )
+
+    def _cluster_unique(self, normalized: pd.Series) -> np.ndarray:
+        """
+        Clusters normalized descriptions. Descriptions that normalize to the same text (e.g.
+        only differing in store numbers) are hashed once.
+
+        :return: The cluster label of each description.
+        """
+        text_ids, texts = pd.factorize(normalized)
+        codes, valid = ngram_codes(pd.Series(texts), self._ngram_size, self._max_length)
+        labels = np.arange(len(texts))
+        has_ngrams = valid.any(axis=1)
+        if not has_ngrams.any():
+            return labels[text_ids]
+
+        signatures = self._signatures(codes[has_ngrams], valid[has_ngrams])
+        positions = labels[has_ngrams]
+
+        # Each description joins the cluster of the first description it shares a band
+        # bucket with, if their signatures estimate a high enough similarity. Only linking to
+        # that first description, rather than merging linked clusters transitively, keeps
+        # chains of slightly similar descriptions from collapsing into one cluster.
+        rows_per_band = signatures.shape[1] // self._num_bands
+        first_index = np.arange(len(positions))
+        leaders = first_index.copy()
+        for band in range(self._num_bands):
+            band_signatures = signatures[
+                :, band * rows_per_band : (band + 1) * rows_per_band
+            ]
+            bucket = pd.util.hash_pandas_object(
+                pd.DataFrame(band_signatures), index=False
+            ).to_numpy()
+            first = pd.Series(first_index).groupby(bucket).transform("min").to_numpy()
+            candidates = first < leaders
+            similarity = (signatures[candidates] == signatures[first[candidates]]).mean(
+                axis=1
+            )
+            linked = np.flatnonzero(candidates)[
+                similarity >= self._similarity_threshold
+            ]
+            leaders[linked] = first[linked]
+
+        labels[has_ngrams] = positions[leaders]
+        return labels[text_ids]
+
+    def _signatures(self, codes: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """
+        Computes the MinHash signature of every row of n-gram codes.
+
+        Each distinct n-gram is hashed once, with an extra all-maximum row for the padding
+        positions, and signatures are gathered from that table a block of rows at a time so
+        the gathered hashes stay in cache.
+        """
+        distinct_codes, ngram_ids = np.unique(codes[valid], return_inverse=True)
+        ids = np.full(codes.shape, len(distinct_codes))
+        ids[valid] = ngram_ids
+        hash_table = np.full(
+            (len(distinct_codes) + 1, len(self._hash_a)), _MERSENNE_PRIME
+        )
+        hash_table[:-1] = (
+            distinct_codes[:, None] * self._hash_a[None, :] + self._hash_b[None, :]
+        ) % _MERSENNE_PRIME
+
+        signatures = np.empty((len(codes), len(self._hash_a)), dtype="int64")
+        for start in range(0, len(codes), _SIGNATURE_BLOCK_ROWS):
+            block = slice(start, start + _SIGNATURE_BLOCK_ROWS)
+            signatures[block] = hash_table[ids[block]].min(axis=1)
+        return signatures
+
+    def _rank_identifiers(self, descriptions: pd.Series) -> pd.DataFrame:
+        """
+        Scores existing identifiers against each cluster's normalized description through the
+        inverted n-gram index, so only identifiers sharing an n-gram with a description are
+        considered.
+
+        :param descriptions: Normalized descriptions indexed by cluster.
+        :return: A DataFrame with "cluster", "identifier", "processor", "type", "category"
+            and "score" columns, with at most max_suggestions rows per cluster.
+        """
+        description_ngrams = self._unique_ngrams(descriptions.reset_index(drop=True))
+        description_ngrams["cluster"] = descriptions.index.to_numpy()[
+            description_ngrams["row"].to_numpy()
+        ]
+        overlaps = (
+            description_ngrams.merge(self._identifier_ngrams, on="ngram")
+            .groupby(["cluster", "identifier_id"])
+            .size()
+            .rename("overlap")
+            .reset_index()
+        )
+        overlaps["score"] = overlaps["overlap"] / self._identifier_ngram_counts.reindex(
+            overlaps["identifier_id"]
+        ).to_numpy(dtype="float64")
+        ranked = (
+            overlaps[overlaps["score"] >= self._min_score]
+            .sort_values(
+                ["cluster", "score", "overlap", "identifier_id"],
+                ascending=[True, False, False, True],
+            )
+            .groupby("cluster")
+            .head(self._max_suggestions)
+        )
+        return ranked[["cluster", "identifier_id", "score"]].merge(
+            self._identifiers, left_on="identifier_id", right_index=True
+        )
+
+    def _unique_ngrams(self, texts: pd.Series) -> pd.DataFrame:
+        """
+        Returns the distinct n-gram codes of every text as a long DataFrame with "row"
+        (the text's position) and "ngram" columns.
+        """
+        codes, valid = ngram_codes(texts, self._ngram_size, self._max_length)
+        rows = np.broadcast_to(np.arange(len(texts))[:, None], codes.shape)
+        return pd.DataFrame(
+            {"row": rows[valid], "ngram": codes[valid]}
+        ).drop_duplicates(ignore_index=True)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# off: leave transfers alone
+# tag: add a "transfer_id" column pairing both sides of each transfer, for review
+# remove: drop both sides of each transfer so they aren't counted as income or expenses
+TRANSFER_MODES = ["off", "tag", "remove"]
+
+
+def match_transfers(df: pd.DataFrame, window_days: int) -> pd.Series:
+    """
+    Pairs opposite-signed transactions of equal amount in different accounts whose dates are
+    at most window_days apart, e.g. a credit card payment leaving a checking account and
+    arriving on the card.
+
+    Candidates are found with a hash join on (absolute amount, date bucket), where buckets are
+    window_days + 1 days wide and inflows are joined against their own and both neighbouring
+    buckets. Each transaction is paired at most once, closest dates first.
+
+    :param df: A DataFrame with "account_name", "date" and "amount_cents" columns.
+    :param window_days: The maximum number of days between the two sides of a transfer.
+    :return: An Int64 Series aligned with df, holding the same transfer id for both sides of
+        each pair and <NA> for unpaired rows.
+    """
+    days = pd.to_datetime(df["date"]).to_numpy().astype("datetime64[D]").astype("int64")
+    cents = df["amount_cents"].astype("Int64")
+    rows = pd.DataFrame(
+        {
+            "position": np.arange(len(df)),
+            "account_name": df["account_name"].to_numpy(),
+            "day": days,
+            "abs_cents": cents.abs().to_numpy(dtype="int64", na_value=0),
+            "bucket": days // (window_days + 1),
+        }
+    )
+    outflows = rows[(cents < 0).fillna(False).to_numpy()]
+    inflows = rows[(cents > 0).fillna(False).to_numpy()]
+
+    # Replicate each inflow into the neighbouring buckets so that a single equi-join finds
+    # every outflow within window_days of it
+    inflows = pd.concat(
+        [inflows.assign(bucket=inflows["bucket"] + offset) for offset in (-1, 0, 1)]
+    )
+    candidates = outflows.merge(
+        inflows, on=["abs_cents", "bucket"], suffixes=("_out", "_in")
+    )
+    candidates["day_diff"] = (candidates["day_out"] - candidates["day_in"]).abs()
+    candidates = candidates[
+        (candidates["account_name_out"] != candidates["account_name_in"])
+        & (candidates["day_diff"] <= window_days)
+    ].sort_values(["day_diff", "position_out", "position_in"], kind="stable")
+
+    transfer_ids = np.full(len(df), -1, dtype="int64")
+    next_id = 0
+    while not candidates.empty:
+        # The closest remaining candidate of every outflow, deduped by inflow, is a set of
+        # disjoint pairs. The first candidate always survives, so every round makes progress.
+        pairs = candidates.drop_duplicates("position_out").drop_duplicates(
+            "position_in"
+        )
+        ids = np.arange(next_id, next_id + len(pairs))
+        transfer_ids[pairs["position_out"].to_numpy()] = ids
+        transfer_ids[pairs["position_in"].to_numpy()] = ids
+        next_id += len(pairs)
+        candidates = candidates[
+            ~candidates["position_out"].isin(pairs["position_out"])
+            & ~candidates["position_in"].isin(pairs["position_in"])
+        ]
+
+    return pd.Series(
+        pd.array(transfer_ids, dtype="Int64"), index=df.index, name="transfer_id"
+    ).where(transfer_ids >= 0)
+
+
+def apply_transfers(df: pd.DataFrame, mode: str, window_days: int) -> pd.DataFrame:
+    """
+    Tags or removes matched transfer pairs according to mode.
+
+    :param mode: One of TRANSFER_MODES.
+    :return: df with a "transfer_id" column in "tag" mode, or without the paired rows in
+        "remove" mode.
+    """
+    if mode not in TRANSFER_MODES:
+        raise ValueError(f"Unrecognized transfer mode {mode}")
+    if mode == "off" or df.empty:
+        return df
+
+    transfer_ids = match_transfers(df, window_days)
+    if mode == "tag":
+        return df.assign(transfer_id=transfer_ids.array)
+    return df[transfer_ids.isna().to_numpy()]
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator
+
+
+class DirectoryWatcher:
+    """
+    Polls a directory for new, modified and removed statement files.
+
+    A file is only reported once its (mtime, size) signature has stayed the same for
+    the debounce period, so files that are still being written or downloaded are not
+    picked up half-finished.
+    """
+
+    def __init__(
+        self, directory: str, poll_interval: float = 1.0, debounce: float = 2.0
+    ) -> None:
+        self._directory = directory
+        self._poll_interval = poll_interval
+        self._debounce = debounce
+        # filename -> signature that was last reported
+        self._seen = {}
+        # filename -> (signature, monotonic time it was first observed)
+        self._pending = {}
+
+    def directory(self) -> str:
+        return self._directory
+
+    def prime(self) -> None:
+        """
+        Marks every file currently in the directory as seen, so that only files that
+        are added or modified afterwards are reported.
+        """
+        self._seen = self._snapshot()
+        self._pending = {}
+
+    def poll(self, now: float) -> tuple[list[str], list[str]]:
+        """
+        Compares the directory against the last reported state.
+
+        :param now: The current monotonic time in seconds.
+        :return: A tuple of (changed filenames, removed filenames). Changed files are new or
+            modified files whose signature has been stable for at least the debounce period.
+        """
+        snapshot = self._snapshot()
+
+        changed = []
+        for filename, signature in snapshot.items():
+            if self._seen.get(filename) == signature:
+                self._pending.pop(filename, None)
+                continue
+
+            pending_signature, first_seen = self._pending.get(filename, (None, now))
+            if pending_signature != signature:
+                self._pending[filename] = (signature, now)
+            elif now - first_seen >= self._debounce:
+                del self._pending[filename]
+                self._seen[filename] = signature
+                changed.append(filename)
+
+        removed = [filename for filename in self._seen if filename not in snapshot]
+        for filename in removed:
+            del self._seen[filename]
+        for filename in [f for f in self._pending if f not in snapshot]:
+            del self._pending[filename]
+
+        return sorted(changed), sorted(removed)
+
+    async def changes(self) -> AsyncIterator[tuple[list[str], list[str]]]:
+        """
+        Yields (changed, removed) filenames every time the directory settles into a new state.
+        """
+        while True:
+            changed, removed = self.poll(time.monotonic())
+            if changed or removed:
+                yield changed, removed
+            await asyncio.sleep(self._poll_interval)
+
+    def _snapshot(self) -> dict[str, tuple[int, int]]:
+        """
+        Returns the (mtime_ns, size) signature of every regular file in the directory.
+        Files removed while the directory is scanned are left out.
+        """
+        snapshot = {}
+        with os.scandir(self._directory) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
@@ -50,6 +50,8 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import numpy as np
+import pandas as pd
 from flp.filing_status import FilingStatus
 from flp.flp_dataset import Dataset
 
@@ -81,6 +83,86 @@ class FLPCalculator:
         state_tax = self._calculate_state_tax(scaled_gross_income)
         return scaled_gross_income - federal_income_tax - fica_tax - state_tax
 
+    def compute_annual_lines(
+        self, household_sizes: list[int], percentiles: list[int]
+    ) -> np.ndarray:
+        """
+        Computes the annual line of many (household_size, percentile) scenarios at once.
+
+        Matches compute_annual_line element-wise, but reads the dataset once and evaluates
+        every step, including the federal tax brackets, as array operations over all scenarios.
+
+        :param household_sizes: The household size of each scenario.
+        :param percentiles: The percentile of each scenario, paired with household_sizes.
+        :return: A float64 array with the annual line of each scenario.
+        """
+        household_sizes = np.asarray(household_sizes, dtype="int64")
+        percentiles = np.asarray(percentiles, dtype="int64")
+        if (household_sizes <= 0).any():
+            raise ValueError("Household size must be positive.")
+
+        if ((percentiles < 1) | (percentiles > 99)).any():
+            raise ValueError("Percentile must be between 1 and 99.")
+
+        income_by_percentile = self._dataset.income_by_percentile()
+        poverty_line_base = self._dataset.poverty_line_base()
+        poverty_line_per_person = self._dataset.poverty_line_per_person()
+        scale = np.array(
+            [income_by_percentile[percentile] for percentile in percentiles],
+            dtype="float64",
+        ) / (
+            poverty_line_base
+            + poverty_line_per_person * self._dataset.avg_household_size()
+        )
+        # np.round rounds half to even, like round() in _calculate_scaled_income
+        scaled_gross_income = np.round(
+            (poverty_line_base + poverty_line_per_person * household_sizes) * scale
+        )
+
+        is_individual = household_sizes == 1
+        deductions = self._dataset.deductions()
+        taxable_income = np.maximum(
+            0,
+            scaled_gross_income
+            - np.where(
+                is_individual,
+                deductions[FilingStatus.INDIVIDUAL],
+                deductions[FilingStatus.JOINT],
+            ),
+        )
+
+        federal_income_tax = np.zeros(len(household_sizes))
+        for filing_status, brackets in self._dataset.federal_tax_brackets().items():
+            in_status = is_individual == (filing_status == FilingStatus.INDIVIDUAL)
+            federal_income_tax[in_status] = self._calculate_federal_income_taxes(
+                taxable_income[in_status], brackets
+            )
+
+        fica_tax = (
+            np.minimum(scaled_gross_income, self._dataset.fica_soc_sec_max_income())
+            * self._dataset.fica_soc_sec_rate()
+            + scaled_gross_income * self._dataset.fica_medicare_rate()
+        )
+
+        state_tax = self._dataset.state_income_tax_rate() * scaled_gross_income
+        return scaled_gross_income - federal_income_tax - fica_tax - state_tax
+
+    def _calculate_federal_income_taxes(
+        self, taxable_incomes: np.ndarray, brackets: pd.DataFrame
+    ) -> np.ndarray:
+        """
+        Calculates the federal income tax of many taxable incomes under one filing status's
+        brackets, as a (incomes x brackets) matrix of the income taxed in each bracket.
+        A missing upper limit means the bracket has no upper limit.
+        """
+        lower = brackets["lower"].to_numpy(dtype="float64")
+        upper = brackets["upper"].to_numpy(dtype="float64", na_value=np.inf)
+        rate = brackets["rate"].to_numpy(dtype="float64")
+        bracket_income = np.clip(
+            np.minimum(taxable_incomes[:, None], upper) - lower, 0, None
+        )
+        return (bracket_income * rate).sum(axis=1)
+
     def _calculate_scaled_income(
         self,
         household_size: int,
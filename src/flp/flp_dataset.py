@@ -55,20 +55,32 @@ import json
 from flp.filing_status import FilingStatus
 
 
+INCOME_DATA_FILE = "data/flp/income_data.csv"
+
+
 class Dataset:
     def __init__(self, config_file="data/flp/numbers.json") -> None:
         self._config_file = config_file
 
+    def source_files(self) -> list[str]:
+        """
+        Returns the paths of every file the dataset is read from, including the federal
+        tax brackets that the config file points to.
+        """
+        brackets = self._load_config()["federal_tax_brackets"]
+        return [
+            self._config_file,
+            INCOME_DATA_FILE,
+            brackets["INDIVIDUAL"],
+            brackets["JOINT"],
+        ]
+
     def income_by_percentile(self) -> dict[int, float]:
         """
         Returns a dictionary with integer keys from 1 to 99 and float values.
         The keys are percentiles and the values are the income at that percentile.
         """
-        return (
-            pd.read_csv("data/flp/income_data.csv")
-            .set_index("percentile")
-            .to_dict()["income"]
-        )
+        return pd.read_csv(INCOME_DATA_FILE).set_index("percentile").to_dict()["income"]
 
     def poverty_line_base(self) -> float:
         return self._load_config()["poverty"]["povLineBase"]
@@ -0,0 +1,213 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from budget.budget import (
+    BudgetStore,
+    actuals_by_month,
+    actuals_from_calculator,
+    compute_variance,
+)
+from engine.calculator import Calculator
+from engine.type import Type
+from flp.flp_calculator import FLPCalculator
+
+
+class BaseBudgetTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._budget_dir = self._tmp_dir.name
+        self._write(
+            "budget_2024-01.csv",
+            "bucket,category,amount\n"
+            "income,salary,5000\n"
+            "expense,groceries,600\n"
+            "giving,church,500\n",
+        )
+        self._write(
+            "budget_2024-03.csv",
+            "bucket,category,amount\n"
+            "income,salary,5500\n"
+            "expense,groceries,650.50\n",
+        )
+        self._write("notes.txt", "not a budget")
+        self._store = BudgetStore(self._budget_dir)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _write(self, filename: str, content: str) -> None:
+        with open(os.path.join(self._budget_dir, filename), "w") as f:
+            f.write(content)
+
+
+class TestVersions(BaseBudgetTest):
+    def test_ordered_by_start_month(self):
+        self.assertEqual(
+            [pd.Period("2024-01", freq="M"), pd.Period("2024-03", freq="M")],
+            [version.start_month() for version in self._store.versions()],
+        )
+
+    def test_unknown_bucket(self):
+        self._write("budget_2024-05.csv", "bucket,category,amount\nsavings,x,1\n")
+        with self.assertRaises(ValueError):
+            self._store.table()
+
+    def test_duplicate_category(self):
+        self._write(
+            "budget_2024-05.csv",
+            "bucket,category,amount\nexpense,x,1\nexpense,x,2\n",
+        )
+        with self.assertRaises(ValueError):
+            self._store.table()
+
+    def test_empty_directory(self):
+        with tempfile.TemporaryDirectory() as empty_dir:
+            with self.assertRaises(ValueError):
+                BudgetStore(empty_dir).table()
+
+
+class TestTableCache(BaseBudgetTest):
+    def test_cached(self):
+        self.assertIs(self._store.table(), self._store.table())
+
+    def test_reloaded_when_files_change(self):
+        table = self._store.table()
+        self._write("budget_2024-05.csv", "bucket,category,amount\nexpense,x,1\n")
+        self.assertIsNot(table, self._store.table())
+        self.assertEqual(
+            100, self._store.table().loc[("2024-05", "expense", "x")].iloc[0]
+        )
+
+
+class TestLookup(BaseBudgetTest):
+    def test_first_version(self):
+        self.assertEqual(
+            600,
+            self._store.lookup(
+                pd.Period("2024-02", freq="M"), Type.EXPENSE, "groceries"
+            ),
+        )
+
+    def test_later_version(self):
+        self.assertEqual(
+            650.5,
+            self._store.lookup(
+                pd.Period("2024-04", freq="M"), Type.EXPENSE, "groceries"
+            ),
+        )
+
+    def test_category_not_in_version(self):
+        self.assertEqual(
+            0, self._store.lookup(pd.Period("2024-03", freq="M"), Type.GIVING, "church")
+        )
+
+    def test_before_first_version(self):
+        with self.assertRaises(KeyError):
+            self._store.lookup(
+                pd.Period("2023-12", freq="M"), Type.EXPENSE, "groceries"
+            )
+
+
+class TestBudgetsForMonths(BaseBudgetTest):
+    def test_expected(self):
+        months = pd.PeriodIndex(["2023-12", "2024-02", "2024-03"], freq="M")
+        budgets = self._store.budgets_for_months(months)
+        self.assertEqual(
+            [
+                (pd.Period("2024-02", freq="M"), "expense", "groceries", 60000),
+                (pd.Period("2024-02", freq="M"), "giving", "church", 50000),
+                (pd.Period("2024-02", freq="M"), "income", "salary", 500000),
+                (pd.Period("2024-03", freq="M"), "expense", "groceries", 65050),
+                (pd.Period("2024-03", freq="M"), "income", "salary", 550000),
+            ],
+            sorted(budgets.itertuples(index=False, name=None)),
+        )
+
+
+class TestVariance(BaseBudgetTest):
+    def setUp(self):
+        super().setUp()
+        self._transactions = pd.DataFrame(
+            {
+                "date": pd.to_datetime(
+                    [
+                        "2024-02-01",
+                        "2024-02-03",
+                        "2024-02-10",
+                        "2024-03-01",
+                        "2024-03-02",
+                    ]
+                ),
+                "type": [
+                    Type.INCOME,
+                    Type.EXPENSE,
+                    Type.EXPENSE,
+                    Type.EXPENSE,
+                    Type.NO_TYPE,
+                ],
+                "category": [
+                    "salary",
+                    "groceries",
+                    "dining",
+                    "groceries",
+                    "no category",
+                ],
+                "amount_cents": pd.Series(
+                    [500000, -70000, -2000, -50000, -100], dtype="Int64"
+                ),
+            }
+        )
+
+    def test_actuals_by_month(self):
+        actuals = actuals_by_month(self._transactions)
+        self.assertEqual(
+            [
+                (pd.Period("2024-02", freq="M"), "expense", "dining", 2000),
+                (pd.Period("2024-02", freq="M"), "expense", "groceries", 70000),
+                (pd.Period("2024-02", freq="M"), "income", "salary", 500000),
+                (pd.Period("2024-03", freq="M"), "expense", "groceries", 50000),
+            ],
+            list(actuals.itertuples(index=False, name=None)),
+        )
+
+    def test_multi_month_variance(self):
+        variance = compute_variance(self._store, actuals_by_month(self._transactions))
+        expected = pd.DataFrame(
+            {
+                "month": pd.PeriodIndex(["2024-02"] * 4 + ["2024-03"] * 2, freq="M"),
+                "type": ["expense", "expense", "giving", "income", "expense", "income"],
+                "category": [
+                    "dining",
+                    "groceries",
+                    "church",
+                    "salary",
+                    "groceries",
+                    "salary",
+                ],
+                "budget": [0.0, 600.0, 500.0, 5000.0, 650.5, 5500.0],
+                "actual": [20.0, 700.0, 0.0, 5000.0, 500.0, 0.0],
+                "variance": [-20.0, -100.0, 500.0, 0.0, 150.5, -5500.0],
+            }
+        )
+        assert_frame_equal(expected, variance)
+
+    def test_variance_from_calculator(self):
+        mock_flp_calculator = MagicMock(spec=FLPCalculator)
+        mock_flp_calculator.compute_annual_line.return_value = 0
+        df = self._transactions[self._transactions["date"].dt.month == 2].assign(
+            amount=lambda df: df["amount_cents"].astype("float64") / 100,
+            filename="file1.csv",
+            description="",
+        )
+        calculator = Calculator(mock_flp_calculator, 2, 50, df)
+        month = pd.Period("2024-02", freq="M")
+
+        assert_frame_equal(
+            compute_variance(self._store, actuals_by_month(df)),
+            compute_variance(self._store, actuals_from_calculator(calculator, month)),
+        )
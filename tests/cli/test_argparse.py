@@ -0,0 +1,36 @@
+import argparse
+import unittest
+
+import pandas as pd
+
+from cli.argparse import int_list, period
+
+
+class TestIntList(unittest.TestCase):
+    def test_single(self):
+        self.assertEqual([2], int_list("2"))
+
+    def test_list_and_ranges(self):
+        self.assertEqual([1, 2, 3, 5], int_list("1-3, 5"))
+
+    def test_duplicates_dropped(self):
+        self.assertEqual([50, 25, 26], int_list("50,25-26,50"))
+
+    def test_invalid(self):
+        with self.assertRaises(argparse.ArgumentTypeError):
+            int_list("2-x")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            int_list("")
+
+
+class TestPeriod(unittest.TestCase):
+    def test_day_month_year(self):
+        self.assertEqual(pd.Timestamp("2024-01-15"), period("2024-01-15").start_time)
+        self.assertEqual(
+            pd.Timestamp("2024-02-01"), period("2024-01").end_time.ceil("D")
+        )
+        self.assertEqual(pd.Timestamp("2024-01-01"), period("2024").start_time)
+
+    def test_invalid(self):
+        with self.assertRaises(argparse.ArgumentTypeError):
+            period("last month")
@@ -0,0 +1,87 @@
+import io
+import unittest
+from unittest.mock import patch
+
+from colorama import Fore
+
+from cli.printer import Printer
+
+
+class TtyStringIO(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+class TestNonTty(unittest.TestCase):
+    def test_no_ansi(self):
+        stream = io.StringIO()
+        printer = Printer(stream=stream)
+        self.assertEqual("1.00", printer.color_string(Fore.YELLOW, "1.00"))
+        self.assertEqual("-1.00", printer.format_delta("-1.00"))
+
+    @patch("cli.printer.time.sleep")
+    def test_checkmark_without_delay(self, sleep):
+        stream = io.StringIO()
+        Printer(stream=stream).print_message_with_checkmark("Starting up")
+        sleep.assert_not_called()
+        self.assertEqual("Starting up ✔\n", stream.getvalue())
+
+    def test_progress_printed_once(self):
+        stream = io.StringIO()
+        printer = Printer(buffered=True, stream=stream)
+        printer.start_progress(2)
+        printer.print_file_progress("a.csv", 10)
+        printer.print_file_progress("b.csv", 5)
+        self.assertEqual("", stream.getvalue())
+        printer.finish_progress()
+        self.assertTrue(stream.getvalue().startswith("Read 2/2 files | 15 rows | "))
+        self.assertEqual(1, stream.getvalue().count("\n"))
+
+
+class TestTty(unittest.TestCase):
+    def test_ansi(self):
+        printer = Printer(stream=TtyStringIO())
+        self.assertIn(Fore.YELLOW, printer.color_string(Fore.YELLOW, "1.00"))
+
+    @patch("cli.printer.time.sleep")
+    def test_checkmark_with_delay(self, sleep):
+        Printer(stream=TtyStringIO()).print_message_with_checkmark("Starting up")
+        sleep.assert_called_once_with(0.1)
+
+    @patch("cli.printer.time.sleep")
+    def test_buffered_checkmark_without_delay(self, sleep):
+        Printer(buffered=True, stream=TtyStringIO()).print_message_with_checkmark(
+            "Starting up"
+        )
+        sleep.assert_not_called()
+
+    @patch("cli.printer.time.monotonic")
+    def test_progress_rate_limited(self, monotonic):
+        stream = TtyStringIO()
+        printer = Printer(buffered=True, stream=stream, min_interval=1.0)
+        monotonic.return_value = 0.0
+        printer.start_progress(3)
+        monotonic.return_value = 0.5
+        printer.print_file_progress("a.csv", 10)
+        monotonic.return_value = 1.0
+        printer.print_file_progress("b.csv", 10)
+        monotonic.return_value = 1.6
+        printer.print_file_progress("c.csv", 10)
+        self.assertEqual(2, stream.getvalue().count("\r"))
+        self.assertIn("Read 3/3 files | 30 rows | 19 rows/s", stream.getvalue())
+
+
+class TestBuffered(unittest.TestCase):
+    def test_report_written_on_flush(self):
+        stream = io.StringIO()
+        printer = Printer(buffered=True, stream=stream)
+        printer.print("In:", "1.00")
+        printer.print_line()
+        self.assertEqual("", stream.getvalue())
+        printer.flush()
+        self.assertEqual("In: 1.00\n" + "-" * 50 + "\n", stream.getvalue())
+
+    def test_unbuffered_report_written_immediately(self):
+        stream = io.StringIO()
+        Printer(stream=stream).print("In:", "1.00")
+        self.assertEqual("In: 1.00\n", stream.getvalue())
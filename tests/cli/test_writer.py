@@ -0,0 +1,97 @@
+import json
+import tempfile
+import unittest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from cli.writer import CsvWriter, JsonLinesWriter, ParquetWriter, create_writer
+from engine.type import Type
+
+
+class BaseWriterTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self._output_dir = tmp_dir.name
+        self._df = pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-04"]),
+                "description": ["PAYROLL", "GROCERIES", "CHURCH"],
+                "amount_cents": pd.array([500000, -12050, None], dtype="Int64"),
+                "type": [Type.INCOME, Type.EXPENSE, Type.GIVING],
+            }
+        )
+
+
+class TestJsonLinesWriter(BaseWriterTest):
+    def test_write_in_chunks(self):
+        writer = JsonLinesWriter(self._output_dir, chunk_rows=2)
+        writer.write("transactions", self._df)
+        with open(writer.path("transactions")) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(3, len(records))
+        self.assertEqual("income", records[0]["type"])
+        self.assertEqual(-12050, records[1]["amount_cents"])
+        self.assertIsNone(records[2]["amount_cents"])
+        self.assertTrue(records[0]["date"].startswith("2024-01-02"))
+
+    def test_replaces_previous_file(self):
+        writer = JsonLinesWriter(self._output_dir)
+        writer.write("transactions", self._df)
+        writer.write("transactions", self._df.iloc[:1])
+        with open(writer.path("transactions")) as f:
+            self.assertEqual(1, len(f.readlines()))
+
+    def test_periods(self):
+        writer = JsonLinesWriter(self._output_dir)
+        writer.write(
+            "budget_variance",
+            pd.DataFrame({"month": pd.PeriodIndex(["2024-01"], freq="M")}),
+        )
+        with open(writer.path("budget_variance")) as f:
+            self.assertEqual({"month": "2024-01"}, json.loads(f.readline()))
+
+
+class TestCsvWriter(BaseWriterTest):
+    def test_write_in_chunks(self):
+        writer = CsvWriter(self._output_dir, chunk_rows=2)
+        writer.write("transactions", self._df)
+        df = pd.read_csv(writer.path("transactions"))
+        self.assertEqual(["income", "expense", "giving"], list(df["type"]))
+        self.assertEqual(list(self._df.columns), list(df.columns))
+
+    def test_empty_has_header(self):
+        writer = CsvWriter(self._output_dir)
+        writer.write("unmatched", self._df.iloc[:0])
+        with open(writer.path("unmatched")) as f:
+            self.assertEqual("date,description,amount_cents,type\n", f.read())
+
+
+class TestParquetWriter(BaseWriterTest):
+    def test_write_in_chunks(self):
+        writer = ParquetWriter(self._output_dir, chunk_rows=2)
+        writer.write("transactions", self._df)
+        expected_df = self._df.assign(type=["income", "expense", "giving"])
+        assert_frame_equal(
+            expected_df,
+            pd.read_parquet(writer.path("transactions")),
+            check_dtype=False,
+        )
+
+    def test_empty(self):
+        writer = ParquetWriter(self._output_dir)
+        writer.write("unmatched", self._df.iloc[:0])
+        self.assertEqual(
+            list(self._df.columns),
+            list(pd.read_parquet(writer.path("unmatched")).columns),
+        )
+
+
+class TestCreateWriter(BaseWriterTest):
+    def test_create(self):
+        self.assertIsInstance(create_writer("csv", self._output_dir), CsvWriter)
+        self.assertIsInstance(create_writer("json", self._output_dir), JsonLinesWriter)
+
+    def test_text(self):
+        with self.assertRaises(ValueError):
+            create_writer("text", self._output_dir)
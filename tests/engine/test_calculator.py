@@ -1,9 +1,13 @@
+import pickle
+
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_series_equal, assert_frame_equal
 
 import unittest
 from unittest.mock import MagicMock
 
+from engine.category_tree import CategoryTree
 from engine.type import Type
 from flp.flp_calculator import FLPCalculator
 from src.engine.calculator import Calculator
@@ -122,3 +126,204 @@ class BaseConfigLoaderTest(unittest.TestCase):
             self._calculator.no_type_rows().reset_index(drop=True),
             expected_df.reset_index(drop=True),
         )
+
+    def _assert_same_aggregates(self, expected: Calculator, actual: Calculator):
+        self.assertAlmostEqual(expected.income_total(), actual.income_total())
+        self.assertAlmostEqual(expected.expense_total(), actual.expense_total())
+        self.assertAlmostEqual(expected.giving_total(), actual.giving_total())
+        assert_series_equal(expected.income_by_category(), actual.income_by_category())
+        assert_series_equal(
+            expected.expense_by_category(), actual.expense_by_category()
+        )
+        assert_series_equal(expected.giving_by_category(), actual.giving_by_category())
+        assert_frame_equal(
+            expected.no_type_rows().reset_index(drop=True),
+            actual.no_type_rows().reset_index(drop=True),
+        )
+
+
+class TestExactCents(unittest.TestCase):
+    def test_sums_are_exact(self):
+        mock_flp_calculator = MagicMock(spec=FLPCalculator)
+        mock_flp_calculator.compute_annual_line.return_value = 0
+        df = pd.DataFrame(
+            {
+                "date": ["2024-01-01"] * 10,
+                "description": ["coffee"] * 10,
+                "amount": [-0.1] * 10,
+                "amount_cents": pd.Series([-10] * 10, dtype="Int64"),
+                "filename": ["file1.csv"] * 10,
+                "account_name": ["bank1"] * 10,
+                "type": [Type.EXPENSE] * 10,
+                "category": ["food"] * 10,
+            }
+        )
+        calculator = Calculator(mock_flp_calculator, 2, 50, df)
+        self.assertEqual(1.0, calculator.expense_total())
+        self.assertEqual(1.0, calculator.expense_by_category()["food"])
+        self.assertEqual(-1.0, calculator.in_minus_out())
+
+
+class TestIncrementalUpdates(BaseConfigLoaderTest):
+    def setUp(self):
+        super().setUp()
+        self._mock_flp_calculator = MagicMock(spec=FLPCalculator)
+        self._mock_flp_calculator.compute_annual_line.return_value = 10000
+
+    def test_add_matches_full_computation(self):
+        first, second = self._df.iloc[:2], self._df.iloc[2:]
+        calculator = Calculator(self._mock_flp_calculator, 2, 50, first)
+        calculator.add_transactions(second)
+        self._assert_same_aggregates(self._calculator, calculator)
+
+    def test_remove_matches_full_computation(self):
+        calculator = Calculator(self._mock_flp_calculator, 2, 50, self._df)
+        calculator.remove_transactions(self._df[self._df["filename"] == "file5.csv"])
+        calculator.remove_transactions(self._df[self._df["filename"] == "file3.csv"])
+        expected = Calculator(
+            self._mock_flp_calculator,
+            2,
+            50,
+            self._df[~self._df["filename"].isin(["file3.csv", "file5.csv"])],
+        )
+        self._assert_same_aggregates(expected, calculator)
+        self.assertNotIn("expense_category1", calculator.expense_by_category().index)
+
+    def test_line_minus_expenses_after_add(self):
+        calculator = Calculator(self._mock_flp_calculator, 2, 50, self._df.iloc[:2])
+        calculator.add_transactions(self._df.iloc[2:])
+        self.assertAlmostEqual(calculator.line_minus_expenses(), 633.33, 2)
+
+
+class TestSnapshot(BaseConfigLoaderTest):
+    def setUp(self):
+        super().setUp()
+        self._mock_flp_calculator = MagicMock(spec=FLPCalculator)
+        self._mock_flp_calculator.compute_annual_line.return_value = 10000
+
+    def test_round_trip(self):
+        snapshot = pickle.loads(pickle.dumps(self._calculator.snapshot()))
+        calculator = Calculator.from_snapshot(self._mock_flp_calculator, snapshot)
+        self._assert_same_aggregates(self._calculator, calculator)
+        self.assertAlmostEqual(self._calculator.line(), calculator.line())
+
+    def test_incremental_after_restore(self):
+        calculator = Calculator.from_snapshot(
+            self._mock_flp_calculator,
+            Calculator(self._mock_flp_calculator, 2, 50, self._df.iloc[:2]).snapshot(),
+        )
+        calculator.add_transactions(self._df.iloc[2:])
+        self._assert_same_aggregates(self._calculator, calculator)
+
+
+class TestRollup(unittest.TestCase):
+    def setUp(self):
+        self._mock_flp_calculator = MagicMock(spec=FLPCalculator)
+        self._mock_flp_calculator.compute_annual_line.return_value = 10000
+        self._df = pd.DataFrame(
+            {
+                "date": "2024-01-01",
+                "description": ["store", "cafe", "store", "power", "refund"],
+                "amount": [-80.0, -12.5, -20.0, -60.0, 5.0],
+                "filename": "file1.csv",
+                "account_name": "bank1",
+                "type": Type.EXPENSE,
+                "category": [
+                    "Food:Groceries",
+                    "Food:Dining",
+                    "Food:Groceries",
+                    "Home:Utilities",
+                    "Food:Dining",
+                ],
+            }
+        )
+
+    def test_every_level(self):
+        calculator = Calculator(
+            self._mock_flp_calculator,
+            2,
+            50,
+            self._df,
+            CategoryTree(["Food:Groceries", "Food:Dining", "Home:Utilities"]),
+        )
+        self.assertTrue(calculator.has_category_hierarchy())
+        assert_series_equal(
+            pd.Series(
+                [107.5, 7.5, 100.0, 60.0, 60.0],
+                index=pd.Index(
+                    [
+                        "Food",
+                        "Food:Dining",
+                        "Food:Groceries",
+                        "Home",
+                        "Home:Utilities",
+                    ],
+                    name="category",
+                ),
+                name="amount",
+            ),
+            calculator.expense_rollup(),
+        )
+        self.assertTrue(calculator.income_rollup().empty)
+
+    def test_after_update_and_restore(self):
+        calculator = Calculator(self._mock_flp_calculator, 2, 50, self._df.iloc[:2])
+        calculator = Calculator.from_snapshot(
+            self._mock_flp_calculator, calculator.snapshot()
+        )
+        calculator.add_transactions(self._df.iloc[2:])
+        calculator.remove_transactions(self._df.iloc[3:4])
+        self.assertEqual(
+            {"Food": 107.5, "Food:Dining": 7.5, "Food:Groceries": 100.0},
+            calculator.expense_rollup().to_dict(),
+        )
+
+    def test_exact_cents(self):
+        calculator = Calculator(self._mock_flp_calculator, 2, 50, self._df)
+        self.assertEqual(16750, calculator.total_cents(Type.EXPENSE))
+        self.assertEqual(-16750, calculator.in_minus_out_cents())
+        self.assertEqual(
+            {
+                "Food": 10750,
+                "Food:Dining": 750,
+                "Food:Groceries": 10000,
+                "Home": 6000,
+                "Home:Utilities": 6000,
+            },
+            calculator.rollup_cents(Type.EXPENSE).to_dict(),
+        )
+
+    def test_flat_categories(self):
+        calculator = Calculator(
+            self._mock_flp_calculator,
+            2,
+            50,
+            self._df.assign(category=self._df["category"].str.replace(":", " ")),
+        )
+        self.assertFalse(calculator.has_category_hierarchy())
+        assert_series_equal(
+            calculator.expense_by_category(), calculator.expense_rollup()
+        )
+
+
+class TestScenarioLines(BaseConfigLoaderTest):
+    def test_scenario_lines(self):
+        mock_flp_calculator = MagicMock(spec=FLPCalculator)
+        mock_flp_calculator.compute_annual_line.return_value = 10000
+        mock_flp_calculator.compute_annual_lines.return_value = np.array(
+            [10000.0, 22000.0]
+        )
+        calculator = Calculator(mock_flp_calculator, 2, 50, self._df)
+
+        expected_df = pd.DataFrame(
+            {
+                "household_size": [2, 3],
+                "percentile": [50, 25],
+                "line": [10000 / 12, 22000 / 12],
+                "line_minus_expenses": [10000 / 12 - 200, 22000 / 12 - 200],
+            }
+        )
+        assert_frame_equal(calculator.scenario_lines([2, 3], [50, 25]), expected_df)
+        mock_flp_calculator.compute_annual_lines.assert_called_once_with(
+            [2, 3], [50, 25]
+        )
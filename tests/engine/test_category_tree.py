@@ -0,0 +1,72 @@
+import unittest
+
+import pandas as pd
+from pandas.testing import assert_series_equal
+
+from engine.category_tree import CategoryTree
+
+
+def cents(amount_by_category: dict[str, int]) -> pd.Series:
+    return pd.Series(
+        pd.array(list(amount_by_category.values()), dtype="Int64"),
+        index=pd.Index(list(amount_by_category), name="category"),
+    )
+
+
+class TestRollup(unittest.TestCase):
+    def setUp(self):
+        self._tree = CategoryTree(
+            ["Food:Groceries", "Food:Dining", "Food Truck", "Home:Utilities:Power"]
+        )
+
+    def test_every_level(self):
+        assert_series_equal(
+            cents(
+                {
+                    "Food": 350,
+                    "Food:Dining": 100,
+                    "Food:Groceries": 250,
+                    "Food Truck": 7,
+                    "Home": 40,
+                    "Home:Utilities": 40,
+                    "Home:Utilities:Power": 40,
+                }
+            ),
+            self._tree.rollup(
+                cents(
+                    {
+                        "Food Truck": 7,
+                        "Food:Dining": 100,
+                        "Food:Groceries": 250,
+                        "Home:Utilities:Power": 40,
+                    }
+                )
+            ),
+        )
+
+    def test_parent_with_own_amount(self):
+        assert_series_equal(
+            cents({"Food": 15, "Food:Dining": 10}),
+            self._tree.rollup(cents({"Food": 5, "Food:Dining": 10})),
+        )
+
+    def test_unknown_and_flat_categories(self):
+        assert_series_equal(
+            cents({"Travel": 9, "Travel:Air": 9, "misc": 3}),
+            self._tree.rollup(cents({"Travel:Air": 9, "misc": 3})),
+        )
+
+    def test_empty(self):
+        self.assertTrue(self._tree.rollup(cents({})).empty)
+
+    def test_is_hierarchical(self):
+        self.assertTrue(self._tree.is_hierarchical())
+        self.assertFalse(CategoryTree(["groceries", "rent"]).is_hierarchical())
+
+    def test_empty_level(self):
+        with self.assertRaises(ValueError):
+            CategoryTree(["Food:"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from engine.checkpoint import CheckpointStore
+from engine.manifest import file_hash
+from engine.processor import Processor
+from engine.type import Type
+
+
+def make_processor(categories: dict[str, tuple[Type, str]]) -> Processor:
+    return Processor(
+        name="Bank1",
+        file_prefix="bank1",
+        parser="mock_parser",
+        skip_transactions=["transfer"],
+        type_category_by_identifier=categories,
+    )
+
+
+class BaseCheckpointTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self._dir = tmp_dir.name
+        self._checkpoint_dir = os.path.join(self._dir, "checkpoints")
+        self._file_path = os.path.join(self._dir, "bank1_jan.csv")
+        self._write("statement")
+        self._processor = make_processor({"shop": (Type.EXPENSE, "shopping")})
+        self._df = pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+                "description": ["SHOP", "MYSTERY"],
+                "amount": [-1.5, -2.0],
+                "amount_cents": pd.array([-150, -200], dtype="Int64"),
+                "filename": "bank1_jan.csv",
+                "account_name": "Checking",
+                "type": [Type.EXPENSE, Type.NO_TYPE],
+                "category": ["shopping", "no category"],
+            }
+        )
+
+    def _write(self, content: str) -> None:
+        with open(self._file_path, "w") as f:
+            f.write(content)
+
+    def _store(self, date_range=None) -> CheckpointStore:
+        return CheckpointStore(self._checkpoint_dir, date_range)
+
+
+class TestGetPut(BaseCheckpointTest):
+    def test_miss(self):
+        self.assertIsNone(self._store().get(self._file_path, self._processor, "x"))
+
+    def test_round_trip_parquet(self):
+        self._store().put(self._file_path, self._processor, "Checking", self._df)
+        self.assertTrue(os.listdir(self._checkpoint_dir)[0].endswith(".parquet"))
+        pd.testing.assert_frame_equal(
+            self._df,
+            self._store().get(self._file_path, self._processor, "Checking"),
+        )
+
+    def test_requires_pyarrow(self):
+        with patch.dict(sys.modules, {"pyarrow": None}):
+            with self.assertRaises(ValueError):
+                self._store()
+
+    def test_put_with_content_hash(self):
+        self._store().put(
+            self._file_path,
+            self._processor,
+            "Checking",
+            self._df,
+            file_hash(self._file_path),
+        )
+        self.assertIsNotNone(
+            self._store().get(self._file_path, self._processor, "Checking")
+        )
+
+    def test_put_trusts_content_hash(self):
+        self._store().put(
+            self._file_path, self._processor, "Checking", self._df, "0" * 64
+        )
+        self.assertIsNone(
+            self._store().get(self._file_path, self._processor, "Checking")
+        )
+
+
+class TestKey(BaseCheckpointTest):
+    def setUp(self):
+        super().setUp()
+        self._store().put(self._file_path, self._processor, "Checking", self._df)
+
+    def test_changed_file(self):
+        self._write("new statement")
+        self.assertIsNone(
+            self._store().get(self._file_path, self._processor, "Checking")
+        )
+
+    def test_changed_processor(self):
+        processor = make_processor({"shop": (Type.EXPENSE, "groceries")})
+        self.assertIsNone(self._store().get(self._file_path, processor, "Checking"))
+
+    def test_changed_account_name(self):
+        self.assertIsNone(
+            self._store().get(self._file_path, self._processor, "Savings")
+        )
+
+    def test_changed_date_range(self):
+        store = self._store((pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-31")))
+        self.assertIsNone(store.get(self._file_path, self._processor, "Checking"))
+
+    def test_same_inputs(self):
+        self.assertIsNotNone(
+            self._store().get(
+                self._file_path,
+                make_processor({"shop": (Type.EXPENSE, "shopping")}),
+                "Checking",
+            )
+        )
+
+
+class TestPrune(BaseCheckpointTest):
+    def setUp(self):
+        super().setUp()
+        self._store().put(self._file_path, self._processor, "Checking", self._df)
+
+    def test_keeps_used_checkpoints(self):
+        store = self._store()
+        store.get(self._file_path, self._processor, "Checking")
+        store.prune()
+        self.assertIsNotNone(
+            self._store().get(self._file_path, self._processor, "Checking")
+        )
+
+    def test_removes_stale_checkpoints(self):
+        self._write("new statement")
+        store = self._store()
+        store.put(self._file_path, self._processor, "Checking", self._df)
+        self.assertEqual(2, len(os.listdir(self._checkpoint_dir)))
+        store.prune()
+        self.assertEqual(1, len(os.listdir(self._checkpoint_dir)))
+        self.assertIsNotNone(
+            self._store().get(self._file_path, self._processor, "Checking")
+        )
+
+    def test_keeps_other_files(self):
+        other_path = os.path.join(self._checkpoint_dir, "notes.txt")
+        open(other_path, "w").close()
+        self._store().prune()
+        self.assertEqual(["notes.txt"], os.listdir(self._checkpoint_dir))
+
+    def test_missing_dir(self):
+        CheckpointStore(os.path.join(self._dir, "missing")).prune()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from engine.conditions import Conditions
+
+
+class TestMask(unittest.TestCase):
+    def setUp(self):
+        self._df = pd.DataFrame(
+            {
+                "date": pd.to_datetime(
+                    ["2024-01-05", "2024-02-10", "2024-03-31", None]
+                ),
+                "amount_cents": pd.array([-150000, 2000, -99999, pd.NA], dtype="Int64"),
+                "account_name": ["Checking", "Checking", "Savings", "Checking"],
+            }
+        )
+
+    def _mask(self, **conditions) -> list[bool]:
+        return Conditions(**conditions).mask(self._df).tolist()
+
+    def test_no_conditions(self):
+        self.assertEqual([True] * 4, self._mask())
+
+    def test_amount_ignores_sign(self):
+        self.assertEqual([True, False, True, False], self._mask(min_amount_cents=99999))
+        self.assertEqual([False, True, True, False], self._mask(max_amount_cents=99999))
+
+    def test_dates(self):
+        self.assertEqual(
+            [False, True, True, False],
+            self._mask(
+                start=pd.Timestamp("2024-02-01"),
+                end=pd.Period("2024-03").end_time,
+            ),
+        )
+
+    def test_all_conditions_must_hold(self):
+        mask = Conditions(min_amount_cents=1000, account_names=["Checking"]).mask(
+            self._df
+        )
+        self.assertIsInstance(mask, np.ndarray)
+        self.assertEqual([True, True, False, False], mask.tolist())
+
+    def test_eq(self):
+        self.assertEqual(Conditions(min_amount_cents=1), Conditions(min_amount_cents=1))
+        self.assertNotEqual(Conditions(min_amount_cents=1), Conditions())
+
+
+if __name__ == "__main__":
+    unittest.main()
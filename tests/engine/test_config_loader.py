@@ -1,5 +1,9 @@
 import pathlib
 import unittest
+
+import pandas as pd
+
+from engine.conditions import Conditions
 from engine.config_loader import ConfigLoader
 from engine.processor import Processor
 from engine.type import Type
@@ -22,6 +26,48 @@ class TestLoadNicknames(BaseConfigLoaderTest):
         )
 
 
+class TestLoadCategoryTree(BaseConfigLoaderTest):
+    def test_every_category(self):
+        category_tree = self._config_loader.load_category_tree()
+        self.assertFalse(category_tree.is_hierarchical())
+        self.assertEqual(
+            [
+                "groceries",
+                "income source 1",
+                "income source 2",
+                "misc expenses",
+                "non profit 1",
+            ],
+            category_tree.rollup(
+                pd.Series(
+                    [1] * 5,
+                    index=[
+                        "income source 1",
+                        "income source 2",
+                        "non profit 1",
+                        "misc expenses",
+                        "groceries",
+                    ],
+                )
+            ).index.tolist(),
+        )
+
+
+class TestLoadNormalizer(BaseConfigLoaderTest):
+    def test_expected(self):
+        self.assertEqual(
+            [("#\\d+", " "), ("ppd id: \\w+", "")],
+            self._config_loader.load_normalizer().rewrites(),
+        )
+
+    def test_no_rewrites(self):
+        test_config_file = str(
+            pathlib.Path(__file__).parent.parent
+            / "data/duplicate_processor_names_config.json"
+        )
+        self.assertIsNone(ConfigLoader(test_config_file, {}).load_normalizer())
+
+
 class TestLoadProcessors(BaseConfigLoaderTest):
     def test_expected(self):
         self.assertEqual(
@@ -63,6 +109,55 @@ class TestLoadProcessors(BaseConfigLoaderTest):
             config_loader.load_processors()
 
 
+class TestLoadConditionalRules(unittest.TestCase):
+    def setUp(self):
+        self._config_file = str(
+            pathlib.Path(__file__).parent.parent / "data/conditional_config.json"
+        )
+
+    def test_expected(self):
+        self.assertEqual(
+            [
+                Processor(
+                    name="Bank1 Debit",
+                    file_prefix="bank1_debit",
+                    parser="mock_parser1",
+                    skip_transactions=["auto pay"],
+                    type_category_by_identifier={"venmo": (Type.INCOME, "misc")},
+                    conditional_skips=[
+                        ("transfer", Conditions(account_names=["Savings"]))
+                    ],
+                    conditional_categories=[
+                        (
+                            "venmo",
+                            Conditions(
+                                min_amount_cents=100000,
+                                max_amount_cents=250050,
+                                start=pd.Timestamp("2024-03-01"),
+                                end=pd.Period("2024").end_time,
+                                account_names=["Checking", "Joint"],
+                            ),
+                            (Type.EXPENSE, "rent"),
+                        )
+                    ],
+                )
+            ],
+            ConfigLoader(
+                self._config_file, {"bank1": "mock_parser1"}
+            ).load_processors(),
+        )
+
+    def test_invalid_rule(self):
+        config_loader = ConfigLoader(self._config_file, {"bank1": "mock_parser1"})
+        for rule in (
+            {"description": "x", "min_amout": 5},
+            {"description": "x", "from": "March"},
+            {"description": "x", "max_amount": "lots"},
+        ):
+            with self.subTest(rule=rule), self.assertRaises(ValueError):
+                config_loader._extract_conditional_rule(rule, "Bank1 Debit")
+
+
 class TestExtractParser(BaseConfigLoaderTest):
     def test_expected(self):
         self.assertEqual(
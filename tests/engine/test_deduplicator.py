@@ -0,0 +1,99 @@
+import unittest
+import pandas as pd
+
+from engine.deduplicator import remove_duplicate_transactions, transaction_keys
+
+
+def make_transactions(rows: list[tuple[str, str, str, int, str]]) -> pd.DataFrame:
+    df = pd.DataFrame(
+        rows,
+        columns=["filename", "account_name", "date", "amount_cents", "description"],
+    )
+    df["date"] = pd.to_datetime(df["date"])
+    df["amount_cents"] = df["amount_cents"].astype("Int64")
+    return df
+
+
+class BaseDeduplicatorTest(unittest.TestCase):
+    def setUp(self):
+        # jan_feb.csv and feb_mar.csv overlap in February
+        self._df = pd.concat(
+            [
+                make_transactions(
+                    [
+                        ("jan_feb.csv", "card", "2024-01-10", -500, "COFFEE"),
+                        ("jan_feb.csv", "card", "2024-02-02", -500, "COFFEE"),
+                        ("jan_feb.csv", "card", "2024-02-02", -500, "COFFEE"),
+                        ("jan_feb.csv", "card", "2024-02-05", -2000, "BOOK  STORE"),
+                    ]
+                ),
+                make_transactions(
+                    [
+                        ("feb_mar.csv", "card", "2024-02-02", -500, "COFFEE"),
+                        ("feb_mar.csv", "card", "2024-02-02", -500, "coffee"),
+                        ("feb_mar.csv", "card", "2024-02-05", -2000, "Book Store"),
+                        ("feb_mar.csv", "card", "2024-03-01", -2000, "Book Store"),
+                    ]
+                ),
+            ]
+        )
+
+
+class TestTransactionKeys(BaseDeduplicatorTest):
+    def test_normalized_description(self):
+        keys = transaction_keys(self._df)
+        self.assertEqual("uint64", keys.dtype)
+        self.assertEqual(keys.iloc[1], keys.iloc[5])
+        self.assertEqual(keys.iloc[3], keys.iloc[6])
+
+    def test_differs_by_account(self):
+        other_account = self._df.assign(account_name="other card")
+        self.assertNotEqual(
+            transaction_keys(self._df).iloc[0], transaction_keys(other_account).iloc[0]
+        )
+
+
+class TestRemoveDuplicateTransactions(BaseDeduplicatorTest):
+    def test_off(self):
+        self.assertEqual(8, len(remove_duplicate_transactions(self._df, "off")))
+
+    def test_exact(self):
+        result = remove_duplicate_transactions(self._df, "exact")
+        self.assertEqual(
+            [
+                ("jan_feb.csv", "2024-01-10"),
+                ("jan_feb.csv", "2024-02-02"),
+                ("jan_feb.csv", "2024-02-05"),
+                ("feb_mar.csv", "2024-03-01"),
+            ],
+            list(zip(result["filename"], result["date"].dt.strftime("%Y-%m-%d"))),
+        )
+
+    def test_occurrence_keeps_same_day_identical_charges(self):
+        result = remove_duplicate_transactions(self._df, "occurrence")
+        self.assertEqual(5, len(result))
+        self.assertEqual(
+            2,
+            len(result[(result["date"] == "2024-02-02")]),
+        )
+        self.assertEqual(
+            ["jan_feb.csv"] * 4 + ["feb_mar.csv"], result["filename"].tolist()
+        )
+
+    def test_occurrence_keeps_max_count_across_files(self):
+        df = pd.concat(
+            [
+                make_transactions([("a.csv", "card", "2024-02-02", -500, "COFFEE")]),
+                make_transactions(
+                    [("b.csv", "card", "2024-02-02", -500, "COFFEE")] * 3
+                ),
+            ]
+        )
+        self.assertEqual(3, len(remove_duplicate_transactions(df, "occurrence")))
+
+    def test_empty(self):
+        self.assertEqual(0, len(remove_duplicate_transactions(self._df[:0], "exact")))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            remove_duplicate_transactions(self._df, "fuzzy")
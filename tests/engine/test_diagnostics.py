@@ -0,0 +1,75 @@
+import unittest
+
+import pandas as pd
+
+from engine.diagnostics import CONFLICTING, SKIPPED, UNMATCHED, Diagnostics
+
+
+class BaseDiagnosticsTest(unittest.TestCase):
+    def setUp(self):
+        self._diagnostics = Diagnostics(max_samples=2)
+
+
+class TestRecord(BaseDiagnosticsTest):
+    def test_counts_per_identifier(self):
+        self._diagnostics.record(
+            SKIPPED,
+            "Bank1",
+            pd.Series(["AUTO PAY 1", "auto pay 2", "Transfer", "AUTO PAY 3"]),
+            pd.Series(["auto pay", "auto pay", "transfer", "auto pay"]),
+        )
+        self.assertEqual(
+            [
+                ["skipped", "Bank1", "auto pay", 3, "AUTO PAY 1 | auto pay 2"],
+                ["skipped", "Bank1", "transfer", 1, "Transfer"],
+            ],
+            self._diagnostics.counts().values.tolist(),
+        )
+
+    def test_accumulates_with_bounded_samples(self):
+        for description in ["SHOP 1", "SHOP 2", "SHOP 3"]:
+            self._diagnostics.record(UNMATCHED, "Bank1", pd.Series([description]))
+        self.assertEqual(
+            [["unmatched", "Bank1", "", 3, "SHOP 1 | SHOP 2"]],
+            self._diagnostics.counts().values.tolist(),
+        )
+
+    def test_clear(self):
+        self._diagnostics.record(UNMATCHED, "Bank1", pd.Series(["x"]))
+        self._diagnostics.record(SKIPPED, "Bank1", pd.Series(["s"]), pd.Series(["s"]))
+        self._diagnostics.clear(UNMATCHED)
+        self._diagnostics.record(UNMATCHED, "Bank1", pd.Series(["y"]))
+        self.assertEqual(
+            [
+                ["skipped", "Bank1", "s", 1, "s"],
+                ["unmatched", "Bank1", "", 1, "y"],
+            ],
+            self._diagnostics.counts().values.tolist(),
+        )
+
+    def test_empty(self):
+        self._diagnostics.record(UNMATCHED, "Bank1", pd.Series([], dtype=object))
+        counts = self._diagnostics.counts()
+        self.assertEqual(
+            ["kind", "processor", "identifier", "rows", "samples"],
+            list(counts.columns),
+        )
+        self.assertEqual(0, len(counts))
+
+
+class TestCounts(BaseDiagnosticsTest):
+    def test_order(self):
+        self._diagnostics.record(
+            CONFLICTING, "Bank1", pd.Series(["a b"]), pd.Series(["a, b"])
+        )
+        self._diagnostics.record(UNMATCHED, "Bank2", pd.Series(["x"]))
+        self._diagnostics.record(UNMATCHED, "Bank1", pd.Series(["y", "z"]))
+        self._diagnostics.record(SKIPPED, "Bank1", pd.Series(["s"]), pd.Series(["s"]))
+        counts = self._diagnostics.counts()
+        self.assertEqual(
+            ["skipped", "unmatched", "unmatched", "conflicting"],
+            counts["kind"].tolist(),
+        )
+        self.assertEqual(
+            ["Bank1", "Bank1", "Bank2", "Bank1"], counts["processor"].tolist()
+        )
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from engine.manifest import FILTER, INDEX, READ, SKIP, Manifest, file_hash
+
+JANUARY = (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-31 23:59:59"))
+
+
+class BaseManifestTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self._dir = tmp_dir.name
+        self._manifest_path = os.path.join(self._dir, "index", "manifest.json")
+        self._manifest = Manifest(self._manifest_path)
+
+    def _write(self, filename: str, content: str) -> str:
+        file_path = os.path.join(self._dir, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+    def _record(self, filename: str, dates: list[str]) -> str:
+        file_path = self._write(filename, ",".join(map(str, dates)))
+        self._manifest.record(
+            file_path,
+            pd.DataFrame({"date": pd.to_datetime(dates)}),
+            "Checking",
+            "boa_debit",
+        )
+        return file_path
+
+
+class TestPlan(BaseManifestTest):
+    def test_not_indexed(self):
+        self.assertEqual(INDEX, self._manifest.plan(self._write("a.csv", ""), JANUARY))
+
+    def test_overlap(self):
+        inside = self._record("inside.csv", ["2024-01-02", "2024-01-30"])
+        partial = self._record("partial.csv", ["2023-12-20", "2024-01-05"])
+        outside = self._record("outside.csv", ["2024-02-01", "2024-02-10"])
+        empty = self._record("empty.csv", [])
+        self.assertEqual(READ, self._manifest.plan(inside, JANUARY))
+        self.assertEqual(FILTER, self._manifest.plan(partial, JANUARY))
+        self.assertEqual(SKIP, self._manifest.plan(outside, JANUARY))
+        self.assertEqual(SKIP, self._manifest.plan(empty, JANUARY))
+
+    def test_changed_file(self):
+        file_path = self._record("a.csv", ["2024-02-01"])
+        self._write("a.csv", "new contents")
+        self.assertEqual(INDEX, self._manifest.plan(file_path, JANUARY))
+
+    def test_touched_file(self):
+        file_path = self._record("a.csv", ["2024-02-01"])
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(SKIP, self._manifest.plan(file_path, JANUARY))
+        self.assertEqual(
+            stat.st_mtime_ns + 10**9, self._manifest.lookup(file_path)["mtime_ns"]
+        )
+
+
+class TestSave(BaseManifestTest):
+    def test_round_trip(self):
+        file_path = self._record("a.csv", ["2024-01-02", None, "2024-01-09"])
+        self._manifest.save()
+        entry = Manifest(self._manifest_path).lookup(file_path)
+        self.assertEqual(
+            {
+                "hash": file_hash(file_path),
+                "rows": 3,
+                "min_date": "2024-01-02T00:00:00",
+                "max_date": "2024-01-09T00:00:00",
+                "account_name": "Checking",
+                "file_format": "boa_debit",
+            },
+            {
+                key: value
+                for key, value in entry.items()
+                if key not in ["size", "mtime_ns"]
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+
+import numpy as np
+
+from engine.matcher import (
+    IdentifierMatcher,
+    ShardedIdentifierMatcher,
+    byte_ngram_codes,
+    create_matcher,
+)
+
+
+class BaseMatcherTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        letters = list("abcdefgh é#")
+        self._identifiers = list(
+            dict.fromkeys(
+                ["netflix", "netflix dvd", "atm", "", "café"]
+                + ["".join(rng.choice(letters, rng.integers(1, 9))) for _ in range(200)]
+            )
+        )
+        self._descriptions = [
+            "netflix dvd 1234",
+            "atm withdrawal",
+            "café du monde",
+            "",
+        ] + ["".join(rng.choice(letters, rng.integers(0, 30))) for _ in range(300)]
+
+    def expected_matches(self):
+        return [
+            (row, identifier_id)
+            for row, description in enumerate(self._descriptions)
+            for identifier_id, identifier in enumerate(self._identifiers)
+            if identifier in description
+        ]
+
+    def as_pairs(self, matches):
+        return list(zip(matches["row"], matches["identifier_id"]))
+
+
+class TestIdentifierMatcher(BaseMatcherTest):
+    def test_matches_substring_check(self):
+        matcher = IdentifierMatcher(self._identifiers)
+        self.assertEqual(
+            self.expected_matches(), self.as_pairs(matcher.match(self._descriptions))
+        )
+
+    def test_nested_identifiers(self):
+        matcher = IdentifierMatcher(["netflix", "netflix dvd", "dvd"])
+        self.assertEqual(
+            [(0, 0), (0, 1), (0, 2), (1, 0)],
+            self.as_pairs(matcher.match(["netflix dvd", "netflix"])),
+        )
+
+    def test_no_descriptions(self):
+        matches = IdentifierMatcher(self._identifiers).match([])
+        self.assertEqual(["row", "identifier_id"], list(matches.columns))
+        self.assertEqual(0, len(matches))
+
+    def test_no_identifiers(self):
+        self.assertEqual(0, len(IdentifierMatcher([]).match(self._descriptions)))
+
+
+class TestShardedIdentifierMatcher(BaseMatcherTest):
+    def test_same_as_single_process(self):
+        matcher = ShardedIdentifierMatcher(self._identifiers, 3)
+        try:
+            self.assertEqual(
+                self.expected_matches(),
+                self.as_pairs(matcher.match(self._descriptions)),
+            )
+            # The workers keep their shards between calls
+            self._descriptions = self._descriptions[:1]
+            self.assertEqual(
+                self.expected_matches(),
+                self.as_pairs(matcher.match(self._descriptions)),
+            )
+        finally:
+            matcher.close()
+
+    def test_more_shards_than_identifiers(self):
+        matcher = ShardedIdentifierMatcher(["netflix", "dvd"], 3)
+        try:
+            self.assertEqual(
+                [(0, 0), (0, 1)], self.as_pairs(matcher.match(["netflix dvd"]))
+            )
+        finally:
+            matcher.close()
+
+
+class TestCreateMatcher(unittest.TestCase):
+    def test_single_shard(self):
+        self.assertIsInstance(create_matcher(["a"], 1), IdentifierMatcher)
+
+    def test_multiple_shards(self):
+        matcher = create_matcher(["a"], 2, min_shard_identifiers=1)
+        matcher.close()
+        self.assertIsInstance(matcher, ShardedIdentifierMatcher)
+
+    def test_too_few_identifiers_to_shard(self):
+        self.assertIsInstance(
+            create_matcher(["a"], 2, min_shard_identifiers=2), IdentifierMatcher
+        )
+
+
+class TestByteNgramCodes(unittest.TestCase):
+    def test_codes(self):
+        codes, valid = byte_ngram_codes([b"abc", b"a"], 2)
+        self.assertEqual((2, 2), codes.shape)
+        self.assertEqual(
+            [ord("a") << 8 | ord("b"), ord("b") << 8 | ord("c")], codes[0].tolist()
+        )
+        self.assertEqual([[True, True], [False, False]], valid.tolist())
@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from engine import money
+
+
+class TestParseCents(unittest.TestCase):
+    def test_expected(self):
+        amounts = pd.Series(["1,234.56", "-0.5", "$12", "(3.00)", " 7 ", ".25", "+4.1"])
+        self.assertEqual(
+            [123456, -50, 1200, -300, 700, 25, 410],
+            money.parse_cents(amounts).tolist(),
+        )
+
+    def test_same_as_pattern_for_every_shape(self):
+        # Plain amounts are parsed with integer math, the others with _AMOUNT_PATTERN
+        amounts = [
+            "12",
+            "12.",
+            "-12.3",
+            "0012.30",
+            "1,2,3",
+            "-1,234.56",
+            "-.5",
+            "5.,",
+            "1.005",
+            "12345678901234.99",
+            "123456789012345.99",
+        ]
+        self.assertEqual(
+            money._parse_unique_cents(pd.Series(amounts, dtype="string")).tolist(),
+            money.parse_cents(pd.Series(amounts)).tolist(),
+        )
+
+    def test_missing(self):
+        result = money.parse_cents(pd.Series([None, "", np.nan, "1.00"]))
+        self.assertEqual("Int64", result.dtype)
+        self.assertEqual([True, True, True, False], result.isna().tolist())
+
+    def test_rounds_half_away_from_zero(self):
+        amounts = pd.Series(["0.125", "-0.125", "0.124"])
+        self.assertEqual([13, -13, 12], money.parse_cents(amounts).tolist())
+
+    def test_numeric(self):
+        amounts = pd.Series([1.1, -2.5])
+        self.assertEqual([110, -250], money.parse_cents(amounts).tolist())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            money.parse_cents(pd.Series(["1.00", "abc"]))
+        with self.assertRaises(ValueError):
+            money.parse_cents(pd.Series(["1.2.3"]))
+        with self.assertRaises(ValueError):
+            money.parse_cents(pd.Series(["(1.00"]))
+
+
+class TestToCents(unittest.TestCase):
+    def test_expected(self):
+        amounts = pd.Series([0.1, 0.2, -1234.56, None])
+        self.assertEqual(
+            [10, 20, -123456, pd.NA],
+            money.to_cents(amounts).tolist(),
+        )
+
+
+class TestToDollars(unittest.TestCase):
+    def test_expected(self):
+        cents = pd.Series([10, -123456, pd.NA], dtype="Int64")
+        result = money.to_dollars(cents)
+        self.assertEqual("float64", result.dtype)
+        self.assertEqual([0.1, -1234.56], result[:2].tolist())
+        self.assertTrue(np.isnan(result[2]))
+
+
+class TestFormatCents(unittest.TestCase):
+    def test_expected(self):
+        self.assertEqual("1234.56", money.format_cents(123456))
+        self.assertEqual("-0.05", money.format_cents(-5))
+        self.assertEqual("0.00", money.format_cents(0))
@@ -0,0 +1,65 @@
+import unittest
+
+import pandas as pd
+
+from engine.normalizer import DescriptionNormalizer
+
+
+class BaseNormalizerTest(unittest.TestCase):
+    def setUp(self):
+        self._normalizer = DescriptionNormalizer(
+            [
+                (r"#\d+", " "),
+                (r"\b[a-z]*\d[a-z\d]*\b", " "),
+                (r"(pmts)\S*", r"\1"),
+            ]
+        )
+
+    def _normalize(self, descriptions: list) -> list:
+        codes, uniques = pd.factorize(pd.Series(descriptions, dtype="string"))
+        codes, uniques = self._normalizer.normalize(codes, uniques)
+        return [uniques[code] if code >= 0 else None for code in codes]
+
+
+class TestNormalize(BaseNormalizerTest):
+    def test_rewrites_in_order(self):
+        self.assertEqual(
+            [
+                "amazon mktplace pmts",
+                "amazon mktplace pmts",
+                "whole foods",
+                "whole foods",
+            ],
+            self._normalize(
+                [
+                    "amazon mktplace pmts 1a2b3c",
+                    "amazon mktplace pmts*9z8y",
+                    "whole foods #10234",
+                    "whole foods   #998 0314",
+                ]
+            ),
+        )
+
+    def test_applies_rewrites_one_after_another(self):
+        normalizer = DescriptionNormalizer([("ab", ""), ("ac", "")])
+        codes, uniques = normalizer.normalize(
+            pd.factorize(pd.Series(["aabc"]))[0], pd.Index(["aabc"])
+        )
+        self.assertEqual([""], uniques[codes].tolist())
+
+    def test_missing_descriptions(self):
+        self.assertEqual([None, "shop", None], self._normalize([None, "shop 12", None]))
+        self.assertEqual([None], self._normalize([None]))
+
+    def test_distinct_counts(self):
+        self._normalize(["shop #1", "shop #2"])
+        self._normalize(["shop #2", "shop #3", "cafe"])
+        self.assertEqual((4, 2), self._normalizer.distinct_counts())
+
+    def test_invalid_pattern(self):
+        with self.assertRaises(ValueError):
+            DescriptionNormalizer([("(unclosed", " ")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,48 @@
+import hashlib
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
 import pandas as pd
 
-from engine.parser import BOADebitParser, ChaseCreditParser
+from engine.parser import (
+    BOADebitParser,
+    ChaseCreditParser,
+    ChaseDebitParser,
+    CitiCreditParser,
+    find_row_offset,
+)
+from engine.manifest import file_hash
+
+CHASE_CREDIT_CONTENT = """Transaction Date,Post Date,Description,Category,Type,Amount,Memo
+01/03/2024,01/04/2024,GROCERY STORE,Groceries,Sale,-120.50,
+01/06/2024,01/07/2024,PAYMENT THANK YOU,,Payment,250.00,
+"""
+
+CITI_CREDIT_CONTENT = """Status,Date,Description,Debit,Credit
+Cleared,01/03/2024,GROCERY STORE,120.50,
+Cleared,01/06/2024,PAYMENT,,-250.00
+"""
 
 
 class BaseParserTest(unittest.TestCase):
     def setUp(self):
         pass
 
+    def _write(self, content: str) -> str:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        file_path = os.path.join(tmp_dir.name, "statement.csv")
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+
+class TestEngine(BaseParserTest):
+    def test_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            ChaseCreditParser("python")
+
 
 class BOADebitParserTest(BaseParserTest):
     def setUp(self):
@@ -18,6 +53,160 @@ class BOADebitParserTest(BaseParserTest):
         df = self._parser._rename_columns(df)
         self.assertEqual(df.columns[0], "date")
 
+    def test_matches_header(self):
+        lines = [
+            "Description,,Summary Amt.",
+            "Beginning balance,,1.00",
+            "Total credits,,1.00",
+            "Total debits,,1.00",
+            "Ending balance,,1.00",
+            "Date,Description,Amount,Running Bal.",
+        ]
+        self.assertTrue(self._parser.matches_header(lines))
+        self.assertFalse(self._parser.matches_header(lines[:5]))
+        self.assertFalse(self._parser.matches_header(lines[5:]))
+
+    def test_parse_thousands_separator(self):
+        content = "\n".join(
+            [
+                "Description,,Summary Amt.",
+                'Beginning balance,,"1,000.00"',
+                'Total credits,,"5,000.00"',
+                'Total debits,,"-250.00"',
+                'Ending balance,,"5,750.00"',
+                "",
+                "Date,Description,Amount,Running Bal.",
+                '01/01/2024,Beginning balance,,"1,000.00"',
+                '01/02/2024,PAYROLL,"5,000.10","6,000.10"',
+            ]
+        )
+        df = self._parser.parse_and_normalize_column_names(self._write(content))
+        self.assertTrue(pd.isna(df["amount_cents"][0]))
+        self.assertEqual(500010, df["amount_cents"][1])
+        self.assertEqual(5000.10, df["amount"][1])
+
+
+class TestHeaderRow(BaseParserTest):
+    BOA_DEBIT_CONTENT = "\n".join(
+        [
+            "Description,,Summary Amt.",
+            'Beginning balance,,"1,000.00"',
+            'Total credits,,"5,000.00"',
+            'Total debits,,"-250.00"',
+            'Ending balance,,"5,750.00"',
+            "",
+            "Date,Description,Amount,Running Bal.",
+            '01/01/2024,Beginning balance,,"1,000.00"',
+            '01/02/2024,PAYROLL,"5,000.10","6,000.10"',
+        ]
+    )
+
+    def test_find_row_offset(self):
+        content = b"a\r\n\n  \r\nb\nheader\nrow"
+        self.assertEqual(0, find_row_offset(content, 0))
+        self.assertEqual(content.index(b"b"), find_row_offset(content, 1))
+        self.assertEqual(content.index(b"header"), find_row_offset(content, 2))
+        self.assertEqual(len(content), find_row_offset(content, 10))
+
+    def test_preamble(self):
+        df = BOADebitParser().parse_and_normalize_column_names(
+            self._write(self.BOA_DEBIT_CONTENT)
+        )
+        self.assertEqual(["Beginning balance", "PAYROLL"], df["description"].tolist())
+
+    def test_preamble_longer_than_sniff(self):
+        file_path = self._write(self.BOA_DEBIT_CONTENT)
+        expected = BOADebitParser().parse_and_normalize_column_names(file_path)
+        with patch("engine.parser.SNIFF_BYTES", 8):
+            df = BOADebitParser().parse_and_normalize_column_names(file_path)
+        pd.testing.assert_frame_equal(expected, df)
+
+    def test_pyarrow_engine(self):
+        file_path = self._write(self.BOA_DEBIT_CONTENT)
+        expected = BOADebitParser().parse_and_normalize_column_names(file_path)
+        df = BOADebitParser("pyarrow").parse_and_normalize_column_names(file_path)
+        self.assertEqual(expected["amount_cents"].tolist(), df["amount_cents"].tolist())
+        self.assertEqual(expected["description"].tolist(), df["description"].tolist())
+
+    def test_whitespace_before_header(self):
+        file_path = self._write(self.BOA_DEBIT_CONTENT.replace("\n\n", "\n   \n"))
+        expected = BOADebitParser().parse_and_normalize_column_names(file_path)
+        df = BOADebitParser("pyarrow").parse_and_normalize_column_names(file_path)
+        self.assertEqual(expected["amount_cents"].tolist(), df["amount_cents"].tolist())
+
+    def test_empty_file(self):
+        with self.assertRaises(pd.errors.EmptyDataError):
+            ChaseCreditParser().parse_and_normalize_column_names(self._write(""))
+
+
+class TestDateRange(BaseParserTest):
+    DATE_RANGE = (pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-05"))
+    CONTENT = "\n".join(
+        ["Transaction Date,Post Date,Description,Category,Type,Amount,Memo"]
+        + [f"01/0{day}/2024,,SHOP {day},,Sale,-{day}.00," for day in range(1, 8)]
+    )
+
+    def test_keeps_rows_in_range(self):
+        df = ChaseCreditParser().parse_and_normalize_column_names(
+            self._write(self.CONTENT), self.DATE_RANGE
+        )
+        self.assertEqual(
+            ["SHOP 2", "SHOP 3", "SHOP 4", "SHOP 5"], df["description"].tolist()
+        )
+        self.assertEqual([-200, -300, -400, -500], df["amount_cents"].tolist())
+        self.assertEqual(list(range(4)), df.index.tolist())
+
+    def test_chunks(self):
+        file_path = self._write(self.CONTENT)
+        expected = ChaseCreditParser().parse_and_normalize_column_names(
+            file_path, self.DATE_RANGE
+        )
+        with patch("engine.parser.CHUNK_ROWS", 2):
+            pd.testing.assert_frame_equal(
+                expected,
+                ChaseCreditParser().parse_and_normalize_column_names(
+                    file_path, self.DATE_RANGE
+                ),
+            )
+
+    def test_no_rows_in_range(self):
+        df = ChaseCreditParser().parse_and_normalize_column_names(
+            self._write(self.CONTENT),
+            (pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-31")),
+        )
+        self.assertTrue(df.empty)
+        self.assertEqual("datetime64[ns]", df["date"].dtype)
+
+    def test_pyarrow_engine(self):
+        df = ChaseCreditParser("pyarrow").parse_and_normalize_column_names(
+            self._write(self.CONTENT), self.DATE_RANGE
+        )
+        self.assertEqual([-200, -300, -400, -500], df["amount_cents"].tolist())
+
+
+class TestOnRead(BaseParserTest):
+    def _assert_hashes_file(self, parser, date_range=None) -> None:
+        file_path = self._write(TestHeaderRow.BOA_DEBIT_CONTENT)
+        digest = hashlib.sha256()
+        df = parser.parse_and_normalize_column_names(
+            file_path, date_range, digest.update
+        )
+        self.assertEqual(file_hash(file_path), digest.hexdigest())
+        pd.testing.assert_frame_equal(
+            parser.parse_and_normalize_column_names(file_path, date_range), df
+        )
+
+    def test_buffered_read(self):
+        self._assert_hashes_file(BOADebitParser())
+
+    def test_date_range(self):
+        self._assert_hashes_file(
+            BOADebitParser(), (pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-02"))
+        )
+
+    def test_pyarrow_engine(self):
+        self._assert_hashes_file(BOADebitParser("pyarrow"))
+
 
 class ChaseCreditParserTest(BaseParserTest):
     def setUp(self):
@@ -27,3 +216,52 @@ class ChaseCreditParserTest(BaseParserTest):
         df = pd.DataFrame({"Transaction Date": ["2023-01-01"]})
         df = self._parser._rename_columns(df)
         self.assertEqual(df.columns[0], "date")
+
+    def test_matches_header(self):
+        self.assertTrue(
+            self._parser.matches_header(
+                ["Transaction Date,Post Date,Description,Category,Type,Amount,Memo"]
+            )
+        )
+        self.assertFalse(
+            self._parser.matches_header(["Status,Date,Description,Debit,Credit"])
+        )
+
+    def test_parse_prunes_unused_columns(self):
+        df = self._parser.parse_and_normalize_column_names(
+            self._write(CHASE_CREDIT_CONTENT)
+        )
+        self.assertEqual(
+            ["date", "description", "amount", "amount_cents"], df.columns.tolist()
+        )
+        self.assertEqual([-120.50, 250.00], df["amount"].tolist())
+        self.assertEqual([-12050, 25000], df["amount_cents"].tolist())
+        self.assertEqual("datetime64[ns]", df["date"].dtype)
+
+    def test_pyarrow_engine(self):
+        file_path = self._write(CHASE_CREDIT_CONTENT)
+        expected = self._parser.parse_and_normalize_column_names(file_path)
+        df = ChaseCreditParser("pyarrow").parse_and_normalize_column_names(file_path)
+        self.assertEqual("string[pyarrow]", df["description"].dtype)
+        self.assertEqual(expected["description"].tolist(), df["description"].tolist())
+        self.assertEqual(expected["amount_cents"].tolist(), df["amount_cents"].tolist())
+
+
+class CitiCreditParserTest(BaseParserTest):
+    def setUp(self):
+        self._parser = CitiCreditParser()
+
+    def test_parse_flips_amount(self):
+        df = self._parser.parse_and_normalize_column_names(
+            self._write(CITI_CREDIT_CONTENT)
+        )
+        self.assertEqual([-120.50, 250.00], df["amount"].tolist())
+        self.assertEqual([-12050, 25000], df["amount_cents"].tolist())
+
+
+class ChaseDebitParserTest(BaseParserTest):
+    def test_parse_unsupported(self):
+        with self.assertRaisesRegex(ValueError, "chase_debit"):
+            ChaseDebitParser().parse_and_normalize_column_names(
+                self._write(CHASE_CREDIT_CONTENT)
+            )
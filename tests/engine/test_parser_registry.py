@@ -0,0 +1,131 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from engine.parser import (
+    BOADebitParser,
+    ChaseCreditParser,
+    ChaseDebitParser,
+    CitiCreditParser,
+)
+from engine.parser_registry import AutoDetectParser, ParserRegistry
+
+BOA_DEBIT_CONTENT = """Description,,Summary Amt.
+Beginning balance as of 01/01/2024,,"1,000.00"
+Total credits,,"5,000.00"
+Total debits,,"-250.00"
+Ending balance as of 01/31/2024,,"5,750.00"
+
+Date,Description,Amount,Running Bal.
+01/02/2024,PAYROLL,"5,000.00","6,000.00"
+01/05/2024,AUTOPAY,-250.00,"5,750.00"
+"""
+
+CHASE_CREDIT_CONTENT = """Transaction Date,Post Date,Description,Category,Type,Amount,Memo
+01/03/2024,01/04/2024,GROCERY STORE,Groceries,Sale,-120.50,
+"""
+
+CITI_CREDIT_CONTENT = """Status,Date,Description,Debit,Credit
+Cleared,01/03/2024,GROCERY STORE,120.50,
+"""
+
+
+class BaseParserRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._registry = ParserRegistry(
+            [BOADebitParser(), ChaseCreditParser(), CitiCreditParser()]
+        )
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _write(self, filename: str, content: str) -> str:
+        file_path = os.path.join(self._tmp_dir.name, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+
+class TestRegister(BaseParserRegistryTest):
+    def test_duplicate_format(self):
+        with self.assertRaises(ValueError):
+            self._registry.register(BOADebitParser())
+
+    def test_parser_by_format(self):
+        parser_by_format = self._registry.parser_by_format()
+        self.assertEqual(
+            ["boa_debit", "chase_credit", "citi_credit", "auto"],
+            list(parser_by_format),
+        )
+        self.assertIsInstance(parser_by_format["auto"], AutoDetectParser)
+
+
+class TestDetect(BaseParserRegistryTest):
+    def test_boa_debit(self):
+        file_path = self._write("a.csv", BOA_DEBIT_CONTENT)
+        self.assertIsInstance(self._registry.detect(file_path), BOADebitParser)
+
+    def test_chase_credit(self):
+        file_path = self._write("a.csv", CHASE_CREDIT_CONTENT)
+        self.assertIsInstance(self._registry.detect(file_path), ChaseCreditParser)
+
+    def test_citi_credit(self):
+        file_path = self._write("a.csv", CITI_CREDIT_CONTENT)
+        self.assertIsInstance(self._registry.detect(file_path), CitiCreditParser)
+
+    def test_unknown(self):
+        file_path = self._write("a.csv", "some,other,columns\n1,2,3\n")
+        self.assertIsNone(self._registry.detect(file_path))
+
+    def test_chase_debit_never_detected(self):
+        self._registry.register(ChaseDebitParser())
+        file_path = self._write("a.csv", "some,other,columns\n1,2,3\n")
+        self.assertIsNone(self._registry.detect(file_path))
+        file_path = self._write("b.csv", CHASE_CREDIT_CONTENT)
+        self.assertIsInstance(self._registry.detect(file_path), ChaseCreditParser)
+
+    def test_cached_per_fingerprint(self):
+        file_path = self._write("a.csv", CHASE_CREDIT_CONTENT)
+        self._registry.detect(file_path)
+        self.assertEqual(1, len(self._registry._format_by_fingerprint))
+        self._registry.detect(file_path)
+        self.assertEqual(1, len(self._registry._format_by_fingerprint))
+
+        self._write("a.csv", CITI_CREDIT_CONTENT + "Cleared,01/04/2024,X,1.00,\n")
+        self.assertIsInstance(self._registry.detect(file_path), CitiCreditParser)
+
+
+class TestAutoDetectParser(BaseParserRegistryTest):
+    def test_parses_with_detected_parser(self):
+        file_path = self._write("a.csv", BOA_DEBIT_CONTENT)
+        parser = self._registry.parser_by_format()["auto"]
+        df = parser.parse_and_normalize_column_names(file_path)
+        self.assertEqual(["PAYROLL", "AUTOPAY"], df["description"].tolist())
+        self.assertEqual([5000.0, -250.0], df["amount"].tolist())
+
+    def test_date_range(self):
+        file_path = self._write("a.csv", BOA_DEBIT_CONTENT)
+        parser = self._registry.parser_by_format()["auto"]
+        df = parser.parse_and_normalize_column_names(
+            file_path, (pd.Timestamp("2024-01-03"), pd.Timestamp("2024-01-31"))
+        )
+        self.assertEqual(["AUTOPAY"], df["description"].tolist())
+
+    def test_undetectable(self):
+        file_path = self._write("a.csv", "some,other,columns\n1,2,3\n")
+        parser = self._registry.parser_by_format()["auto"]
+        with self.assertRaises(ValueError):
+            parser.parse_and_normalize_column_names(file_path)
+        with self.assertRaises(ValueError):
+            parser.file_format(file_path)
+
+    def test_file_format(self):
+        file_path = self._write("a.csv", CHASE_CREDIT_CONTENT)
+        parser = self._registry.parser_by_format()["auto"]
+        self.assertEqual(ChaseCreditParser.FILE_FORMAT, parser.file_format(file_path))
+        self.assertEqual(
+            ChaseCreditParser.FILE_FORMAT, ChaseCreditParser().file_format(file_path)
+        )
@@ -0,0 +1,67 @@
+import threading
+import unittest
+
+from engine.prefetcher import prefetch
+
+
+class TestPrefetch(unittest.TestCase):
+    def test_keeps_order(self):
+        for depth in [0, 1, 3]:
+            self.assertEqual(
+                [(i, i * i) for i in range(10)],
+                list(prefetch(lambda i: i * i, range(10), depth)),
+            )
+
+    def test_serial_without_depth(self):
+        threads = set()
+        list(prefetch(lambda i: threads.add(threading.get_ident()), range(3), 0))
+        self.assertEqual({threading.get_ident()}, threads)
+
+    def test_bounded_lookahead(self):
+        started = []
+        lock = threading.Lock()
+
+        def compute(i):
+            with lock:
+                started.append(i)
+            return i
+
+        for i, _ in prefetch(compute, range(10), 2):
+            # Items are submitted before the caller reaches them, at most depth ahead
+            self.assertLessEqual(max(started), i + 2)
+            self.assertIn(i, started)
+
+    def test_raises_at_item(self):
+        def compute(i):
+            if i == 2:
+                raise ValueError(i)
+            return i
+
+        results = []
+        with self.assertRaises(ValueError):
+            for item, _ in prefetch(compute, range(5), 2):
+                results.append(item)
+        self.assertEqual([0, 1], results)
+
+    def test_stops_early(self):
+        release = threading.Event()
+
+        def compute(i):
+            if i > 0:
+                release.wait()
+            return i
+
+        results = prefetch(compute, range(5), 2)
+        self.assertEqual((0, 0), next(results))
+        release.set()
+        results.close()
+        self.assertFalse(
+            any(
+                thread.name.startswith("ThreadPoolExecutor")
+                for thread in threading.enumerate()
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
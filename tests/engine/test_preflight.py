@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+
+from engine.parser import BOADebitParser, ChaseCreditParser, CitiCreditParser
+from engine.parser_registry import ParserRegistry
+from engine.preflight import find_problems, preflight
+from engine.processor import Processor
+from engine.router import ProcessorRouter
+
+CHASE_CREDIT_CONTENT = """Transaction Date,Post Date,Description,Category,Type,Amount,Memo
+01/03/2024,01/04/2024,GROCERY STORE,Groceries,Sale,-120.50,
+"""
+
+CITI_CREDIT_CONTENT = """Status,Date,Description,Debit,Credit
+Cleared,01/03/2024,GROCERY STORE,120.50,
+"""
+
+
+def make_processor(name: str, file_prefix: str, parser) -> Processor:
+    return Processor(
+        name=name,
+        file_prefix=file_prefix,
+        parser=parser,
+        skip_transactions=[],
+        type_category_by_identifier={},
+    )
+
+
+class BasePreflightTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self._dir = tmp_dir.name
+        registry = ParserRegistry(
+            [BOADebitParser(), ChaseCreditParser(), CitiCreditParser()]
+        )
+        self._router = ProcessorRouter(
+            [
+                make_processor("Chase", "chase", ChaseCreditParser()),
+                make_processor("Any", "any", registry.parser_by_format()["auto"]),
+            ]
+        )
+        self._nickname_by_filename = {}
+
+    def _write(self, filename: str, content: str, nickname: str | None = "Card"):
+        with open(os.path.join(self._dir, filename), "w") as f:
+            f.write(content)
+        if nickname is not None:
+            self._nickname_by_filename[filename] = nickname
+
+    def _find_problems(self) -> list[str]:
+        return find_problems(
+            self._dir,
+            os.listdir(self._dir),
+            self._router,
+            self._nickname_by_filename,
+        )
+
+
+class TestFindProblems(BasePreflightTest):
+    def test_valid(self):
+        self._write("chase_jan.csv", CHASE_CREDIT_CONTENT)
+        self._write("any_jan.csv", CITI_CREDIT_CONTENT)
+        self.assertEqual([], self._find_problems())
+
+    def test_reports_every_problem(self):
+        self._write("chase_jan.csv", CHASE_CREDIT_CONTENT, nickname=None)
+        self._write("chase_feb.csv", CITI_CREDIT_CONTENT)
+        self._write("chase_mar.csv", "")
+        self._write("any_jan.csv", "some,other,columns\n1,2,3\n")
+        self._write("notes.txt", "hello")
+        self.assertEqual(
+            [
+                "any_jan.csv: the header doesn't match the auto format of processor Any",
+                "chase_feb.csv: the header doesn't match the chase_credit format of processor Chase",
+                "chase_jan.csv: does not have a nickname in the config file",
+                "chase_mar.csv: is empty",
+                "notes.txt: no processor prefix matches the file",
+            ],
+            self._find_problems(),
+        )
+
+
+class TestPreflight(BasePreflightTest):
+    def test_raises_with_every_problem(self):
+        self._write("chase_jan.csv", CHASE_CREDIT_CONTENT, nickname=None)
+        self._write("notes.txt", "hello")
+        with self.assertRaises(ValueError) as context:
+            preflight(
+                self._dir, os.listdir(self._dir), self._router, {"notes.txt": "x"}
+            )
+        self.assertIn("2 problem(s)", str(context.exception))
+        self.assertIn("chase_jan.csv", str(context.exception))
+        self.assertIn("notes.txt", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
 import pandas as pd
+from engine.conditions import Conditions
+from engine.diagnostics import Diagnostics
+from engine.normalizer import DescriptionNormalizer
 from engine.processor import Processor
 from engine.type import Type
 
@@ -103,6 +106,217 @@ class TestCategorize(BaseProcessorTest):
         result = self._processor1.categorize(df)
         self.assertEqual(len(result), 0)
 
+    def test_nan_description(self):
+        df = pd.DataFrame({"description": [None, "payment_company_2"]})
+        result = self._processor1.categorize(df)
+        self.assertEqual(result["type"].tolist(), [Type.NO_TYPE, "income"])
+
+    def test_keeps_index(self):
+        df = pd.DataFrame({"description": ["volunteer 1", "nothing"]}, index=[10, 20])
+        result = self._processor1.categorize(df)
+        self.assertEqual(result.index.tolist(), [10, 20])
+        self.assertEqual(result["category"].tolist(), ["non profit 1", "no category"])
+
+
+class TestDiagnostics(BaseProcessorTest):
+    def setUp(self):
+        super().setUp()
+        self._diagnostics = Diagnostics()
+        self._processor = Processor(
+            name="Bank1 Debit",
+            file_prefix="bank1_debit",
+            parser="mock_parser1",
+            skip_transactions=["auto pay", "transfer"],
+            type_category_by_identifier=self._processor1._type_category_by_identifier,
+            diagnostics=self._diagnostics,
+        )
+
+    def test_skipped(self):
+        df = pd.DataFrame(
+            {"description": ["Auto Pay 1", "auto pay transfer", "Transfer", "rent"]}
+        )
+        result = self._processor.remove_skipped_transactions(df)
+        self.assertEqual(result["description"].tolist(), ["rent"])
+        self.assertEqual(
+            [
+                ["skipped", "Bank1 Debit", "auto pay", 2],
+                ["skipped", "Bank1 Debit", "transfer", 1],
+            ],
+            self._diagnostics.counts()[
+                ["kind", "processor", "identifier", "rows"]
+            ].values.tolist(),
+        )
+
+    def test_unmatched_without_logging(self):
+        df = pd.DataFrame({"description": ["nothing", "Nothing", "volunteer 1"]})
+        with self.assertNoLogs("engine.processor", level="DEBUG"):
+            self._processor.categorize(df)
+        self.assertEqual(
+            [["unmatched", "Bank1 Debit", "", 2, "nothing | Nothing"]],
+            self._diagnostics.counts().values.tolist(),
+        )
+
+    def test_conflicting(self):
+        df = pd.DataFrame(
+            {
+                "description": [
+                    "payment_company_2 payment_company_1",
+                    "PAYMENT_COMPANY_1 PAYMENT_COMPANY_2",
+                ]
+            }
+        )
+        with self.assertRaises(ValueError), self.assertLogs("engine.processor"):
+            self._processor.categorize(df)
+        counts = self._diagnostics.counts()
+        self.assertEqual(["conflicting"], counts["kind"].tolist())
+        self.assertEqual(
+            ["payment_company_1, payment_company_2"], counts["identifier"].tolist()
+        )
+        self.assertEqual([2], counts["rows"].tolist())
+
+
+class TestConditionalRules(BaseProcessorTest):
+    def setUp(self):
+        super().setUp()
+        self._diagnostics = Diagnostics()
+        self._processor = Processor(
+            name="Bank1 Debit",
+            file_prefix="bank1_debit",
+            parser="mock_parser1",
+            skip_transactions=["auto pay"],
+            type_category_by_identifier={"venmo": (Type.INCOME, "misc")},
+            diagnostics=self._diagnostics,
+            conditional_skips=[("", Conditions(account_names=["Savings"]))],
+            conditional_categories=[
+                ("venmo", Conditions(min_amount_cents=100000), (Type.EXPENSE, "rent")),
+                (
+                    "",
+                    Conditions(min_amount_cents=500000, account_names=["Checking"]),
+                    (Type.EXPENSE, "big"),
+                ),
+            ],
+        )
+        self._df = pd.DataFrame(
+            {
+                "description": ["VENMO alice", "venmo bob", "interest", "wire", None],
+                "amount_cents": pd.array(
+                    [-150000, 2000, 300, -600000, -700000], dtype="Int64"
+                ),
+                "account_name": ["Checking", "Checking", "Savings", "Checking", "Card"],
+            }
+        )
+
+    def test_skip(self):
+        result = self._processor.remove_skipped_transactions(self._df)
+        self.assertEqual(
+            ["VENMO alice", "venmo bob", "wire", None],
+            result["description"].tolist(),
+        )
+
+    def test_categorize(self):
+        result = self._processor.categorize(self._df)
+        self.assertEqual(
+            ["rent", "misc", "no category", "big", "no category"],
+            result["category"].tolist(),
+        )
+        self.assertEqual(
+            [Type.EXPENSE, Type.INCOME, Type.NO_TYPE, Type.EXPENSE, Type.NO_TYPE],
+            result["type"].tolist(),
+        )
+
+    def test_conflict(self):
+        with self.assertRaises(ValueError), self.assertLogs("engine.processor"):
+            self._processor.categorize(self._df.assign(amount_cents=-600000))
+        self.assertEqual(["venmo, "], self._diagnostics.counts()["identifier"].tolist())
+
+    def test_fingerprint(self):
+        processor = Processor(
+            name="Bank1 Debit",
+            file_prefix="bank1_debit",
+            parser="mock_parser1",
+            skip_transactions=["auto pay"],
+            type_category_by_identifier={"venmo": (Type.INCOME, "misc")},
+        )
+        self.assertNotEqual(processor, self._processor)
+        self.assertNotEqual(processor.fingerprint(), self._processor.fingerprint())
+
+
+class TestNormalizer(BaseProcessorTest):
+    def setUp(self):
+        super().setUp()
+        self._processor = Processor(
+            name="Bank1 Debit",
+            file_prefix="bank1_debit",
+            parser="mock_parser1",
+            skip_transactions=["auto pay"],
+            type_category_by_identifier={"store 1": (Type.EXPENSE, "groceries")},
+            normalizer=DescriptionNormalizer([(r"#\d+", " ")]),
+        )
+
+    def test_matches_rewritten_descriptions(self):
+        df = pd.DataFrame(
+            {"description": ["AUTO #12 PAY", "Store #551 1", "store #98", None]}
+        )
+        result = self._processor.categorize(
+            self._processor.remove_skipped_transactions(df)
+        )
+        self.assertEqual(
+            ["Store #551 1", "store #98", None], result["description"].tolist()
+        )
+        self.assertEqual(
+            ["groceries", "no category", "no category"], result["category"].tolist()
+        )
+
+    def test_fingerprint(self):
+        processor = Processor(
+            name="Bank1 Debit",
+            file_prefix="bank1_debit",
+            parser="mock_parser1",
+            skip_transactions=["auto pay"],
+            type_category_by_identifier={"store 1": (Type.EXPENSE, "groceries")},
+        )
+        self.assertNotEqual(processor.fingerprint(), self._processor.fingerprint())
+
+
+class TestCategorizeSharded(BaseProcessorTest):
+    def setUp(self):
+        super().setUp()
+        self._sharded = Processor(
+            name="Bank1 Debit",
+            file_prefix="bank1_debit",
+            parser="mock_parser1",
+            skip_transactions=["auto pay"],
+            type_category_by_identifier=self._processor1._type_category_by_identifier,
+            num_shards=2,
+            min_shard_identifiers=0,
+        )
+
+    def tearDown(self):
+        self._sharded.close()
+
+    def test_same_as_single_process(self):
+        df = pd.DataFrame(
+            {
+                "description": [
+                    "Contains payment_company_1",
+                    "VOLUNTEER 1 at church",
+                    "nothing",
+                    "payment_company_2 transfer",
+                ]
+            }
+        )
+        pd.testing.assert_frame_equal(
+            self._processor1.categorize(df), self._sharded.categorize(df)
+        )
+
+    def test_conflict_across_shards(self):
+        # payment_company_1 and payment_company_2 are in different shards
+        df = pd.DataFrame(
+            {"description": ["Contains payment_company_1 and payment_company_2"]}
+        )
+        with self.assertRaises(ValueError):
+            self._sharded.categorize(df)
+
 
 class TestCategorizeRow(BaseProcessorTest):
 
@@ -0,0 +1,100 @@
+import unittest
+
+import pandas as pd
+
+from engine.recurring import COLUMNS, detect_recurring
+
+
+def transactions(
+    account_name: str, description: str, dates: list[str], amounts: list[float]
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "account_name": account_name,
+            "description": description,
+            "date": pd.to_datetime(dates),
+            "amount_cents": pd.array(
+                [round(amount * 100) for amount in amounts], dtype="Int64"
+            ),
+        }
+    )
+
+
+MONTHLY_DATES = ["2024-01-15", "2024-02-15", "2024-03-14", "2024-04-15", "2024-05-15"]
+
+
+class TestDetectRecurring(unittest.TestCase):
+    def test_monthly_subscription(self):
+        df = transactions(
+            "Card",
+            "NETFLIX.COM 866-579",
+            MONTHLY_DATES,
+            [-15.49, -15.49, -15.49, -15.99, -15.99],
+        )
+        recurring = detect_recurring(df)
+        self.assertEqual(COLUMNS, recurring.columns.tolist())
+        self.assertEqual(1, len(recurring))
+        row = recurring.iloc[0]
+        self.assertEqual("netflix com", row["merchant"])
+        self.assertEqual("monthly", row["period"])
+        self.assertEqual(5, row["occurrences"])
+        self.assertEqual(-15.49, row["amount"])
+        self.assertEqual(pd.Timestamp("2024-06-14"), row["next_date"])
+        self.assertEqual(1.0, row["regularity"])
+
+    def test_groups_by_account_and_amount_band(self):
+        df = pd.concat(
+            [
+                transactions("Checking", "PAYROLL", MONTHLY_DATES, [2000.0] * 5),
+                transactions("Savings", "PAYROLL", MONTHLY_DATES, [2000.0] * 5),
+                # A second, much larger payment from the same merchant
+                transactions("Checking", "PAYROLL", MONTHLY_DATES, [9000.0] * 5),
+            ],
+            ignore_index=True,
+        ).sample(frac=1, random_state=0)
+        recurring = detect_recurring(df)
+        self.assertEqual(
+            [("Checking", 9000.0), ("Checking", 2000.0), ("Savings", 2000.0)],
+            list(zip(recurring["account_name"], recurring["amount"])),
+        )
+
+    def test_periods(self):
+        weekly = pd.date_range("2024-01-01", periods=6, freq="7D").astype(str)
+        biweekly = pd.date_range("2024-01-05", periods=6, freq="14D").astype(str)
+        yearly = ["2021-03-01", "2022-03-01", "2023-03-02", "2024-03-01"]
+        df = pd.concat(
+            [
+                transactions("Card", "GYM", weekly, [-10.0] * 6),
+                transactions("Checking", "EMPLOYER", biweekly, [1500.0] * 6),
+                transactions("Card", "DOMAIN RENEWAL", yearly, [-20.0] * 4),
+            ],
+            ignore_index=True,
+        )
+        self.assertEqual(
+            {"gym": "weekly", "employer": "biweekly", "domain renewal": "yearly"},
+            dict(zip(*detect_recurring(df)[["merchant", "period"]].T.values)),
+        )
+
+    def test_irregular_and_rare(self):
+        df = pd.concat(
+            [
+                transactions(
+                    "Card",
+                    "WHOLE FOODS",
+                    ["2024-01-02", "2024-01-05", "2024-02-20", "2024-02-21"],
+                    [-50.0, -52.0, -48.0, -51.0],
+                ),
+                transactions("Card", "SPOTIFY", MONTHLY_DATES[:2], [-9.99] * 2),
+            ],
+            ignore_index=True,
+        )
+        self.assertTrue(detect_recurring(df).empty)
+
+    def test_empty(self):
+        recurring = detect_recurring(transactions("Card", "SHOP", [], []))
+        self.assertEqual(COLUMNS, recurring.columns.tolist())
+        self.assertTrue(recurring.empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from engine.report_cache import ReportCache, fingerprint
+
+
+class BaseReportCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self._dir = tmp_dir.name
+        self._cache_dir = os.path.join(self._dir, "cache")
+        self._cache = ReportCache(self._cache_dir, max_entries=2)
+
+    def _write(self, filename: str, content: str) -> str:
+        file_path = os.path.join(self._dir, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+
+class TestGetPut(BaseReportCacheTest):
+    def test_round_trip(self):
+        snapshot = {"line": 1.5, "no_type_rows": pd.DataFrame({"amount": [1.0]})}
+        self._cache.put("a", snapshot)
+        cached = self._cache.get("a")
+        self.assertEqual(1.5, cached["line"])
+        pd.testing.assert_frame_equal(snapshot["no_type_rows"], cached["no_type_rows"])
+
+    def test_miss(self):
+        self.assertIsNone(self._cache.get("a"))
+
+    def test_corrupt_entry(self):
+        os.makedirs(self._cache_dir)
+        self._write(os.path.join("cache", "a.pkl"), "not a pickle")
+        self.assertIsNone(self._cache.get("a"))
+
+    def test_evicts_least_recently_used(self):
+        self._cache.put("a", {"line": 1})
+        self._cache.put("b", {"line": 2})
+        # Reading "a" makes "b" the least recently used entry
+        os.utime(os.path.join(self._cache_dir, "b.pkl"), ns=(0, 0))
+        self._cache.get("a")
+        self._cache.put("c", {"line": 3})
+        self.assertEqual({"line": 1}, self._cache.get("a"))
+        self.assertIsNone(self._cache.get("b"))
+        self.assertEqual({"line": 3}, self._cache.get("c"))
+
+
+class TestFingerprint(BaseReportCacheTest):
+    def setUp(self):
+        super().setUp()
+        self._statement = self._write("statement.csv", "a,b")
+        self._config = self._write("config.json", "{}")
+        self._dataset = self._write("numbers.json", "{}")
+
+    def _fingerprint(self, **options) -> str:
+        return fingerprint(
+            [self._statement],
+            self._config,
+            [self._dataset],
+            {"household_size": 2, "percentile": 50, **options},
+        )
+
+    def test_stable(self):
+        self.assertEqual(self._fingerprint(), self._fingerprint())
+
+    def test_changes_with_inputs(self):
+        original = self._fingerprint()
+        self.assertNotEqual(original, self._fingerprint(percentile=51))
+        self._write("numbers.json", '{"changed": true}')
+        self.assertNotEqual(original, self._fingerprint())
+
+    def test_changes_with_statement_names(self):
+        renamed = self._write("renamed.csv", "a,b")
+        self.assertNotEqual(
+            self._fingerprint(),
+            fingerprint(
+                [renamed],
+                self._config,
+                [self._dataset],
+                {"household_size": 2, "percentile": 50},
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
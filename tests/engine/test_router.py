@@ -0,0 +1,79 @@
+import unittest
+
+from engine.processor import Processor
+from engine.router import ProcessorRouter
+
+
+def make_processor(name: str, file_prefix: str) -> Processor:
+    return Processor(
+        name=name,
+        file_prefix=file_prefix,
+        parser="mock_parser",
+        skip_transactions=[],
+        type_category_by_identifier={},
+    )
+
+
+class BaseRouterTest(unittest.TestCase):
+    def setUp(self):
+        self._processor1 = make_processor("Bank1 Debit", "bank1_debit")
+        self._processor2 = make_processor("Bank1 Credit", "bank1_credit")
+        self._processor3 = make_processor("Bank2 Credit", "bank2_credit")
+        self._router = ProcessorRouter(
+            [self._processor1, self._processor2, self._processor3]
+        )
+
+
+class TestRoute(BaseRouterTest):
+    def test_expected(self):
+        self.assertIs(self._processor1, self._router.route("bank1_debit1234.csv"))
+        self.assertIs(self._processor2, self._router.route("bank1_credit1234.csv"))
+        self.assertIs(self._processor3, self._router.route("bank2_credit.csv"))
+
+    def test_exact_prefix(self):
+        self.assertIs(self._processor1, self._router.route("bank1_debit"))
+
+    def test_no_match(self):
+        with self.assertRaises(ValueError):
+            self._router.route("bank3_debit1234.csv")
+
+    def test_shorter_than_prefix(self):
+        with self.assertRaises(ValueError):
+            self._router.route("bank1")
+
+
+class TestFind(BaseRouterTest):
+    def test_expected(self):
+        self.assertIs(self._processor3, self._router.find("bank2_credit.csv"))
+
+    def test_no_match(self):
+        self.assertIsNone(self._router.find("unknown.csv"))
+
+
+class TestOverlappingPrefixes(unittest.TestCase):
+    def test_duplicate_prefix(self):
+        with self.assertRaises(ValueError):
+            ProcessorRouter(
+                [make_processor("a", "bank1"), make_processor("b", "bank1")]
+            )
+
+    def test_new_prefix_extends_existing(self):
+        with self.assertRaises(ValueError):
+            ProcessorRouter(
+                [make_processor("a", "bank1"), make_processor("b", "bank1_debit")]
+            )
+
+    def test_existing_prefix_extends_new(self):
+        with self.assertRaises(ValueError):
+            ProcessorRouter(
+                [make_processor("a", "bank1_debit"), make_processor("b", "bank1")]
+            )
+
+    def test_empty_prefix(self):
+        with self.assertRaises(ValueError):
+            ProcessorRouter([make_processor("a", "")])
+
+    def test_shared_stem_is_allowed(self):
+        ProcessorRouter(
+            [make_processor("a", "bank1_debit"), make_processor("b", "bank1_credit")]
+        )
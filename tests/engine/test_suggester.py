@@ -0,0 +1,154 @@
+import unittest
+import pandas as pd
+
+from engine.processor import Processor
+from engine.suggester import SuggestionEngine, ngram_codes, normalize_descriptions
+from engine.type import Type
+
+
+class BaseSuggesterTest(unittest.TestCase):
+    def setUp(self):
+        self._engine = SuggestionEngine(
+            [
+                Processor(
+                    name="Chase",
+                    file_prefix="chase_credit",
+                    parser=None,
+                    skip_transactions=[],
+                    type_category_by_identifier={
+                        "whole foods": (Type.EXPENSE, "groceries"),
+                        "netflix": (Type.EXPENSE, "subscriptions"),
+                    },
+                ),
+                Processor(
+                    name="BOA",
+                    file_prefix="boa_debit",
+                    parser=None,
+                    skip_transactions=[],
+                    type_category_by_identifier={"payroll": (Type.INCOME, "salary")},
+                ),
+            ]
+        )
+        self._no_type_rows = pd.DataFrame(
+            {
+                "description": [
+                    "WHOLEFDS MKT #10234",
+                    "Wholefds Mkt #998",
+                    "NETFLX.COM 866-579",
+                    "MYSTERY SHOP",
+                    "WHOLEFDS MKT #77",
+                    "ACME PAYROL DIRECT DEP",
+                ],
+                "amount": [-10.0, -20.0, -15.49, -9.99, -30.0, 5000.0],
+            }
+        )
+
+
+class TestNormalizeDescriptions(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(
+            ["wholefds mkt", "netflx com", ""],
+            list(
+                normalize_descriptions(
+                    pd.Series(["WHOLEFDS MKT #10234", "NETFLX.COM", "#1"])
+                )
+            ),
+        )
+
+
+class TestNgramCodes(unittest.TestCase):
+    def test_codes(self):
+        codes, valid = ngram_codes(pd.Series(["ab", "abc"]), 3, 8)
+        self.assertEqual([2, 3], list(valid.sum(axis=1)))
+        # " ab" is shared, "ab " and "bc " are not
+        self.assertEqual(codes[0][0], codes[1][0])
+        self.assertNotEqual(codes[0][1], codes[1][1])
+
+    def test_truncated(self):
+        _, valid = ngram_codes(pd.Series(["abcdefghij"]), 3, 6)
+        self.assertEqual(4, valid.sum())
+
+
+class TestCluster(BaseSuggesterTest):
+    def test_cluster(self):
+        labels = self._engine.cluster(self._no_type_rows["description"])
+        self.assertEqual(labels.iloc[0], labels.iloc[1])
+        self.assertEqual(labels.iloc[0], labels.iloc[4])
+        self.assertEqual(4, labels.nunique())
+
+    def test_dissimilar_not_clustered(self):
+        labels = self._engine.cluster(
+            pd.Series(["UBER TRIP", "UBER EATS ORDER", "LYFT RIDE"])
+        )
+        self.assertEqual(3, labels.nunique())
+
+    def test_missing_descriptions(self):
+        labels = self._engine.cluster(
+            pd.Series(["STARBUCKS 123", "STARBUCKS 456", None, "SHELL OIL 99", None])
+        )
+        self.assertEqual(labels.iloc[0], labels.iloc[1])
+        self.assertEqual(labels.iloc[2], labels.iloc[4])
+        self.assertEqual(3, labels.nunique())
+
+
+class TestSuggest(BaseSuggesterTest):
+    def test_suggest(self):
+        suggestions = self._engine.suggest(self._no_type_rows)
+        self.assertEqual(4, len(suggestions))
+
+        whole_foods = suggestions.iloc[0]
+        self.assertEqual(3, whole_foods["rows"])
+        self.assertAlmostEqual(-60.0, whole_foods["amount"])
+        self.assertEqual("whole foods", whole_foods["identifier"])
+        self.assertEqual("expense", whole_foods["type"])
+        self.assertEqual("groceries", whole_foods["category"])
+
+        by_description = suggestions.set_index("description")
+        self.assertEqual(
+            "netflix", by_description.loc["NETFLX.COM 866-579", "identifier"]
+        )
+        self.assertEqual(
+            "BOA", by_description.loc["ACME PAYROL DIRECT DEP", "processor"]
+        )
+        self.assertTrue(pd.isna(by_description.loc["MYSTERY SHOP", "identifier"]))
+
+    def test_max_suggestions(self):
+        engine = SuggestionEngine(
+            [
+                Processor(
+                    name="Chase",
+                    file_prefix="chase_credit",
+                    parser=None,
+                    skip_transactions=[],
+                    type_category_by_identifier={
+                        "netflix": (Type.EXPENSE, "subscriptions"),
+                        "netflix dvd": (Type.EXPENSE, "movies"),
+                    },
+                )
+            ],
+            max_suggestions=2,
+        )
+        suggestions = engine.suggest(
+            pd.DataFrame({"description": ["NETFLIX DVD PLAN"], "amount": [-9.99]})
+        )
+        # Both are fully contained, so the one sharing more n-grams ranks first
+        self.assertEqual(["netflix dvd", "netflix"], list(suggestions["identifier"]))
+
+    def test_missing_descriptions(self):
+        suggestions = self._engine.suggest(
+            pd.DataFrame(
+                {
+                    "description": ["STARBUCKS 1", None, "STARBUCKS 2"],
+                    "amount": [-1.0, -2.0, -3.0],
+                }
+            )
+        )
+        self.assertEqual([2, 1], list(suggestions["rows"]))
+        self.assertEqual([-4.0, -2.0], list(suggestions["amount"]))
+
+    def test_empty(self):
+        self.assertTrue(self._engine.suggest(self._no_type_rows[:0]).empty)
+
+    def test_bands_must_divide_hashes(self):
+        with self.assertRaises(ValueError):
+            SuggestionEngine([], num_hashes=30, num_bands=16)
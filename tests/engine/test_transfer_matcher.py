@@ -0,0 +1,89 @@
+import unittest
+import pandas as pd
+
+from engine.transfer_matcher import apply_transfers, match_transfers
+
+
+def make_transactions(rows: list[tuple[str, str, int, str]]) -> pd.DataFrame:
+    df = pd.DataFrame(
+        rows, columns=["account_name", "date", "amount_cents", "description"]
+    )
+    df["date"] = pd.to_datetime(df["date"])
+    df["amount_cents"] = df["amount_cents"].astype("Int64")
+    return df
+
+
+class BaseTransferMatcherTest(unittest.TestCase):
+    def setUp(self):
+        self._df = make_transactions(
+            [
+                ("checking", "2024-01-05", -25000, "CHASE CREDIT CRD AUTOPAY"),
+                ("card", "2024-01-06", 25000, "PAYMENT THANK YOU"),
+                ("checking", "2024-01-02", 500000, "PAYROLL"),
+                ("card", "2024-01-09", -1549, "NETFLIX.COM"),
+                # Same account, so not a transfer
+                ("card", "2024-01-10", 1549, "NETFLIX.COM REFUND"),
+            ]
+        )
+
+
+class TestMatchTransfers(BaseTransferMatcherTest):
+    def test_pairs_across_accounts(self):
+        transfer_ids = match_transfers(self._df, 3)
+        self.assertEqual("Int64", transfer_ids.dtype)
+        self.assertEqual(transfer_ids.iloc[0], transfer_ids.iloc[1])
+        self.assertTrue(transfer_ids.iloc[2:].isna().all())
+
+    def test_outside_window(self):
+        df = self._df.copy()
+        df.loc[1, "date"] = pd.Timestamp("2024-01-09")
+        self.assertTrue(match_transfers(df, 3).isna().all())
+        self.assertFalse(match_transfers(df, 4).isna().all())
+
+    def test_window_spans_buckets(self):
+        # Days 3 apart fall in neighbouring buckets of width 4
+        df = make_transactions(
+            [("checking", "2024-01-03", -100, "OUT"), ("card", "2024-01-06", 100, "IN")]
+        )
+        self.assertEqual(2, match_transfers(df, 3).notna().sum())
+
+    def test_each_row_paired_once_closest_first(self):
+        df = make_transactions(
+            [
+                ("checking", "2024-01-05", -100, "OUT 1"),
+                ("checking", "2024-01-06", -100, "OUT 2"),
+                ("card", "2024-01-06", 100, "IN 1"),
+                ("savings", "2024-01-04", 100, "IN 2"),
+                ("card", "2024-01-07", 100, "IN 3"),
+            ]
+        )
+        transfer_ids = match_transfers(df, 3)
+        self.assertEqual(transfer_ids.iloc[1], transfer_ids.iloc[2])
+        self.assertEqual(transfer_ids.iloc[0], transfer_ids.iloc[3])
+        self.assertTrue(pd.isna(transfer_ids.iloc[4]))
+
+    def test_keeps_index(self):
+        df = self._df.set_axis([10, 11, 12, 13, 14])
+        self.assertEqual([10, 11, 12, 13, 14], list(match_transfers(df, 3).index))
+
+
+class TestApplyTransfers(BaseTransferMatcherTest):
+    def test_off(self):
+        self.assertIs(self._df, apply_transfers(self._df, "off", 3))
+
+    def test_tag(self):
+        tagged = apply_transfers(self._df, "tag", 3)
+        self.assertEqual(5, len(tagged))
+        self.assertEqual("Int64", tagged["transfer_id"].dtype)
+        self.assertEqual(2, tagged["transfer_id"].notna().sum())
+
+    def test_remove(self):
+        removed = apply_transfers(self._df, "remove", 3)
+        self.assertEqual(
+            ["PAYROLL", "NETFLIX.COM", "NETFLIX.COM REFUND"],
+            list(removed["description"]),
+        )
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            apply_transfers(self._df, "pair", 3)
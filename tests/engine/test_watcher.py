@@ -0,0 +1,72 @@
+import contextlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from engine.watcher import DirectoryWatcher
+
+
+class BaseWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._dir = self._tmp_dir.name
+        self._watcher = DirectoryWatcher(self._dir, poll_interval=0, debounce=2.0)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _write(self, filename: str, content: str) -> None:
+        with open(os.path.join(self._dir, filename), "w") as f:
+            f.write(content)
+
+
+class TestPoll(BaseWatcherTest):
+    def test_new_file_is_debounced(self):
+        self._write("bank1.csv", "a,b\n")
+        self.assertEqual(([], []), self._watcher.poll(now=0))
+        self.assertEqual(([], []), self._watcher.poll(now=1))
+        self.assertEqual((["bank1.csv"], []), self._watcher.poll(now=2))
+        self.assertEqual(([], []), self._watcher.poll(now=3))
+
+    def test_file_still_being_written_resets_debounce(self):
+        self._write("bank1.csv", "a,b\n")
+        self._watcher.poll(now=0)
+        self._write("bank1.csv", "a,b\n1,2\n")
+        self.assertEqual(([], []), self._watcher.poll(now=2))
+        self.assertEqual((["bank1.csv"], []), self._watcher.poll(now=4))
+
+    def test_primed_files_are_not_reported(self):
+        self._write("bank1.csv", "a,b\n")
+        self._watcher.prime()
+        self.assertEqual(([], []), self._watcher.poll(now=0))
+        self.assertEqual(([], []), self._watcher.poll(now=5))
+
+    def test_modified_file(self):
+        self._write("bank1.csv", "a,b\n")
+        self._watcher.prime()
+        self._write("bank1.csv", "a,b\n1,2\n")
+        self._watcher.poll(now=0)
+        self.assertEqual((["bank1.csv"], []), self._watcher.poll(now=2))
+
+    def test_removed_file(self):
+        self._write("bank1.csv", "a,b\n")
+        self._watcher.prime()
+        os.remove(os.path.join(self._dir, "bank1.csv"))
+        self.assertEqual(([], ["bank1.csv"]), self._watcher.poll(now=0))
+
+    def test_file_removed_while_scanning(self):
+        self._write("bank1.csv", "a,b\n")
+        self._write("bank2.csv", "a,b\n")
+        scandir = os.scandir
+
+        @contextlib.contextmanager
+        def scandir_then_remove(path):
+            with scandir(path) as entries:
+                entries = list(entries)
+            os.remove(os.path.join(path, "bank1.csv"))
+            yield iter(entries)
+
+        with patch("engine.watcher.os.scandir", scandir_then_remove):
+            self._watcher.poll(now=0)
+        self.assertEqual((["bank2.csv"], []), self._watcher.poll(now=2))
@@ -241,3 +241,32 @@ class TestComputeMonthlyLine(BaseFLPCalculatorTest):
         percentile = 25
         monthly_line = self.calculator.compute_annual_line(household_size, percentile)
         self.assertAlmostEqual(monthly_line, 23480.1315)
+
+
+class TestComputeAnnualLines(BaseFLPCalculatorTest):
+    def test_matches_compute_annual_line(self):
+        household_sizes = [1, 2, 4, 1, 7]
+        percentiles = [50, 50, 25, 25, 50]
+        annual_lines = self.calculator.compute_annual_lines(
+            household_sizes, percentiles
+        )
+        for household_size, percentile, annual_line in zip(
+            household_sizes, percentiles, annual_lines
+        ):
+            self.assertAlmostEqual(
+                annual_line,
+                self.calculator.compute_annual_line(household_size, percentile),
+            )
+
+    def test_reads_dataset_once(self):
+        self.calculator.compute_annual_lines([1, 2, 3], [25, 50, 50])
+        self.assertEqual(1, self._dataset.income_by_percentile.call_count)
+        self.assertEqual(1, self._dataset.federal_tax_brackets.call_count)
+
+    def test_invalid_household_size(self):
+        with self.assertRaises(ValueError):
+            self.calculator.compute_annual_lines([2, 0], [50, 50])
+
+    def test_invalid_percentile(self):
+        with self.assertRaises(ValueError):
+            self.calculator.compute_annual_lines([2, 2], [50, 100])
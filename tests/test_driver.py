@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import tempfile
+import unittest
+
+from driver import report_fingerprint
+from flp.flp_dataset import Dataset
+
+
+class TestReportFingerprint(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self._dir = tmp_dir.name
+        os.makedirs(os.path.join(self._dir, "statements"))
+        self._individual = self._write(
+            "bracket_indiv.csv", "lower,upper,rate\n0,,0.1\n"
+        )
+        self._joint = self._write("bracket_joint.csv", "lower,upper,rate\n0,,0.1\n")
+        self._dataset = Dataset(
+            self._write(
+                "numbers.json",
+                json.dumps(
+                    {
+                        "federal_tax_brackets": {
+                            "INDIVIDUAL": self._individual,
+                            "JOINT": self._joint,
+                        }
+                    }
+                ),
+            )
+        )
+        self._args = argparse.Namespace(
+            file_dir=os.path.join(self._dir, "statements"),
+            config_file=self._write("config.json", "{}"),
+            dedup="off",
+            transfers="off",
+            transfer_window=0,
+            date_range=None,
+        )
+
+    def _write(self, filename: str, content: str) -> str:
+        file_path = os.path.join(self._dir, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return file_path
+
+    def _fingerprint(self) -> str:
+        return report_fingerprint(self._args, self._dataset, 2, 50)
+
+    def test_changes_with_tax_brackets(self):
+        before = self._fingerprint()
+        self._write("bracket_joint.csv", "lower,upper,rate\n0,,0.2\n")
+        self.assertNotEqual(before, self._fingerprint())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+from engine import money
+from scripts.equivalence import (
+    EquivalenceResult,
+    check_annual_lines,
+    check_categorize,
+    check_normalizer,
+    check_parse_cents,
+    check_skip,
+    random_processor,
+    random_rules,
+    random_transactions,
+    run_equivalence,
+)
+from engine.type import Type
+from flp.flp_calculator import FLPCalculator
+from flp.flp_dataset import Dataset
+
+
+class BaseEquivalenceTest(unittest.TestCase):
+    def setUp(self):
+        self._rng = np.random.default_rng(0)
+        self._processor = random_processor(self._rng, num_identifiers=20)
+        self._df = random_transactions(self._rng, self._processor, 300)
+
+
+class TestRunEquivalence(unittest.TestCase):
+    def test_engines_match_references(self):
+        for seed in range(3):
+            results = run_equivalence(
+                FLPCalculator(Dataset()),
+                seed=seed,
+                num_rows=300,
+                num_identifiers=20,
+                num_scenarios=50,
+                num_amounts=300,
+            )
+            self.assertEqual(
+                [
+                    "parse_cents",
+                    "categorize",
+                    "categorize_sharded",
+                    "normalizer",
+                    "skip",
+                    "categorize_rules",
+                    "calculator",
+                    "annual_lines",
+                ],
+                [result.name for result in results],
+            )
+            for result in results:
+                self.assertTrue(result.passed(), result.examples)
+                self.assertGreater(result.cases, 0)
+                self.assertGreater(result.candidate_throughput(), 0)
+
+
+class TestRandomInputs(BaseEquivalenceTest):
+    def test_deterministic(self):
+        rng = np.random.default_rng(0)
+        processor = random_processor(rng, num_identifiers=20)
+        self.assertEqual(
+            self._processor._type_category_by_identifier,
+            processor._type_category_by_identifier,
+        )
+        pd.testing.assert_frame_equal(
+            self._df, random_transactions(rng, processor, 300)
+        )
+
+    def test_identifiers(self):
+        identifiers = self._processor._type_category_by_identifier
+        self.assertEqual(20, len(identifiers))
+        for type, category in identifiers.values():
+            self.assertIn(type, [Type.INCOME, Type.EXPENSE, Type.GIVING])
+
+    def test_columns(self):
+        self.assertEqual(
+            [
+                "date",
+                "description",
+                "amount",
+                "amount_cents",
+                "filename",
+                "account_name",
+            ],
+            list(self._df.columns),
+        )
+        self.assertEqual("Int64", self._df["amount_cents"].dtype)
+
+
+class TestCheckCategorize(BaseEquivalenceTest):
+    def test_detects_wrong_categories(self):
+        def categorize_nothing(df):
+            return df.assign(type=Type.NO_TYPE, category="no category")
+
+        result = check_categorize(self._processor, self._df, categorize_nothing)
+        self.assertFalse(result.passed())
+        self.assertLessEqual(len(result.examples), result.mismatches)
+
+    def test_detects_missing_conflicts(self):
+        def categorize_first(df):
+            return pd.concat(
+                [df, df.apply(self._first_match, axis="columns", result_type="expand")],
+                axis="columns",
+            )
+
+        result = check_categorize(self._processor, self._df, categorize_first)
+        self.assertFalse(result.passed())
+        self.assertIn("expected a ValueError", result.examples[0])
+
+    def _first_match(self, row):
+        for identifier, (type, category) in sorted(
+            self._processor._type_category_by_identifier.items()
+        ):
+            if identifier in row["description"].lower():
+                return {"type": type, "category": category}
+        return {"type": Type.NO_TYPE, "category": "no category"}
+
+
+class TestCheckRules(BaseEquivalenceTest):
+    def setUp(self):
+        super().setUp()
+        self._ruled = random_rules(self._rng, self._processor, self._df)
+
+    def test_rules_use_identifiers(self):
+        identifiers = self._processor._type_category_by_identifier
+        for skip in self._ruled._skip_transactions:
+            self.assertIn(skip, identifiers)
+        for identifier, _ in self._ruled._conditional_skips:
+            self.assertIn(identifier, identifiers)
+        for identifier, _, type_category in self._ruled._conditional_categories:
+            self.assertIn(identifier, identifiers)
+            self.assertIn(type_category, identifiers.values())
+
+    def test_detects_ignored_conditional_skips(self):
+        def skip_plain(df):
+            lowercase = df["description"].str.lower()
+            return df[
+                ~lowercase.map(
+                    lambda description: any(
+                        skip in description for skip in self._ruled._skip_transactions
+                    )
+                )
+            ]
+
+        self.assertTrue(check_skip(self._ruled, self._df).passed())
+        self.assertFalse(check_skip(self._ruled, self._df, skip_plain).passed())
+
+    def test_detects_ignored_conditional_categories(self):
+        plain = random_processor(np.random.default_rng(0), num_identifiers=20)
+        plain._normalizer = self._ruled._normalizer
+        result = check_categorize(self._ruled, self._df, plain.categorize)
+        self.assertFalse(result.passed())
+
+    def test_detects_wrong_rewrites(self):
+        descriptions = self._df["description"].str.lower()
+        normalizer = self._ruled._normalizer
+
+        def normalize_without_rewrites(codes, uniques):
+            return codes, uniques
+
+        self.assertTrue(check_normalizer(normalizer, descriptions).passed())
+        result = check_normalizer(normalizer, descriptions, normalize_without_rewrites)
+        self.assertEqual(len(descriptions), result.mismatches)
+
+
+class TestCheckParseCents(unittest.TestCase):
+    def test_detects_float_rounding(self):
+        amounts = pd.Series(["0.125", "1.005", "-2.50", ""], dtype="string")
+
+        def parse_through_float(amounts):
+            return money.to_cents(pd.to_numeric(amounts.replace("", None)))
+
+        self.assertTrue(check_parse_cents(amounts).passed())
+        result = check_parse_cents(amounts, parse_through_float)
+        self.assertEqual(2, result.mismatches)
+
+
+class TestCheckAnnualLines(unittest.TestCase):
+    def test_detects_different_lines(self):
+        flp_calculator = MagicMock(spec=FLPCalculator)
+        flp_calculator.compute_annual_line.side_effect = [100.0, 200.0]
+        flp_calculator.compute_annual_lines.return_value = np.array([100.0, 200.01])
+
+        result = check_annual_lines(flp_calculator, [1, 2], [50, 50])
+        self.assertEqual(1, result.mismatches)
+        self.assertIn("household size 2", result.examples[0])
+
+
+class TestEquivalenceResult(unittest.TestCase):
+    def test_throughput(self):
+        result = EquivalenceResult("engine", 100, 2.0, 0.5, 0, [])
+        self.assertTrue(result.passed())
+        self.assertEqual(50, result.reference_throughput())
+        self.assertEqual(200, result.candidate_throughput())
+        self.assertEqual(4, result.speedup())
+        self.assertEqual(
+            "engine: ok, 100 cases, 50 vs 200 cases/s (4.0x)", repr(result)
+        )